@@ -6,13 +6,14 @@ Dynamic Demand Distribution
 """
 from langgraph.errors import NodeInterrupt
 from agent.state import OpsState
-from database import SessionLocal
+from database import ReadSessionLocal
 from model.theatre import Screen
 from model.seat import Seat
 from model import Show
 from sqlalchemy import text, func
 from datetime import datetime, timedelta
 import numpy as np
+from utils.analytics_store import analytics_store
 
 class SlotDistributor:
     """Intelligent slot-level demand distribution"""
@@ -24,24 +25,44 @@ class SlotDistributor:
     def _learn_slot_patterns(self):
         """Learn actual slot performance from historical data"""
         
-        # Query historical slot performance
-        results = self.db.execute(text("""
-            SELECT 
-                TO_CHAR(s.show_time, 'HH24:MI') as slot,
-                EXTRACT(DOW FROM s.show_date) as day_of_week,
-                AVG(booked_count.cnt) as avg_bookings,
-                COUNT(*) as show_count
-            FROM shows s
-            LEFT JOIN LATERAL (
-                SELECT COUNT(*) as cnt
-                FROM booked_seats bs
-                WHERE bs.show_id = s.show_id
-            ) booked_count ON true
-            WHERE s.show_date >= CURRENT_DATE - INTERVAL '90 days'
-            AND s.status = 'COMPLETED'
-            GROUP BY slot, day_of_week
-            HAVING COUNT(*) >= 3
-        """)).fetchall()
+        # Query historical slot performance: (slot, day_of_week, avg_bookings, show_count)
+        if analytics_store.is_fresh():
+            # Same aggregate over the Parquet snapshot, off the OLTP database
+            results = analytics_store.query("""
+                SELECT
+                    strftime(DATE '2000-01-01' + s.show_time, '%H:%M') AS slot,
+                    dayofweek(s.show_date) AS day_of_week,
+                    AVG(COALESCE(booked_count.cnt, 0)) AS avg_bookings,
+                    COUNT(*) AS show_count
+                FROM shows s
+                LEFT JOIN (
+                    SELECT show_id, COUNT(*) AS cnt
+                    FROM booked_seats
+                    GROUP BY show_id
+                ) booked_count ON booked_count.show_id = s.show_id
+                WHERE s.show_date >= current_date - INTERVAL 90 DAY
+                AND s.status = 'COMPLETED'
+                GROUP BY slot, day_of_week
+                HAVING COUNT(*) >= 3
+            """)
+        else:
+            results = self.db.execute(text("""
+                SELECT 
+                    TO_CHAR(s.show_time, 'HH24:MI') as slot,
+                    EXTRACT(DOW FROM s.show_date) as day_of_week,
+                    AVG(booked_count.cnt) as avg_bookings,
+                    COUNT(*) as show_count
+                FROM shows s
+                LEFT JOIN LATERAL (
+                    SELECT COUNT(*) as cnt
+                    FROM booked_seats bs
+                    WHERE bs.show_id = s.show_id
+                ) booked_count ON true
+                WHERE s.show_date >= CURRENT_DATE - INTERVAL '90 days'
+                AND s.status = 'COMPLETED'
+                GROUP BY slot, day_of_week
+                HAVING COUNT(*) >= 3
+            """)).fetchall()
         
         if not results:
             # Fallback to default patterns
@@ -49,10 +70,9 @@ class SlotDistributor:
         
         # Build learned patterns
         patterns = {}
-        for row in results:
-            slot = row.slot
-            dow = int(row.day_of_week)  # 0=Sunday, 6=Saturday
-            avg_bookings = float(row.avg_bookings or 0)
+        for slot, day_of_week, avg_bookings, _ in results:
+            dow = int(day_of_week)  # 0=Sunday, 6=Saturday
+            avg_bookings = float(avg_bookings or 0)
             
             if slot not in patterns:
                 patterns[slot] = {}
@@ -151,7 +171,8 @@ class SlotDistributor:
 def demand_distribution_node(state: OpsState):
     """Distribute movie-day demand to slot-level with dynamic weights"""
     
-    db = SessionLocal()
+    # Analytics only; safe to run on a read replica
+    db = ReadSessionLocal()
     forecasts = state.get("result", {}).get("forecast", [])
     
     if not forecasts:
@@ -1,218 +1,30 @@
 
 from datetime import date, timedelta, datetime
 from sqlalchemy import text
-from database import SessionLocal
+from database import ReadSessionLocal
 from model import Movie
 from agent.state import OpsState
-from agent.tools.booking_history_tool import get_daily_booking_series
-from agent.tools.external_signals import fetch_all_external_signals, TrendAnalyzer, HolidayCalendar, get_trend_factor
-import pandas as pd
+from agent.tools.booking_history_tool import get_daily_booking_matrix
+from agent.tools.demand_model import (
+    FORECAST_DAYS,
+    PROPHET_AVAILABLE,
+    EnhancedMovieDemandForecaster,
+    fit_movie_model,
+)
+from agent.tools.external_signals import fetch_all_external_signals, HolidayCalendar, get_trend_factor
+from agent.tools.forecast_pool import forecast_pool
+from agent.tools.model_cache import fingerprint, forecast_model_cache
 import numpy as np
-from typing import List, Dict
-import warnings
-warnings.filterwarnings('ignore')
 
-try:
-    from prophet import Prophet
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
-
-FORECAST_DAYS = 7
-
-
-class EnhancedMovieDemandForecaster:
-    """Prophet forecaster with external signals"""
-    
-    def __init__(self, trend_data: Dict = None, holidays: List[Dict] = None):
-        self.trend_data = trend_data or {}
-        self.holidays = holidays or []
-        self.models = {}
-    
-    def prepare_data_with_regressors(self, history_data: List[tuple], 
-                                     movie_title: str) -> pd.DataFrame:
-        """Prepare data with trend and holiday regressors"""
-        
-        if not history_data:
-            return pd.DataFrame()
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(history_data, columns=['ds', 'y'])
-        df['ds'] = pd.to_datetime(df['ds'])
-        
-        # Remove zeros and outliers
-        df = df[df['y'] > 0]
-        
-        # Cap outliers
-        if len(df) > 10:
-            upper_bound = df['y'].quantile(0.99)
-            df['y'] = df['y'].clip(upper=upper_bound)
-        
-        # Add trend regressor
-        movie_trends = self.trend_data.get(movie_title, [])
-        if movie_trends:
-            trend_df = pd.DataFrame(movie_trends)
-            trend_df['ds'] = pd.to_datetime(trend_df['date'])
-            trend_df['trend_score'] = trend_df['value'] / 100.0  # Normalize to 0-1
-            
-            df = df.merge(trend_df[['ds', 'trend_score']], on='ds', how='left')
-            df['trend_score'] = df['trend_score'].fillna(0.5)  # Default if missing
-        else:
-            df['trend_score'] = 0.5
-        
-        # Add holiday indicator
-        df['is_holiday'] = df['ds'].apply(
-            lambda x: 1 if HolidayCalendar.is_holiday(x.strftime("%Y-%m-%d"), self.holidays) else 0
-        )
-        
-        # Add holiday boost
-        df['holiday_boost'] = df['ds'].apply(
-            lambda x: HolidayCalendar.get_holiday_boost(x.strftime("%Y-%m-%d"), self.holidays)
-        )
-        
-        return df
-    
-    def fit_predict_with_regressors(self, df: pd.DataFrame, periods: int,
-                                    movie_title: str, competition: float) -> pd.DataFrame:
-        """Fit Prophet with external regressors"""
-        
-        if len(df) < 7:
-            return self._fallback_forecast(df, periods, movie_title, competition)
-        
-        # Configure Prophet with regressors
-        model = Prophet(
-            changepoint_prior_scale=0.05,
-            seasonality_prior_scale=10.0,
-            daily_seasonality=False,
-            weekly_seasonality=True,
-            yearly_seasonality=False,
-            interval_width=0.80
-        )
-        
-        # Add regressors
-        if 'trend_score' in df.columns:
-            model.add_regressor('trend_score', standardize=True)
-        
-        if 'holiday_boost' in df.columns:
-            model.add_regressor('holiday_boost', standardize=True)
-        
-        # Fit model
-        model.fit(df)
-        
-        # Generate future dates with regressors
-        future = model.make_future_dataframe(periods=periods)
-        
-        # Add future trend scores
-        future_start = df['ds'].max() + timedelta(days=1)
-        future_dates = pd.date_range(start=future_start, periods=periods)
-        
-        # Extrapolate trend (use last 7 days average)
-        recent_trend = df['trend_score'].tail(7).mean() if 'trend_score' in df.columns else 0.5
-        future['trend_score'] = future['ds'].apply(
-            lambda x: recent_trend if x >= future_start else 
-            df[df['ds'] == x]['trend_score'].values[0] if x in df['ds'].values else recent_trend
-        )
-        
-        # Add future holiday boost
-        future['holiday_boost'] = future['ds'].apply(
-            lambda x: HolidayCalendar.get_holiday_boost(x.strftime("%Y-%m-%d"), self.holidays)
-        )
-        
-        # Predict
-        forecast = model.predict(future)
-        
-        # Extract future predictions
-        forecast = forecast.tail(periods)
-        
-        # Apply competition penalty
-        forecast['yhat'] = forecast['yhat'] * (1 - competition * 0.3)
-        forecast['yhat_lower'] = forecast['yhat_lower'] * (1 - competition * 0.3)
-        forecast['yhat_upper'] = forecast['yhat_upper'] * (1 - competition * 0.3)
-        
-        # Ensure non-negative
-        forecast['yhat'] = forecast['yhat'].clip(lower=1)
-        forecast['yhat_lower'] = forecast['yhat_lower'].clip(lower=1)
-        forecast['yhat_upper'] = forecast['yhat_upper'].clip(lower=1)
-        
-        return forecast
-    
-    def _fallback_forecast(self, df: pd.DataFrame, periods: int,
-                          movie_title: str, competition: float) -> pd.DataFrame:
-        """Deterministic fallback with external signals"""
-        
-        if len(df) == 0:
-            base_demand = 30
-        else:
-            base_demand = df['y'].mean()
-        
-        # Get recent trend momentum
-        movie_trends = self.trend_data.get(movie_title, [])
-        trend_momentum = TrendAnalyzer.calculate_trend_momentum(movie_trends) if movie_trends else 1.0
-        trend_factor = get_trend_factor(movie_title, self.trend_data)
-        # Generate dates
-        last_date = df['ds'].max() if len(df) > 0 else pd.Timestamp.now()
-        future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=periods)
-        
-        # Weekly pattern
-        day_factors = {0: 0.85, 1: 0.85, 2: 0.9, 3: 0.9, 4: 1.1, 5: 1.2, 6: 1.15}
-        
-        predictions = []
-        for i, future_date in enumerate(future_dates):
-            day_factor = day_factors[future_date.dayofweek]
-            growth_factor = 1 + (i * 0.02)
-            
-            # Apply holiday boost
-            holiday_boost = HolidayCalendar.get_holiday_boost(
-                future_date.strftime("%Y-%m-%d"), 
-                self.holidays
-            )
-            
-            pred = (base_demand * day_factor * growth_factor * 
-                   trend_momentum * trend_factor * holiday_boost * (1 - competition * 0.3))
-            pred = max(1, pred)
-            
-            predictions.append({
-                'ds': future_date,
-                'yhat': pred,
-                'yhat_lower': pred * 0.7,
-                'yhat_upper': pred * 1.3
-            })
-        
-        return pd.DataFrame(predictions)
-    
-    def calculate_confidence(self, forecast_row: pd.Series, history_length: int,
-                           competition: float) -> float:
-        """Dynamic confidence"""
-        
-        pred_range = forecast_row['yhat_upper'] - forecast_row['yhat_lower']
-        pred_value = forecast_row['yhat']
-        
-        if pred_value > 0:
-            uncertainty = pred_range / pred_value
-            interval_conf = 1 - min(uncertainty, 0.5)
-        else:
-            interval_conf = 0.5
-        
-        # History bonus
-        if history_length >= 30:
-            history_bonus = 0.2
-        elif history_length >= 14:
-            history_bonus = 0.1
-        else:
-            history_bonus = 0
-        
-        # Competition penalty
-        competition_penalty = competition * 0.2
-        
-        confidence = interval_conf + history_bonus - competition_penalty
-        
-        return round(max(0.45, min(confidence, 0.92)), 2)
+HISTORY_DAYS = 60
+COMPETITION_DAYS = 30
 
 
 def demand_forecast_node(state: OpsState):
     """Enhanced forecasting with external signals"""
     
-    db = SessionLocal()
+    # Analytics only; safe to run on a read replica
+    db = ReadSessionLocal()
     
     # Get movies
     movies_q = db.query(Movie)
@@ -242,23 +54,50 @@ def demand_forecast_node(state: OpsState):
     
     daily_physical_cap = int(total_seats * avg_shows_per_day * 1.2)
     
-    # Calculate competition
-    movie_totals = {}
-    for m in movies:
-        raw = get_daily_booking_series(m.movie_id, 30, db)
-        total = sum(float(r[1]) for r in raw if r and len(r) >= 2) if raw else 1
-        movie_totals[m.movie_id] = float(total)
+    # Daily bookings per movie: one grouped query, rows follow `movies`
+    history_dates, history = get_daily_booking_matrix([m.movie_id for m in movies], HISTORY_DAYS, db)
     
-    total_market = float(sum(movie_totals.values())) or 1.0
+    # Calculate competition over the last COMPETITION_DAYS plus today (movies without bookings count as 1)
+    totals = np.maximum(history[:, -(COMPETITION_DAYS + 1):].sum(axis=1), 1).astype(float)
+    total_market = float(totals.sum()) or 1.0
+    shares = totals / total_market
+    has_history = history.any(axis=1)
     
     # Generate forecasts
     start_date = date.today() + timedelta(days=1)
     forecasts = []
     
+    prepared = {}
+    for i, movie in enumerate(movies):
+        if has_history[i]:
+            raw_history = list(zip(history_dates, history[i].tolist()))
+            df = forecaster.prepare_data_with_regressors(raw_history, movie.title)
+            prepared[movie.movie_id] = (df, float(shares[i]))
+    
+    # Reuse cached fits whose inputs are unchanged; fan the rest out, one task per movie
+    holidays = external_data["holidays"]
+    raw_forecasts = {}
+    fingerprints = {}
+    fit_jobs = {}
     for movie in movies:
-        raw_history = get_daily_booking_series(movie.movie_id, 60, db)
-        
-        if not raw_history:
+        if not (PROPHET_AVAILABLE and movie.movie_id in prepared and len(prepared[movie.movie_id][0]) >= 7):
+            continue
+        df = prepared[movie.movie_id][0]
+        fp = fingerprint(df, FORECAST_DAYS, holidays)
+        cached = forecast_model_cache.get(movie.movie_id, fp.key)
+        if cached is not None:
+            raw_forecasts[movie.movie_id] = cached
+            continue
+        fingerprints[movie.movie_id] = fp
+        warm_model = forecast_model_cache.warm_start_model(movie.movie_id, fp)
+        fit_jobs[movie.movie_id] = (holidays, df, FORECAST_DAYS, warm_model)
+    
+    for movie_id, (forecast, model_json) in forecast_pool.map(fit_movie_model, fit_jobs).items():
+        forecast_model_cache.put(movie_id, fingerprints[movie_id], forecast, model_json)
+        raw_forecasts[movie_id] = forecast
+    
+    for movie in movies:
+        if movie.movie_id not in prepared:
             # New movie baseline
             avg_demand = total_market / len(movies) / 30 if len(movies) > 0 else 30
             for i in range(FORECAST_DAYS):
@@ -284,18 +123,14 @@ def demand_forecast_node(state: OpsState):
                 })
             continue
         
-        df = forecaster.prepare_data_with_regressors(raw_history, movie.title)
+        df, competition = prepared[movie.movie_id]
         
         if df.empty:
             continue
         
-        competition = movie_totals[movie.movie_id] / total_market
-        
-        # Generate ML forecast
-        if PROPHET_AVAILABLE and len(df) >= 7:
-            forecast_df = forecaster.fit_predict_with_regressors(
-                df, FORECAST_DAYS, movie.title, competition
-            )
+        # ML forecast if its fit succeeded; errors and timeouts fall back
+        if movie.movie_id in raw_forecasts:
+            forecast_df = forecaster.apply_competition(raw_forecasts[movie.movie_id], competition)
             method = "prophet_ml_enhanced"
         else:
             forecast_df = forecaster._fallback_forecast(
@@ -303,6 +138,12 @@ def demand_forecast_node(state: OpsState):
             )
             method = "deterministic_enhanced"
         
+        # Velocity
+        recent_avg = df['y'].tail(7).mean()
+        past_avg = df['y'].head(len(df) - 7).mean() if len(df) > 14 else recent_avg
+        velocity = round(recent_avg / max(past_avg, 1), 2)
+        velocity = max(0.5, min(velocity, 2.0))
+        
         # Convert to output
         for idx, row in forecast_df.iterrows():
             forecast_date = row['ds'].date()
@@ -310,12 +151,6 @@ def demand_forecast_node(state: OpsState):
             demand = min(demand, daily_physical_cap)
             demand = max(demand, 1)
             
-            # Velocity
-            recent_avg = df['y'].tail(7).mean()
-            past_avg = df['y'].head(len(df) - 7).mean() if len(df) > 14 else recent_avg
-            velocity = round(recent_avg / max(past_avg, 1), 2)
-            velocity = max(0.5, min(velocity, 2.0))
-            
             # Confidence
             confidence = forecaster.calculate_confidence(row, len(df), competition)
             
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func, cast, Date
 from model import Booking, Show
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from typing import List, Sequence, Tuple
+import numpy as np
+from utils.analytics_store import analytics_store
 
 def get_recent_booking_count(movie_id: int, days: int, db: Session):
     """Get total booking count for a movie in the last N days"""
@@ -20,6 +23,17 @@ def get_daily_booking_series(movie_id: int, days: int, db: Session):
     Returns: List of tuples [(date, count), (date, count), ...]
     """
     since = datetime.utcnow() - timedelta(days=days)
+
+    # Served from the Parquet snapshot when it is recent enough
+    if analytics_store.is_fresh():
+        return [tuple(r) for r in analytics_store.query("""
+            SELECT CAST(b.booking_date AS DATE) AS date, COUNT(b.booking_id) AS count
+            FROM bookings b
+            JOIN shows s ON b.show_id = s.show_id
+            WHERE s.movie_id = ? AND b.booking_date >= ?
+            GROUP BY 1
+            ORDER BY 1
+        """, [movie_id, since])]
     
     rows = (
         db.query(
@@ -38,4 +52,53 @@ def get_daily_booking_series(movie_id: int, days: int, db: Session):
     )
     
     # Convert to list of (date, count) tuples
-    return [(r.date, r.count) for r in rows]
\ No newline at end of file
+    return [(r.date, r.count) for r in rows]
+
+
+def get_daily_booking_matrix(movie_ids: Sequence[int], days: int, db: Session) -> Tuple[List[date], np.ndarray]:
+    """
+    Get daily booking counts for several movies over the last N days in one grouped query
+    Returns: (dates, matrix) where matrix[i, j] is the booking count of movie_ids[i]
+    on dates[j]; days without bookings are 0
+    """
+    movie_ids = list(movie_ids)
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
+    dates = [since.date() + timedelta(days=i) for i in range((now.date() - since.date()).days + 1)]
+    matrix = np.zeros((len(movie_ids), len(dates)), dtype=np.int64)
+    if not movie_ids:
+        return dates, matrix
+
+    # Served from the Parquet snapshot when it is recent enough
+    if analytics_store.is_fresh():
+        rows = analytics_store.query("""
+            SELECT s.movie_id, CAST(b.booking_date AS DATE) AS date, COUNT(b.booking_id) AS count
+            FROM bookings b
+            JOIN shows s ON b.show_id = s.show_id
+            WHERE list_contains(?, s.movie_id) AND b.booking_date >= ?
+            GROUP BY 1, 2
+        """, [movie_ids, since])
+    else:
+        day = cast(Booking.booking_date, Date)
+        rows = (
+            db.query(Show.movie_id, day.label('date'), func.count(Booking.booking_id).label('count'))
+            .select_from(Booking)
+            .join(Show, Booking.show_id == Show.show_id)
+            .filter(
+                Show.movie_id.in_(movie_ids),
+                Booking.booking_date >= since
+            )
+            .group_by(Show.movie_id, day)
+            .all()
+        )
+
+    row_of = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+    col_of = {d: j for j, d in enumerate(dates)}
+    for movie_id, day_value, count in rows:
+        if not isinstance(day_value, date):
+            day_value = date.fromisoformat(str(day_value)[:10])
+        j = col_of.get(day_value)
+        if j is not None:
+            matrix[row_of[movie_id], j] = count
+    return dates, matrix
+
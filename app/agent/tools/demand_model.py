@@ -0,0 +1,251 @@
+"""
+Prophet demand model for one movie: regressor preparation, fitting and the
+deterministic fallback. Kept free of database/model imports so forecast pool
+workers (spawned interpreters) can import fit_movie_model on their own.
+"""
+from datetime import timedelta
+from agent.tools.external_signals import TrendAnalyzer, HolidayCalendar, get_trend_factor
+from agent.tools.model_cache import FORECAST_COLUMNS
+import pandas as pd
+from typing import List, Dict
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    from prophet import Prophet
+    from prophet.serialize import model_from_json, model_to_json
+    PROPHET_AVAILABLE = True
+except ImportError:
+    PROPHET_AVAILABLE = False
+
+FORECAST_DAYS = 7
+
+
+class EnhancedMovieDemandForecaster:
+    """Prophet forecaster with external signals"""
+    
+    def __init__(self, trend_data: Dict = None, holidays: List[Dict] = None):
+        self.trend_data = trend_data or {}
+        self.holidays = holidays or []
+        self.models = {}
+        self._holiday_frame = None
+    
+    def holiday_frame(self) -> pd.DataFrame:
+        """Holiday boost per date (first entry wins, as in HolidayCalendar.is_holiday), indexed by date"""
+        if self._holiday_frame is None:
+            frame = pd.DataFrame({
+                'ds': pd.to_datetime([h.get('date') for h in self.holidays], errors='coerce'),
+                'holiday_boost': [HolidayCalendar.get_holiday_boost(h.get('date'), [h]) for h in self.holidays],
+            }, columns=['ds', 'holiday_boost'])
+            frame = frame.dropna(subset=['ds']).drop_duplicates('ds', keep='first')
+            self._holiday_frame = frame.set_index('ds')
+        return self._holiday_frame
+    
+    def holiday_boosts(self, ds: pd.Series) -> pd.Series:
+        """Holiday boost for each date in ds; 1.0 on ordinary days, NaN-free"""
+        boosts = self.holiday_frame()['holiday_boost'].reindex(ds.dt.normalize())
+        return pd.Series(boosts.to_numpy(dtype=float), index=ds.index).fillna(1.0)
+    
+    def prepare_data_with_regressors(self, history_data: List[tuple], 
+                                     movie_title: str) -> pd.DataFrame:
+        """Prepare data with trend and holiday regressors"""
+        
+        if not history_data:
+            return pd.DataFrame()
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(history_data, columns=['ds', 'y'])
+        df['ds'] = pd.to_datetime(df['ds'])
+        
+        # Remove zeros and outliers
+        df = df[df['y'] > 0]
+        
+        # Cap outliers
+        if len(df) > 10:
+            upper_bound = df['y'].quantile(0.99)
+            df['y'] = df['y'].clip(upper=upper_bound)
+        
+        # Add trend regressor
+        movie_trends = self.trend_data.get(movie_title, [])
+        if movie_trends:
+            trend_df = pd.DataFrame(movie_trends)
+            trend_df['ds'] = pd.to_datetime(trend_df['date'])
+            trend_df['trend_score'] = trend_df['value'] / 100.0  # Normalize to 0-1
+            
+            df = df.merge(trend_df[['ds', 'trend_score']], on='ds', how='left')
+            df['trend_score'] = df['trend_score'].fillna(0.5)  # Default if missing
+        else:
+            df['trend_score'] = 0.5
+        
+        # Add holiday indicator and boost (one reindex against the holiday frame)
+        is_holiday = df['ds'].dt.normalize().isin(self.holiday_frame().index)
+        df['is_holiday'] = is_holiday.astype(int)
+        df['holiday_boost'] = self.holiday_boosts(df['ds'])
+        
+        return df
+    
+    def fit_predict_with_regressors(self, df: pd.DataFrame, periods: int,
+                                    movie_title: str, competition: float) -> pd.DataFrame:
+        """Fit Prophet with external regressors"""
+        
+        if len(df) < 7:
+            return self._fallback_forecast(df, periods, movie_title, competition)
+        
+        _, forecast = self.fit_model(df, periods)
+        return self.apply_competition(forecast, competition)
+    
+    def fit_model(self, df: pd.DataFrame, periods: int, init: Dict = None):
+        """Fit Prophet on df and forecast the next periods days; init warm-starts the fit"""
+        
+        # Configure Prophet with regressors
+        model = Prophet(
+            changepoint_prior_scale=0.05,
+            seasonality_prior_scale=10.0,
+            daily_seasonality=False,
+            weekly_seasonality=True,
+            yearly_seasonality=False,
+            interval_width=0.80
+        )
+        
+        # Add regressors
+        if 'trend_score' in df.columns:
+            model.add_regressor('trend_score', standardize=True)
+        
+        if 'holiday_boost' in df.columns:
+            model.add_regressor('holiday_boost', standardize=True)
+        
+        # Fit model
+        if init:
+            model.fit(df, init=init)
+        else:
+            model.fit(df)
+        
+        # Generate future dates with regressors
+        future = self.add_future_regressors(df, model.make_future_dataframe(periods=periods))
+        
+        # Predict and keep the future rows
+        forecast = model.predict(future)
+        return model, forecast.tail(periods)
+    
+    def add_future_regressors(self, df: pd.DataFrame, future: pd.DataFrame) -> pd.DataFrame:
+        """Trend score and holiday boost for every row of a make_future_dataframe() frame"""
+        
+        # Known days keep their trend score; later days extrapolate the last 7 days average
+        recent_trend = df['trend_score'].tail(7).mean() if 'trend_score' in df.columns else 0.5
+        if 'trend_score' in df.columns:
+            known = df.drop_duplicates('ds', keep='first').set_index('ds')['trend_score']
+            future['trend_score'] = future['ds'].map(known).fillna(recent_trend)
+        else:
+            future['trend_score'] = recent_trend
+        
+        future['holiday_boost'] = self.holiday_boosts(future['ds'])
+        return future
+    
+    @staticmethod
+    def apply_competition(forecast: pd.DataFrame, competition: float) -> pd.DataFrame:
+        """Competition penalty on a raw forecast, floored at 1"""
+        forecast = forecast.copy()
+        for col in ('yhat', 'yhat_lower', 'yhat_upper'):
+            forecast[col] = (forecast[col] * (1 - competition * 0.3)).clip(lower=1)
+        return forecast
+    
+    def _fallback_forecast(self, df: pd.DataFrame, periods: int,
+                          movie_title: str, competition: float) -> pd.DataFrame:
+        """Deterministic fallback with external signals"""
+        
+        if len(df) == 0:
+            base_demand = 30
+        else:
+            base_demand = df['y'].mean()
+        
+        # Get recent trend momentum
+        movie_trends = self.trend_data.get(movie_title, [])
+        trend_momentum = TrendAnalyzer.calculate_trend_momentum(movie_trends) if movie_trends else 1.0
+        trend_factor = get_trend_factor(movie_title, self.trend_data)
+        # Generate dates
+        last_date = df['ds'].max() if len(df) > 0 else pd.Timestamp.now()
+        future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=periods)
+        
+        # Weekly pattern
+        day_factors = {0: 0.85, 1: 0.85, 2: 0.9, 3: 0.9, 4: 1.1, 5: 1.2, 6: 1.15}
+        
+        predictions = []
+        for i, future_date in enumerate(future_dates):
+            day_factor = day_factors[future_date.dayofweek]
+            growth_factor = 1 + (i * 0.02)
+            
+            # Apply holiday boost
+            holiday_boost = HolidayCalendar.get_holiday_boost(
+                future_date.strftime("%Y-%m-%d"), 
+                self.holidays
+            )
+            
+            pred = (base_demand * day_factor * growth_factor * 
+                   trend_momentum * trend_factor * holiday_boost * (1 - competition * 0.3))
+            pred = max(1, pred)
+            
+            predictions.append({
+                'ds': future_date,
+                'yhat': pred,
+                'yhat_lower': pred * 0.7,
+                'yhat_upper': pred * 1.3
+            })
+        
+        return pd.DataFrame(predictions)
+    
+    def calculate_confidence(self, forecast_row: pd.Series, history_length: int,
+                           competition: float) -> float:
+        """Dynamic confidence"""
+        
+        pred_range = forecast_row['yhat_upper'] - forecast_row['yhat_lower']
+        pred_value = forecast_row['yhat']
+        
+        if pred_value > 0:
+            uncertainty = pred_range / pred_value
+            interval_conf = 1 - min(uncertainty, 0.5)
+        else:
+            interval_conf = 0.5
+        
+        # History bonus
+        if history_length >= 30:
+            history_bonus = 0.2
+        elif history_length >= 14:
+            history_bonus = 0.1
+        else:
+            history_bonus = 0
+        
+        # Competition penalty
+        competition_penalty = competition * 0.2
+        
+        confidence = interval_conf + history_bonus - competition_penalty
+        
+        return round(max(0.45, min(confidence, 0.92)), 2)
+
+
+def warm_start_params(model) -> Dict:
+    """Fitted parameters of a Prophet model, in the form Prophet.fit(init=...) takes"""
+    params = {}
+    for name in ('k', 'm', 'sigma_obs'):
+        params[name] = model.params[name][0][0]
+    for name in ('delta', 'beta'):
+        params[name] = model.params[name][0]
+    return params
+
+
+def fit_movie_model(holidays: List[Dict], df: pd.DataFrame, periods: int, warm_model_json: str = None):
+    """
+    Process pool entry point: fit one movie's model.
+    Returns (forecast before the competition penalty, serialized model).
+    """
+    forecaster = EnhancedMovieDemandForecaster(holidays=holidays)
+    init = None
+    if warm_model_json:
+        init = warm_start_params(model_from_json(warm_model_json))
+    try:
+        model, forecast = forecaster.fit_model(df, periods, init=init)
+    except Exception:
+        if init is None:
+            raise
+        # Parameter shapes can change with the history length; refit from scratch
+        model, forecast = forecaster.fit_model(df, periods)
+    return forecast[FORECAST_COLUMNS], model_to_json(model)
@@ -0,0 +1,115 @@
+import math
+import multiprocessing
+import signal
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from utils.config import settings
+
+
+class ForecastTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ForecastTimeout()
+
+
+def _run_with_timeout(fn: Callable, args: tuple, timeout: float):
+    """Worker-side wrapper: abort fn with ForecastTimeout after timeout seconds."""
+    use_alarm = timeout > 0 and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ForecastPool:
+    """
+    Runs per-movie model fits on a process pool.
+
+    Prophet fitting is CPU-bound, so the fits are spread over processes
+    rather than threads. Each task is stopped after task_timeout seconds
+    inside its worker (SIGALRM), so a stuck fit frees its worker. map()
+    only returns the results of tasks that succeeded; callers fall back
+    for the rest. With max_workers=0, fits run inline without a timeout.
+    """
+
+    def __init__(self, max_workers: int, task_timeout: float):
+        self.max_workers = max_workers
+        self.task_timeout = task_timeout
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # spawn: a forked child would inherit the server's threads and open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def map(self, fn: Callable, jobs: Dict[Hashable, tuple]) -> Dict[Hashable, Any]:
+        """Run fn(*args) for every job; returns {key: result} for the jobs that finished in time."""
+        if not jobs:
+            return {}
+        if self.max_workers <= 0:
+            return self._map_inline(fn, jobs)
+
+        results: Dict[Hashable, Any] = {}
+        try:
+            executor = self._get_executor()
+            futures = {executor.submit(_run_with_timeout, fn, args, self.task_timeout): key for key, args in jobs.items()}
+        except BrokenProcessPool as e:
+            self.shutdown()
+            print(f"[ForecastPool] Pool unavailable: {e}")
+            return results
+
+        deadline = None
+        if self.task_timeout > 0:
+            # Worst case the jobs run in ceil(n / workers) waves; the alarm in each worker is the real limit
+            waves = math.ceil(len(futures) / self.max_workers)
+            deadline = self.task_timeout * waves + 5
+        done, not_done = wait(futures, timeout=deadline)
+
+        for future in done:
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except ForecastTimeout:
+                print(f"[ForecastPool] {key}: timed out after {self.task_timeout}s")
+            except BrokenProcessPool as e:
+                print(f"[ForecastPool] {key}: worker died: {e}")
+            except Exception as e:
+                print(f"[ForecastPool] {key}: {type(e).__name__}: {e}")
+        for future in not_done:
+            future.cancel()
+            print(f"[ForecastPool] {futures[future]}: no result within {deadline}s")
+        if any(isinstance(f.exception(), BrokenProcessPool) for f in done):
+            self.shutdown()
+        return results
+
+    def _map_inline(self, fn: Callable, jobs: Dict[Hashable, tuple]) -> Dict[Hashable, Any]:
+        results = {}
+        for key, args in jobs.items():
+            try:
+                results[key] = fn(*args)
+            except Exception as e:
+                print(f"[ForecastPool] {key}: {type(e).__name__}: {e}")
+        return results
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+forecast_pool = ForecastPool(
+    max_workers=settings.FORECAST_POOL_WORKERS,
+    task_timeout=settings.FORECAST_TASK_TIMEOUT,
+)
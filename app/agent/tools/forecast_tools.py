@@ -1,5 +1,6 @@
 from collections import Counter
 from sqlalchemy import text
+from utils.analytics_store import analytics_store
 
 
 
@@ -17,20 +18,30 @@ def forecast_from_trend(blended, season):
 def get_slot_factor(movie_id, show_time, db):
     hour = show_time.hour
 
-    rows = db.execute(text("""
-        SELECT
-            EXTRACT(HOUR FROM s.show_time) AS hr,
-            COUNT(b.booking_id) AS bookings
-        FROM shows s
-        LEFT JOIN bookings b ON b.show_id = s.show_id
-        WHERE s.movie_id = :movie_id
-        GROUP BY hr
-    """), {"movie_id": movie_id}).fetchall()
+    if analytics_store.is_fresh():
+        # Same aggregate over the Parquet snapshot, off the OLTP database
+        rows = analytics_store.query("""
+            SELECT EXTRACT(HOUR FROM s.show_time) AS hr, COUNT(b.booking_id) AS bookings
+            FROM shows s
+            LEFT JOIN bookings b ON b.show_id = s.show_id
+            WHERE s.movie_id = ?
+            GROUP BY hr
+        """, [movie_id])
+    else:
+        rows = db.execute(text("""
+            SELECT
+                EXTRACT(HOUR FROM s.show_time) AS hr,
+                COUNT(b.booking_id) AS bookings
+            FROM shows s
+            LEFT JOIN bookings b ON b.show_id = s.show_id
+            WHERE s.movie_id = :movie_id
+            GROUP BY hr
+        """), {"movie_id": movie_id}).fetchall()
 
     if not rows:
         return 1.0
 
-    slot_map = {int(r.hr): r.bookings for r in rows}
+    slot_map = {int(hr): bookings for hr, bookings in rows}
 
     total = sum(slot_map.values())
     avg = total / len(slot_map) if total else 1
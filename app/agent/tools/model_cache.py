@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from io import StringIO
+from typing import Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+from utils.config import settings
+
+# Columns that feed the fit; a change in any of them changes the cache key
+KEY_COLUMNS = ["ds", "y", "trend_score", "holiday_boost"]
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+
+class SeriesFingerprint(NamedTuple):
+    key: str  # the whole input: context plus every row
+    context: str  # columns, horizon and holiday list
+    rows: Dict[str, str]  # ISO date -> hash of that day's row
+
+
+def fingerprint(df: pd.DataFrame, periods: int, holidays: List[Dict]) -> SeriesFingerprint:
+    columns = [c for c in KEY_COLUMNS if c in df.columns]
+    context = hashlib.sha256()
+    context.update(",".join(columns).encode())
+    context.update(str(periods).encode())
+    # Future holiday boosts come from the holiday list
+    context.update(json.dumps(sorted((d.get("date"), d.get("type")) for d in holidays)).encode())
+    context = context.hexdigest()
+
+    row_hashes = [f"{h:016x}" for h in pd.util.hash_pandas_object(df[columns], index=False).values]
+    rows = dict(zip(pd.to_datetime(df["ds"]).dt.strftime("%Y-%m-%d"), row_hashes))
+    key = hashlib.sha256((context + "".join(row_hashes)).encode()).hexdigest()
+    return SeriesFingerprint(key, context, rows)
+
+
+def _continues(previous: Dict[str, str], rows: Dict[str, str]) -> bool:
+    """
+    True if rows is the previous series moved forward in time: every date the
+    two share has the same values, except the previous last day (its count
+    may have been partial), and they share at least half of the new series.
+    """
+    shared = previous.keys() & rows.keys()
+    if not shared or len(shared) * 2 < len(rows):
+        return False
+    last = max(previous)
+    return all(previous[d] == rows[d] for d in shared if d != last)
+
+
+class ForecastModelCache:
+    """
+    Fitted Prophet models and their forecasts, per movie, on disk.
+
+    Entries are keyed by movie_id plus a hash of the input series, the
+    regressors, the horizon and the holiday list. get() returns the stored
+    forecast when the inputs are unchanged. The entry also keeps a hash per
+    date, so warm_start_model() can return the previous model when the new
+    series only continues the old one (the window slid forward by a day or
+    more, and/or the old last day's count moved) and the next fit can start
+    from its parameters. Each movie has <id>.json (hashes and forecast) and
+    <id>.model.json (serialized model), written to a temp file and swapped in.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: Dict[int, dict] = {}
+        self.hits = 0
+        self.warm_starts = 0
+        self.misses = 0
+
+    def _path(self, movie_id: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{movie_id}{suffix}")
+
+    def _entry(self, movie_id: int) -> Optional[dict]:
+        entry = self._entries.get(movie_id)
+        if entry is None:
+            try:
+                with open(self._path(movie_id, ".json")) as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            self._entries[movie_id] = entry
+        return entry
+
+    # ---------------- READ ----------------
+    def get(self, movie_id: int, key: str) -> Optional[pd.DataFrame]:
+        """Cached forecast (before the competition penalty) if the inputs are unchanged."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entry(movie_id)
+            if entry is None or entry["key"] != key:
+                return None
+            self.hits += 1
+        forecast = pd.read_json(StringIO(entry["forecast"]), orient="split", dtype={c: "float64" for c in FORECAST_COLUMNS[1:]})
+        forecast["ds"] = pd.to_datetime(forecast["ds"])
+        return forecast
+
+    def warm_start_model(self, movie_id: int, fp: SeriesFingerprint) -> Optional[str]:
+        """Serialized previous model when the new series continues the one it was fitted on."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entry(movie_id)
+            if entry is None or entry.get("context") != fp.context or not _continues(entry.get("rows", {}), fp.rows):
+                self.misses += 1
+                return None
+        try:
+            with open(self._path(movie_id, ".model.json")) as f:
+                model_json = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.warm_starts += 1
+        return model_json
+
+    # ---------------- WRITE ----------------
+    def put(self, movie_id: int, fp: SeriesFingerprint, forecast: pd.DataFrame, model_json: Optional[str]) -> None:
+        if not self.enabled:
+            return
+        entry = {
+            "key": fp.key,
+            "context": fp.context,
+            "rows": fp.rows,
+            "fitted_at": time.time(),
+            "forecast": forecast[FORECAST_COLUMNS].to_json(orient="split", index=False, date_format="iso"),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        if model_json is not None:
+            self._write(self._path(movie_id, ".model.json"), model_json)
+        self._write(self._path(movie_id, ".json"), json.dumps(entry))
+        with self._lock:
+            self._entries[movie_id] = entry
+
+    @staticmethod
+    def _write(path: str, data: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "hits": self.hits,
+            "warm_starts": self.warm_starts,
+            "misses": self.misses,
+        }
+
+
+forecast_model_cache = ForecastModelCache(
+    directory=settings.FORECAST_CACHE_DIR,
+    enabled=settings.FORECAST_CACHE_ENABLED,
+)
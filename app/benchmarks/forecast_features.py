@@ -0,0 +1,96 @@
+"""
+Regressor preparation in EnhancedMovieDemandForecaster: the old row-wise
+DataFrame.apply lambdas against the vectorized holiday frame and reindex.
+
+Builds MOVIES movies x DAYS days of bookings and trend scores over a
+two-year holiday list, then times prepare_data_with_regressors() and
+add_future_regressors() (a DAYS + FORECAST_DAYS future frame) for all
+movies with each implementation. The outputs are checked to be equal.
+
+Run from the app/ directory:
+    python -m benchmarks.forecast_features
+"""
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from agent.tools.demand_model import FORECAST_DAYS, EnhancedMovieDemandForecaster
+from agent.tools.external_signals import HolidayCalendar
+
+MOVIES = 50
+DAYS = 365
+HOLIDAYS_PER_YEAR = 60
+ROUNDS = 3
+
+
+class RowwiseForecaster(EnhancedMovieDemandForecaster):
+    """The previous per-row implementation, kept here as the baseline."""
+
+    def prepare_data_with_regressors(self, history_data, movie_title):
+        df = super().prepare_data_with_regressors(history_data, movie_title)
+        df['is_holiday'] = df['ds'].apply(
+            lambda x: 1 if HolidayCalendar.is_holiday(x.strftime("%Y-%m-%d"), self.holidays) else 0
+        )
+        return df
+
+    def holiday_boosts(self, ds):
+        return ds.apply(lambda x: HolidayCalendar.get_holiday_boost(x.strftime("%Y-%m-%d"), self.holidays))
+
+    def add_future_regressors(self, df, future):
+        future_start = df['ds'].max() + timedelta(days=1)
+        recent_trend = df['trend_score'].tail(7).mean() if 'trend_score' in df.columns else 0.5
+        future['trend_score'] = future['ds'].apply(
+            lambda x: recent_trend if x >= future_start else
+            df[df['ds'] == x]['trend_score'].values[0] if x in df['ds'].values else recent_trend
+        )
+        future['holiday_boost'] = self.holiday_boosts(future['ds'])
+        return future
+
+
+def _dataset(rng: np.random.Generator):
+    start = date.today() - timedelta(days=DAYS)
+    days = [start + timedelta(days=i) for i in range(DAYS)]
+    kinds = ["National", "Regional", "Observance"]
+    holidays = [
+        {"date": str(start + timedelta(days=int(d))), "name": f"Holiday {i}", "type": kinds[i % 3]}
+        for i, d in enumerate(rng.choice(2 * 365, size=2 * HOLIDAYS_PER_YEAR, replace=False))
+    ]
+    trends, histories = {}, {}
+    for movie_id in range(MOVIES):
+        title = f"Movie {movie_id}"
+        trends[title] = [{"date": str(d), "value": int(v)} for d, v in zip(days, rng.integers(0, 100, DAYS))]
+        histories[title] = list(zip(days, rng.poisson(30, DAYS).tolist()))
+    return trends, holidays, histories
+
+
+def _run(forecaster_cls, trends, holidays, histories):
+    forecaster = forecaster_cls(trend_data=trends, holidays=holidays)
+    frames = {}
+    start = time.perf_counter()
+    for title, history in histories.items():
+        df = forecaster.prepare_data_with_regressors(history, title)
+        future = pd.DataFrame({"ds": pd.date_range(df["ds"].min(), df["ds"].max() + timedelta(days=FORECAST_DAYS))})
+        frames[title] = (df, forecaster.add_future_regressors(df, future))
+    return time.perf_counter() - start, frames
+
+
+def main():
+    trends, holidays, histories = _dataset(np.random.default_rng(11))
+    print(f"{MOVIES} movies x {DAYS} days, {len(holidays)} holidays, best of {ROUNDS}")
+    results = {}
+    for name, cls in (("row-wise apply", RowwiseForecaster), ("vectorized", EnhancedMovieDemandForecaster)):
+        best, frames = min((_run(cls, trends, holidays, histories) for _ in range(ROUNDS)), key=lambda r: r[0])
+        results[name] = (best, frames)
+        print(f"{name:>16}: {best * 1000:9.1f} ms  ({best * 1000 / MOVIES:.2f} ms/movie)")
+
+    (slow, expected), (fast, actual) = results.values()
+    for title in histories:
+        for old, new in zip(expected[title], actual[title]):
+            pd.testing.assert_frame_equal(old, new, check_dtype=False)
+    print(f"{'speedup':>16}: {slow / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
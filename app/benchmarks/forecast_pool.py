@@ -0,0 +1,79 @@
+"""
+Wall time of the per-movie Prophet fits (agent.tools.demand_model) against
+the number of forecast pool workers.
+
+Fits MOVIES synthetic 60-day booking histories (weekly pattern, trend
+and a holiday) once inline (0 workers, the old sequential behaviour) and
+then on pools of 1, 2, 4, ... workers up to the core count. The first
+pool call includes spawning the workers, so every pool is warmed up with
+one fit per worker before it is timed.
+
+Run from the app/ directory:
+    python -m benchmarks.forecast_pool
+"""
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from agent.tools.demand_model import (
+    FORECAST_DAYS,
+    PROPHET_AVAILABLE,
+    EnhancedMovieDemandForecaster,
+    fit_movie_model,
+)
+from agent.tools.forecast_pool import ForecastPool
+
+MOVIES = 25
+HISTORY_DAYS = 60
+TASK_TIMEOUT = 120
+
+
+def _jobs(rng: np.random.Generator) -> dict:
+    today = date.today()
+    days = [today - timedelta(days=HISTORY_DAYS - i) for i in range(HISTORY_DAYS)]
+    holidays = [{"date": str(days[HISTORY_DAYS // 2]), "name": "Holiday", "type": "National"}]
+    jobs = {}
+    for movie_id in range(1, MOVIES + 1):
+        title = f"Movie {movie_id}"
+        weekly = np.array([0.85, 0.85, 0.9, 0.9, 1.1, 1.2, 1.15])[[d.weekday() for d in days]]
+        counts = rng.poisson(40 * weekly * np.linspace(1.2, 0.8, HISTORY_DAYS)) + 1
+        trends = {title: [{"date": str(d), "value": int(rng.integers(20, 100))} for d in days]}
+        forecaster = EnhancedMovieDemandForecaster(trend_data=trends, holidays=holidays)
+        df = forecaster.prepare_data_with_regressors(list(zip(days, counts.tolist())), title)
+        jobs[movie_id] = (holidays, df, FORECAST_DAYS)
+    return jobs
+
+
+def _timed(pool: ForecastPool, jobs: dict) -> float:
+    start = time.perf_counter()
+    results = pool.map(fit_movie_model, jobs)
+    elapsed = time.perf_counter() - start
+    assert len(results) == len(jobs), f"{len(jobs) - len(results)} fits failed"
+    return elapsed
+
+
+def main():
+    if not PROPHET_AVAILABLE:
+        print("prophet is not installed; nothing to benchmark")
+        return
+    jobs = _jobs(np.random.default_rng(7))
+    cores = os.cpu_count() or 1
+    print(f"{MOVIES} movies x {HISTORY_DAYS} days, {cores} cores")
+    print(f"{'workers':>8} {'wall s':>8} {'s/movie':>8} {'speedup':>8}")
+
+    baseline = _timed(ForecastPool(max_workers=0, task_timeout=0), jobs)
+    print(f"{'inline':>8} {baseline:>8.2f} {baseline / MOVIES:>8.3f} {1.0:>8.2f}")
+    workers = 1
+    while workers <= cores:
+        pool = ForecastPool(max_workers=workers, task_timeout=TASK_TIMEOUT)
+        pool.map(fit_movie_model, {k: jobs[k] for k in list(jobs)[:workers]})
+        elapsed = _timed(pool, jobs)
+        pool.shutdown()
+        print(f"{workers:>8} {elapsed:>8.2f} {elapsed / MOVIES:>8.3f} {baseline / elapsed:>8.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Login throughput through the bcrypt worker pool.
+
+Fires CONCURRENCY verifications at the pool for each worker count and
+reports logins/second overall and per worker core.
+
+Run from the app/ directory:
+    python -m benchmarks.login_throughput
+"""
+import asyncio
+import os
+import time
+
+from utils.auth.jwt_handler import hash_password
+from utils.auth.password_pool import PasswordHasherPool
+
+LOGINS = 64
+PASSWORD = "correct horse battery staple"
+
+
+async def _run(pool: PasswordHasherPool, hashed: str) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(pool.verify(PASSWORD, hashed) for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return elapsed
+
+
+def main():
+    hashed = hash_password(PASSWORD)
+    cores = os.cpu_count() or 1
+    print(f"{'workers':>8} {'logins/s':>10} {'logins/s/core':>14}")
+    workers = 1
+    while workers <= cores:
+        pool = PasswordHasherPool(max_workers=workers, max_pending=LOGINS)
+        elapsed = asyncio.run(_run(pool, hashed))
+        pool.shutdown()
+        rate = LOGINS / elapsed
+        print(f"{workers:>8} {rate:>10.1f} {rate / workers:>14.1f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
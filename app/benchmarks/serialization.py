@@ -0,0 +1,90 @@
+"""
+Serialization cost per request: FastAPI's default path (validate, jsonable_encoder,
+json.dumps) vs. the precomputed pydantic serializers and orjson.
+
+Run from the app/ directory:
+    python -m benchmarks.serialization
+"""
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
+from schemas.booking_schema import BookingOut
+from schemas.serializers import booking_out
+from utils.serialization import FAST_JSON_ENABLED, orjson
+
+ITERATIONS = 50
+BOOKINGS = 1000
+SEATS_PER_BOOKING = 4
+SEATMAP_SEATS = 400
+
+
+def _bookings():
+    start = datetime(2025, 1, 1, 18, 0)
+    rows = []
+    for i in range(BOOKINGS):
+        seats = [
+            SimpleNamespace(booked_seat_id=i * 10 + s, booking_id=i, seat_id=s + 1, show_id=7, price=180.0, gst_id=1)
+            for s in range(SEATS_PER_BOOKING)
+        ]
+        rows.append(SimpleNamespace(
+            booking_id=i, user_id=i % 50, show_id=7, booking_reference=f"BK{i:08d}",
+            booking_status="CONFIRMED", payment_id=i, discount_id=None,
+            booking_time=start + timedelta(minutes=i), amount=720, seats=seats, foods=[],
+        ))
+    return rows
+
+
+def _seatmap():
+    return {
+        "type": "seatmap",
+        "show_id": 7,
+        "seats": [
+            {"seat_id": s, "seat_number": f"{chr(65 + s // 20)}{s % 20 + 1}", "category_id": 1 + s // 100,
+             "status": "available" if s % 3 else "booked", "price": 180.0}
+            for s in range(SEATMAP_SEATS)
+        ],
+    }
+
+
+def _per_call_ms(fn) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1e3
+
+
+def main():
+    bookings = _bookings()
+    seatmap = _seatmap()
+
+    def default_path():
+        models = [BookingOut.model_validate(b) for b in bookings]
+        json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+    def precomputed():
+        booking_out.dump_many(bookings)
+
+    print(f"{BOOKINGS} bookings x {SEATS_PER_BOOKING} seats:")
+    before = _per_call_ms(default_path)
+    after = _per_call_ms(precomputed)
+    print(f"  validate + jsonable_encoder + json.dumps: {before:8.2f} ms/request")
+    print(f"  precomputed BookingOut serializer:        {after:8.2f} ms/request ({before / after:.1f}x)")
+
+    print(f"seat map broadcast ({SEATMAP_SEATS} seats):")
+    std = _per_call_ms(lambda: json.dumps(seatmap))
+    print(f"  json.dumps:   {std * 1e3:8.1f} us/message")
+    if orjson is not None:
+        fast = _per_call_ms(lambda: orjson.dumps(seatmap).decode("utf-8"))
+        print(f"  orjson.dumps: {fast * 1e3:8.1f} us/message ({std / fast:.1f}x)")
+    else:
+        print("  orjson not installed")
+    print(f"FAST_JSON enabled for the app: {FAST_JSON_ENABLED}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from database import SessionLocal
 from model import Show, Screen, Movie, Seat, BookedSeat
 from model.seat import SeatLock,SeatLockStatusEnum
 from chatbot.state import ChatState
+from utils.movie_search import movie_search
 from datetime import datetime, timezone
 
 logger = logging.getLogger("chat_graph.screen")
@@ -93,10 +94,10 @@ async def resolve_screen(state: ChatState) -> ChatState:
 
         # If movie identified by title text but not movie_id, try to resolve
         if not movie_id and movie_title:
-            m = db.query(Movie).filter(Movie.title.ilike(f"%{movie_title}%")).first()
+            m = movie_search.best_match(db, movie_title)
             if m:
-                state["movie_id"] = m.movie_id
-                movie_id = m.movie_id
+                state["movie_id"] = m["movie_id"]
+                movie_id = m["movie_id"]
 
         # If we have movie_id and show_date but no show_time/show_id -> present show options
         if movie_id and show_date and not state.get("show_id") and not show_time:
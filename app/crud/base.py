@@ -1,12 +1,313 @@
-from typing import Generic, TypeVar, Type, Optional
-from sqlalchemy.orm import Session
+from typing import Generic, TypeVar, Type, Optional, List, Tuple, Any, Dict, Sequence
+from sqlalchemy import tuple_, insert, update, delete, func, text
+from sqlalchemy.orm import Session, Query
 from pydantic import BaseModel
 from fastapi import HTTPException, status
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+import base64
+import csv
+import io
+import json
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# ---------------- KEYSET PAGINATION ----------------
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(column, raw: Any) -> Any:
+    if raw is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return raw
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is time:
+        return time.fromisoformat(raw)
+    if python_type is Decimal:
+        return Decimal(raw)
+    return raw
+
+
+def encode_cursor(order_field: str, descending: bool, order_value: Any, pk_value: Any) -> str:
+    raw = json.dumps({"f": order_field, "d": descending, "v": _encode_value(order_value), "k": _encode_value(pk_value)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(data, dict) or not {"f", "d", "v", "k"} <= data.keys():
+            raise ValueError("missing keys")
+        return data
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+def _is_indexed(model, field: str) -> bool:
+    if not isinstance(field, str):
+        return False
+    column = model.__table__.columns.get(field)
+    if column is None:
+        return False
+    if column.primary_key or column.index or column.unique:
+        return True
+    # Leading column of a composite index or unique constraint
+    for index in model.__table__.indexes:
+        if list(index.columns)[0] is column:
+            return True
+    return False
+
+
+def _check_sortable(model, field: str) -> None:
+    if not _is_indexed(model, field):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot paginate {model.__name__} by '{field}'; choose an indexed column",
+        )
+
+
+def keyset_paginate(
+    query: Query,
+    model,
+    pk_field: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    order_by: Optional[str] = None,
+    descending: bool = False,
+    skip: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Page through `query` ordered by (order_by, primary key).
+
+    With a cursor the page starts right after the row the cursor points at
+    (a range scan on the index); without one it falls back to `skip`.
+    Returns the rows and an opaque cursor for the next page, or None.
+    """
+    if cursor:
+        state = decode_cursor(cursor)
+        order_by, descending = state["f"], bool(state["d"])
+    order_by = order_by or pk_field
+    _check_sortable(model, order_by)
+    order_col = getattr(model, order_by)
+    pk_col = getattr(model, pk_field)
+
+    if cursor:
+        last_value = _decode_value(order_col, state["v"])
+        last_pk = _decode_value(pk_col, state["k"])
+        if order_by == pk_field:
+            query = query.filter(pk_col < last_pk if descending else pk_col > last_pk)
+        else:
+            key, bound = tuple_(order_col, pk_col), tuple_(last_value, last_pk)
+            query = query.filter(key < bound if descending else key > bound)
+
+    if order_by == pk_field:
+        query = query.order_by(pk_col.desc() if descending else pk_col.asc())
+    elif descending:
+        query = query.order_by(order_col.desc(), pk_col.desc())
+    else:
+        query = query.order_by(order_col.asc(), pk_col.asc())
+
+    if skip and not cursor:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(order_by, descending, getattr(last, order_by), getattr(last, pk_field))
+    return rows, next_cursor
+
+
+# ---------------- SPARSE FIELDSETS ----------------
+def parse_fields(model, pk_field: str, fields: Optional[str], *extra: Optional[str]) -> Optional[List[str]]:
+    """
+    Turn a `fields=` query value ("movie_id,title,rating") into a list of
+    column names, always starting with the primary key. None means all columns.
+    Extra names (e.g. the paging column) are added and validated the same way.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    columns = model.__table__.columns
+    unknown = [str(f) for f in requested + [e for e in extra if e] if not isinstance(f, str) or f not in columns]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields for {model.__name__}: {', '.join(unknown)}"
+        )
+    names = [pk_field]
+    for name in requested + [e for e in extra if e]:
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def project(query: Query, model, names: List[str]) -> Query:
+    """Select only the given columns; rows come back as lightweight tuples."""
+    return query.with_entities(*(getattr(model, name) for name in names))
+
+
+def rows_as_dicts(rows: Sequence[Any], names: List[str]) -> List[Dict[str, Any]]:
+    return [dict(zip(names, row)) for row in rows]
+
+
+# ---------------- BULK HELPERS ----------------
+# Batches at least this large are loaded with COPY when the caller does not need the rows back
+COPY_THRESHOLD = 1000
+MAX_BULK_ITEMS = 10000
+_COPY_NULL = "\\N"
+
+
+def _apply_python_defaults(model, rows: List[Dict[str, Any]]) -> None:
+    # COPY bypasses the ORM, so client-side Column(default=...) values are filled in here
+    for column in model.__table__.columns:
+        default = column.default
+        if default is None:
+            continue
+        for row in rows:
+            if column.key in row:
+                continue
+            if default.is_scalar:
+                row[column.key] = default.arg
+            elif default.is_callable:
+                row[column.key] = default.arg(None)
+
+
+def copy_rows(db: Session, model, rows: List[Dict[str, Any]]) -> int:
+    """
+    Load rows into the model's table with a single COPY ... FROM STDIN.
+    Uses the session's connection, so it is part of the current transaction.
+    """
+    if not rows:
+        return 0
+    rows = [dict(r) for r in rows]
+    _apply_python_defaults(model, rows)
+    columns = [c.key for c in model.__table__.columns if c.key in rows[0]]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        out = []
+        for col in columns:
+            value = row.get(col)
+            if value is None:
+                out.append(_COPY_NULL)
+            elif isinstance(value, Enum):
+                out.append(value.value)
+            elif isinstance(value, (datetime, date, time)):
+                out.append(value.isoformat())
+            elif isinstance(value, dict):
+                out.append(json.dumps(value))
+            else:
+                out.append(value)
+        writer.writerow(out)
+    buffer.seek(0)
+
+    column_sql = ", ".join(f'"{c}"' for c in columns)
+    sql = f"COPY \"{model.__tablename__}\" ({column_sql}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+    dbapi_conn = db.connection().connection.dbapi_connection
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def copy_supported(db: Session, rows: Sequence[Dict[str, Any]]) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    # Arrays have their own COPY literal syntax; leave those to INSERT
+    return not any(isinstance(v, (list, tuple)) for row in rows for v in row.values())
+
+
+# ---------------- COUNTERS ----------------
+def increment_counters(db: Session, model, key: Dict[str, Any], deltas: Dict[str, Any]) -> None:
+    """
+    Add deltas to the counter columns of the row identified by key (its
+    primary key), inserting it first if missing. A single upsert on
+    Postgres/SQLite, so concurrent writers never lose an increment.
+    """
+    if not any(deltas.values()):
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        stmt = upsert(model).values(**key, **deltas)
+        set_ = {name: getattr(model, name) + getattr(stmt.excluded, name) for name in deltas}
+        if "updated_at" in model.__table__.columns:
+            set_["updated_at"] = func.now()
+        db.execute(stmt.on_conflict_do_update(index_elements=list(key), set_=set_))
+        return
+
+    pk = tuple(key[c.key] for c in model.__table__.primary_key.columns)
+    existing = db.get(model, pk, with_for_update=True)
+    if existing is None:
+        db.add(model(**key, **deltas))
+    else:
+        for name, delta in deltas.items():
+            setattr(existing, name, (getattr(existing, name) or 0) + delta)
+    db.flush()
+
+
+def lock_for_rebuild(db: Session, *models) -> None:
+    """
+    Block concurrent writers to the given tables until the caller's transaction
+    ends. Rebuilds (recount, delete, reinsert) take this first so an
+    increment_counters() upsert cannot commit between the recount and the
+    replace and be lost. Readers are not blocked. No-op outside Postgres.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    names = ", ".join(f'"{model.__tablename__}"' for model in models)
+    db.execute(text(f"LOCK TABLE {names} IN EXCLUSIVE MODE"))
+
+
+def insert_if_missing(db: Session, model, values: Dict[str, Any]) -> bool:
+    """
+    Insert the row unless one with the same primary key exists; True if this
+    call inserted it. A single INSERT ... ON CONFLICT DO NOTHING on
+    Postgres/SQLite, so concurrent callers cannot both insert.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        pk = [c.key for c in model.__table__.primary_key.columns]
+        stmt = upsert(model).values(**values).on_conflict_do_nothing(index_elements=pk)
+        return db.execute(stmt.returning(*(getattr(model, c) for c in pk))).first() is not None
+
+    pk = tuple(values[c.key] for c in model.__table__.primary_key.columns)
+    if db.get(model, pk) is not None:
+        return False
+    db.add(model(**values))
+    db.flush()
+    return True
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType], id_field: str = "id"):
         self.model = model
@@ -24,14 +325,38 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return obj
 
     # ---------------- GET ALL ----------------
-    def get_all(self, db: Session, skip=0, limit=10, filters=None):
+    def _filtered_query(self, db: Session, filters=None):
         query = db.query(self.model)
         if filters:
             for key, value in filters.items():
                 if value is not None:
                     query = query.filter(getattr(self.model, key) == value)
-        data = query.offset(skip).limit(limit).all()
-        return data
+        return query
+
+    def get_all(self, db: Session, skip=0, limit=10, filters=None, fields: Optional[str] = None):
+        query = self._filtered_query(db, filters)
+        pk_column = getattr(self.model, self.id_field)
+        names = parse_fields(self.model, self.id_field, fields)
+        if names:
+            query = project(query, self.model, names)
+        data = query.order_by(pk_column).offset(skip).limit(limit).all()
+        return rows_as_dicts(data, names) if names else data
+
+    # ---------------- GET PAGE (keyset) ----------------
+    def get_page(self, db: Session, limit=10, filters=None, cursor: Optional[str] = None,
+                 order_by: Optional[str] = None, descending: bool = False, skip=0,
+                 fields: Optional[str] = None):
+        """Returns (items, next_cursor); see keyset_paginate."""
+        query = self._filtered_query(db, filters)
+        # The cursor needs the ordering column, so always project it
+        page_field = decode_cursor(cursor)["f"] if cursor else order_by
+        if page_field:
+            _check_sortable(self.model, page_field)
+        names = parse_fields(self.model, self.id_field, fields, page_field)
+        if names:
+            query = project(query, self.model, names)
+        rows, next_cursor = keyset_paginate(query, self.model, self.id_field, limit, cursor, order_by, descending, skip)
+        return (rows_as_dicts(rows, names) if names else rows), next_cursor
 
     # ---------------- CREATE ----------------
     def create(self, db: Session, obj_in: CreateSchemaType):
@@ -41,6 +366,79 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(obj)
         return obj
 
+    # ---------------- BULK CREATE ----------------
+    def bulk_create(self, db: Session, objs_in: List[CreateSchemaType], return_rows: bool = True):
+        """
+        Insert many rows in one transaction.
+
+        Uses a multi-row INSERT ... RETURNING so no per-row refresh is needed.
+        When the rows are not needed back and the batch is large, loads them
+        with COPY instead and returns the number of rows inserted.
+        """
+        if len(objs_in) > MAX_BULK_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {MAX_BULK_ITEMS} items per bulk request"
+            )
+        rows = [obj.model_dump() for obj in objs_in]
+        return self.bulk_insert_rows(db, rows, return_rows=return_rows)
+
+    def bulk_insert_rows(self, db: Session, rows: List[Dict[str, Any]], return_rows: bool = True,
+                         copy_threshold: int = COPY_THRESHOLD):
+        if not rows:
+            return [] if return_rows else 0
+        try:
+            if not return_rows and len(rows) >= copy_threshold and copy_supported(db, rows):
+                result = copy_rows(db, self.model, rows)
+            elif return_rows:
+                result = list(db.scalars(insert(self.model).returning(self.model), rows))
+            else:
+                db.execute(insert(self.model), rows)
+                result = len(rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result
+
+    # ---------------- BULK UPDATE ----------------
+    def bulk_update(self, db: Session, ids: List[int], obj_in: UpdateSchemaType) -> int:
+        """Apply the same changes to every row in `ids` with one UPDATE; returns rows updated."""
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if not ids or not update_data:
+            return 0
+        pk_column = getattr(self.model, self.id_field)
+        try:
+            result = db.execute(
+                update(self.model)
+                .where(pk_column.in_(ids))
+                .values(**update_data)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
+
+    # ---------------- BULK DELETE ----------------
+    def bulk_remove(self, db: Session, ids: List[int]) -> int:
+        """Delete every row in `ids` with one DELETE; returns rows deleted."""
+        if not ids:
+            return 0
+        pk_column = getattr(self.model, self.id_field)
+        try:
+            result = db.execute(
+                delete(self.model)
+                .where(pk_column.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return result.rowcount
+
     # ---------------- UPDATE ----------------
     def update(self, db: Session, db_obj: ModelType, obj_in: UpdateSchemaType):
         if not db_obj:
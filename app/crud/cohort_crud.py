@@ -0,0 +1,218 @@
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, or_, update
+from sqlalchemy.orm import Session
+
+from crud.base import increment_counters, insert_if_missing, lock_for_rebuild
+from model.booking import Booking, BookingStatusEnum
+from model.reporting import CohortActivity, SignupCohort, UserCohort
+from model.user import User
+
+
+def week_start(value) -> date:
+    """Monday of the week containing value (date, datetime or SQLite date text)."""
+    if isinstance(value, datetime):
+        value = value.date()
+    elif not isinstance(value, date):
+        value = date.fromisoformat(str(value)[:10])
+    return value - timedelta(days=value.weekday())
+
+
+class CohortCRUD:
+    """
+    Maintains signup_cohorts, user_cohorts and cohort_activity.
+
+    record_signup() places a new user in their signup-week cohort and
+    record_activity() counts a confirmed booking towards the cohort's active
+    users for that week, both in the caller's transaction. Each member is
+    counted at most once per week: the conditional update on
+    user_cohorts.last_active_week only matches the first booking of a week,
+    and only that one bumps the counter. record_cancelled() and
+    record_show_cancelled() take a member back out of a week when the
+    cancelled booking was their only confirmed one in it. reconcile()
+    rebuilds all three tables from users and confirmed bookings.
+    """
+
+    # ---------------- INCREMENTAL ----------------
+    def record_signup(self, db: Session, user: User) -> date:
+        """Add user to their signup-week cohort; a no-op if they already have one."""
+        cohort_week = week_start(user.created_at or datetime.now())
+        if insert_if_missing(db, UserCohort, {"user_id": user.user_id, "cohort_week": cohort_week}):
+            increment_counters(db, SignupCohort, {"cohort_week": cohort_week}, {"users": 1})
+        return cohort_week
+
+    def record_activity(self, db: Session, user_id: int, at: Optional[datetime] = None) -> bool:
+        """Count user_id as active in the week of at (a confirmed booking); True if this was their first that week."""
+        week = week_start(at or datetime.now())
+        marked = db.execute(
+            update(UserCohort)
+            .where(
+                UserCohort.user_id == user_id,
+                or_(UserCohort.last_active_week.is_(None), UserCohort.last_active_week < week),
+            )
+            .values(last_active_week=week)
+            .returning(UserCohort.cohort_week)
+        ).first()
+        if marked is None:
+            if db.get(UserCohort, user_id) is not None:
+                return False
+            # Users from before cohorts were tracked join on their first booking;
+            # if a concurrent booking got there first, the retry sees its row
+            user = db.get(User, user_id)
+            if user is None:
+                return False
+            self.record_signup(db, user)
+            return self.record_activity(db, user_id, at)
+        offset = (week - marked.cohort_week).days // 7
+        if offset < 0:
+            return False
+        increment_counters(
+            db,
+            CohortActivity,
+            {"cohort_week": marked.cohort_week, "week_offset": offset},
+            {"active_users": 1},
+        )
+        return True
+
+    def record_cancelled(self, db: Session, booking, previous_status) -> bool:
+        """A booking was cancelled; True if that removed its user from the week's active count."""
+        if getattr(previous_status, "value", str(previous_status)).upper() != BookingStatusEnum.CONFIRMED.value:
+            return False
+        if booking.booking_date is None:
+            return False
+        return self._remove_activity(db, booking.user_id, booking.booking_date, Booking.booking_id != booking.booking_id)
+
+    def record_show_cancelled(self, db: Session, show_id: int) -> int:
+        """Every booking of a show is being cancelled; call before their status changes. Returns user-weeks removed."""
+        user_weeks = {
+            (user_id, week_start(booking_date))
+            for user_id, booking_date in db.query(Booking.user_id, Booking.booking_date).filter(
+                Booking.show_id == show_id,
+                Booking.booking_status == BookingStatusEnum.CONFIRMED,
+                Booking.booking_date.isnot(None),
+            )
+        }
+        return sum(self._remove_activity(db, user_id, week, Booking.show_id != show_id) for user_id, week in user_weeks)
+
+    def _remove_activity(self, db: Session, user_id: int, at, others) -> bool:
+        """Undo record_activity() for the week of at unless a confirmed booking matching `others` keeps the user active."""
+        week = week_start(at)
+        # The row lock serializes this with record_activity() and other cancellations for the user
+        member = db.query(UserCohort).filter(UserCohort.user_id == user_id).with_for_update().first()
+        if member is None or week < week_start(member.cohort_week):
+            return False
+        week_from = datetime.combine(week, time.min)
+        confirmed = db.query(Booking.booking_date).filter(
+            Booking.user_id == user_id,
+            Booking.booking_status == BookingStatusEnum.CONFIRMED,
+            Booking.booking_date.isnot(None),
+            others,
+        )
+        if confirmed.filter(Booking.booking_date >= week_from, Booking.booking_date < week_from + timedelta(days=7)).first():
+            return False
+        cohort_week = week_start(member.cohort_week)
+        increment_counters(
+            db,
+            CohortActivity,
+            {"cohort_week": cohort_week, "week_offset": (week - cohort_week).days // 7},
+            {"active_users": -1},
+        )
+        if member.last_active_week is not None and week_start(member.last_active_week) == week:
+            # Let a new booking this week count again
+            previous = confirmed.filter(Booking.booking_date < week_from).order_by(Booking.booking_date.desc()).first()
+            member.last_active_week = week_start(previous.booking_date) if previous else None
+        db.flush()
+        return True
+
+    # ---------------- RECONCILIATION ----------------
+    def reconcile(self, db: Session) -> Dict[str, int]:
+        """Rebuild cohorts and weekly activity from users and confirmed bookings; commits."""
+        # Signups and bookings wait for the rebuild instead of landing between the
+        # recount and the replace; same table order as record_activity() to avoid deadlocks
+        lock_for_rebuild(db, UserCohort, SignupCohort, CohortActivity)
+        members = {user_id: week_start(created_at or datetime.now()) for user_id, created_at in db.query(User.user_id, User.created_at)}
+        booking_day = func.date(Booking.booking_date)
+        active_weeks: Dict[int, set] = {}
+        confirmed = (
+            db.query(Booking.user_id, booking_day)
+            .filter(Booking.booking_status == BookingStatusEnum.CONFIRMED, Booking.booking_date.isnot(None))
+            .group_by(Booking.user_id, booking_day)
+        )
+        for user_id, day in confirmed:
+            if user_id in members:
+                active_weeks.setdefault(user_id, set()).add(week_start(day))
+
+        sizes = Counter(members.values())
+        activity: Counter = Counter()
+        for user_id, weeks in active_weeks.items():
+            cohort_week = members[user_id]
+            for week in weeks:
+                if week >= cohort_week:
+                    activity[(cohort_week, (week - cohort_week).days // 7)] += 1
+
+        db.execute(delete(CohortActivity))
+        db.execute(delete(UserCohort))
+        db.execute(delete(SignupCohort))
+        if members:
+            db.execute(
+                insert(UserCohort),
+                [
+                    {"user_id": user_id, "cohort_week": cohort_week, "last_active_week": max(active_weeks[user_id]) if user_id in active_weeks else None}
+                    for user_id, cohort_week in members.items()
+                ],
+            )
+            db.execute(insert(SignupCohort), [{"cohort_week": week, "users": users} for week, users in sizes.items()])
+        if activity:
+            db.execute(
+                insert(CohortActivity),
+                [{"cohort_week": week, "week_offset": offset, "active_users": users} for (week, offset), users in activity.items()],
+            )
+        db.commit()
+        return {"users": len(members), "cohorts": len(sizes), "activity_rows": len(activity)}
+
+    # ---------------- READ ----------------
+    def total_users(self, db: Session) -> int:
+        return int(db.query(func.coalesce(func.sum(SignupCohort.users), 0)).scalar() or 0)
+
+    def retention(self, db: Session, start_week: date, end_week: date, weeks: int) -> List[dict]:
+        """
+        Retention curve per cohort with signup week in start_week..end_week:
+        active members and their share of the cohort for week offsets
+        0..weeks (capped at the weeks elapsed so far), zero-filled.
+        """
+        start_week, end_week = week_start(start_week), week_start(end_week)
+        current_week = week_start(date.today())
+        cohorts = (
+            db.query(SignupCohort.cohort_week, SignupCohort.users)
+            .filter(SignupCohort.cohort_week >= start_week, SignupCohort.cohort_week <= end_week)
+            .order_by(SignupCohort.cohort_week)
+            .all()
+        )
+        active: Dict[Tuple[date, int], int] = {
+            (week_start(cohort_week), offset): users
+            for cohort_week, offset, users in db.query(CohortActivity.cohort_week, CohortActivity.week_offset, CohortActivity.active_users)
+            .filter(
+                CohortActivity.cohort_week >= start_week,
+                CohortActivity.cohort_week <= end_week,
+                CohortActivity.week_offset <= weeks,
+            )
+        }
+        result = []
+        for cohort_week, users in cohorts:
+            cohort_week = week_start(cohort_week)
+            elapsed = min(weeks, max(0, (current_week - cohort_week).days // 7))
+            curve = []
+            for offset in range(elapsed + 1):
+                count = active.get((cohort_week, offset), 0)
+                curve.append({
+                    "week": offset,
+                    "active_users": count,
+                    "retention_pct": round(count * 100.0 / users, 2) if users else 0.0,
+                })
+            result.append({"cohort_week": cohort_week, "users": int(users), "weeks": curve})
+        return result
+
+
+cohort_crud = CohortCRUD()
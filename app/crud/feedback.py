@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from model.feedback import Feedback
+from crud.base import keyset_paginate
 
 
 def get_feedback(db: Session, feedback_id: int) -> Optional[Feedback]:
@@ -21,6 +22,11 @@ def list_feedbacks(db: Session, skip: int = 0, limit: int = 50) -> List[Feedback
     )
 
 
+def list_feedbacks_page(db: Session, limit: int = 50, cursor: Optional[str] = None, skip: int = 0) -> Tuple[List[Feedback], Optional[str]]:
+    # Newest first; feedback_id increases with feedback_date, so it doubles as the keyset column
+    return keyset_paginate(db.query(Feedback), Feedback, "feedback_id", limit, cursor, "feedback_id", True, skip)
+
+
 def create_feedback(db: Session, *, booking_id: int, user_id: int, rating: int, comment: Optional[str]) -> Feedback:
     fb = Feedback(
         booking_id=booking_id,
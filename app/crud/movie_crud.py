@@ -1,10 +1,10 @@
-from crud.base import CRUDBase
+from crud.base import CRUDBase, parse_fields, project, rows_as_dicts
 from model.movie import Movie
 from schemas.movie_schema import MovieCreate, MovieUpdate
 from sqlalchemy.orm import Session
 
 class CRUDMovie(CRUDBase[Movie, MovieCreate, MovieUpdate]):
-    def get_all(self, db: Session, skip=0, limit=10, filters=None, sort_by=None):
+    def _filtered_query(self, db: Session, filters=None):
         query = db.query(Movie)
         if filters:
             for attr, value in filters.items():
@@ -22,6 +22,13 @@ class CRUDMovie(CRUDBase[Movie, MovieCreate, MovieUpdate]):
                     query = query.filter(Movie.format.any(value))
                 if attr == "release_date_from" and value:
                     query = query.filter(Movie.release_date >= value)
+        return query
+
+    def get_all(self, db: Session, skip=0, limit=10, filters=None, sort_by=None, fields=None):
+        query = self._filtered_query(db, filters)
+        names = parse_fields(Movie, "movie_id", fields)
+        if names:
+            query = project(query, Movie, names)
         if sort_by:
              for attr, direction in sort_by.items():
                 if hasattr(Movie, attr):
@@ -30,5 +37,8 @@ class CRUDMovie(CRUDBase[Movie, MovieCreate, MovieUpdate]):
                         query = query.order_by(column.desc())
                     else:
                         query = query.order_by(column.asc())
-        return query.offset(skip).limit(limit).all()
+        # Primary key as the final tie-breaker keeps pages stable
+        query = query.order_by(Movie.movie_id.asc())
+        data = query.offset(skip).limit(limit).all()
+        return rows_as_dicts(data, names) if names else data
 movie_crud = CRUDMovie(Movie, id_field="movie_id")
\ No newline at end of file
@@ -0,0 +1,191 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, delete, func
+from sqlalchemy.orm import Session
+
+from crud.base import increment_counters, lock_for_rebuild
+from model.booking import BookedSeat, Booking, BookingStatusEnum
+from model.reporting import DailySalesRollup
+from model.theatre import Show
+
+_COUNTERS = ("revenue", "bookings", "seats", "cancellations")
+
+RollupKey = Tuple[date, int, int]
+
+
+def _status(booking) -> str:
+    value = booking.booking_status
+    return getattr(value, "value", str(value)).upper()
+
+
+def _sales_day(booking) -> date:
+    booked_at = booking.booking_date
+    if booked_at is None:
+        return datetime.utcnow().date()
+    return booked_at.date()
+
+
+def _amount(booking) -> Decimal:
+    # bookings.amount is an integer column; the in-memory value may still be the float total
+    return Decimal(int(round(float(booking.amount or 0))))
+
+
+def _as_date(value) -> date:
+    # SQLite's date() returns text
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class SalesRollupCRUD:
+    """
+    Maintains daily_sales_rollup.
+
+    record_confirmed/record_cancelled apply deltas in the same transaction as
+    the booking status change (callers commit); reconcile() rebuilds a date
+    range from bookings, booked_seats and shows.
+    """
+
+    # ---------------- INCREMENTAL ----------------
+    def apply(self, db: Session, key: RollupKey, **deltas) -> None:
+        """Add deltas to one rollup row, creating it if needed."""
+        sales_date, movie_id, screen_id = key
+        increment_counters(
+            db,
+            DailySalesRollup,
+            {"sales_date": sales_date, "movie_id": movie_id, "screen_id": screen_id},
+            {name: deltas.get(name, 0) for name in _COUNTERS},
+        )
+
+    def _key(self, db: Session, booking, show: Optional[Show] = None) -> Optional[RollupKey]:
+        if show is None or show.show_id != booking.show_id:
+            show = db.query(Show).filter(Show.show_id == booking.show_id).first()
+        if show is None:
+            return None
+        return _sales_day(booking), show.movie_id, show.screen_id
+
+    def record_confirmed(self, db: Session, booking, seats: int, show: Optional[Show] = None) -> None:
+        key = self._key(db, booking, show)
+        if key is not None:
+            self.apply(db, key, revenue=_amount(booking), bookings=1, seats=seats)
+
+    def record_cancelled(self, db: Session, booking, previous_status, seats: int, show: Optional[Show] = None) -> None:
+        """
+        Count a cancellation; if the booking had been confirmed its sale is
+        taken back out. Call before the booked seats are deleted.
+        """
+        key = self._key(db, booking, show)
+        if key is None:
+            return
+        was_confirmed = getattr(previous_status, "value", str(previous_status)).upper() == BookingStatusEnum.CONFIRMED.value
+        if was_confirmed:
+            self.apply(db, key, revenue=-_amount(booking), bookings=-1, seats=-seats, cancellations=1)
+        else:
+            self.apply(db, key, cancellations=1)
+
+    def record_show_cancelled(self, db: Session, show: Show) -> int:
+        """Cancellation deltas for every booking of a show that is not already cancelled."""
+        bookings = (
+            db.query(Booking)
+            .filter(Booking.show_id == show.show_id, Booking.booking_status != BookingStatusEnum.CANCELLED)
+            .all()
+        )
+        if not bookings:
+            return 0
+        seat_counts = dict(
+            db.query(BookedSeat.booking_id, func.count(BookedSeat.booked_seat_id))
+            .filter(BookedSeat.booking_id.in_([b.booking_id for b in bookings]))
+            .group_by(BookedSeat.booking_id)
+            .all()
+        )
+        for booking in bookings:
+            self.record_cancelled(db, booking, _status(booking), seat_counts.get(booking.booking_id, 0), show=show)
+        return len(bookings)
+
+    # ---------------- RECONCILIATION ----------------
+    def compute(self, db: Session, start: date, end: date) -> Dict[RollupKey, dict]:
+        """Aggregate the source tables for bookings made between start and end (inclusive)."""
+        day = func.date(Booking.booking_date)
+        in_range = (
+            Booking.booking_date >= datetime.combine(start, datetime.min.time()),
+            Booking.booking_date < datetime.combine(end + timedelta(days=1), datetime.min.time()),
+        )
+        confirmed = Booking.booking_status == BookingStatusEnum.CONFIRMED
+        cancelled = Booking.booking_status == BookingStatusEnum.CANCELLED
+
+        totals: Dict[RollupKey, dict] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        booking_rows = (
+            db.query(
+                day.label("day"),
+                Show.movie_id,
+                Show.screen_id,
+                func.coalesce(func.sum(case((confirmed, Booking.amount), else_=0)), 0),
+                func.coalesce(func.sum(case((confirmed, 1), else_=0)), 0),
+                func.coalesce(func.sum(case((cancelled, 1), else_=0)), 0),
+            )
+            .join(Show, Show.show_id == Booking.show_id)
+            .filter(*in_range)
+            .group_by(day, Show.movie_id, Show.screen_id)
+            .all()
+        )
+        for sales_day, movie_id, screen_id, revenue, bookings, cancellations in booking_rows:
+            row = totals[(_as_date(sales_day), movie_id, screen_id)]
+            row.update(revenue=Decimal(revenue or 0), bookings=int(bookings), cancellations=int(cancellations))
+
+        seat_rows = (
+            db.query(day.label("day"), Show.movie_id, Show.screen_id, func.count(BookedSeat.booked_seat_id))
+            .join(Booking, Booking.booking_id == BookedSeat.booking_id)
+            .join(Show, Show.show_id == Booking.show_id)
+            .filter(confirmed, *in_range)
+            .group_by(day, Show.movie_id, Show.screen_id)
+            .all()
+        )
+        for sales_day, movie_id, screen_id, seats in seat_rows:
+            totals[(_as_date(sales_day), movie_id, screen_id)]["seats"] = int(seats)
+        return totals
+
+    def reconcile(self, db: Session, start: date, end: date) -> int:
+        """Replace the rollup rows for start..end with freshly aggregated ones; commits."""
+        # Recount and replace in one transaction with booking deltas held off until commit
+        lock_for_rebuild(db, DailySalesRollup)
+        totals = self.compute(db, start, end)
+        db.execute(
+            delete(DailySalesRollup).where(
+                DailySalesRollup.sales_date >= start,
+                DailySalesRollup.sales_date <= end,
+            )
+        )
+        db.add_all(
+            DailySalesRollup(sales_date=d, movie_id=m, screen_id=s, **counters)
+            for (d, m, s), counters in totals.items()
+        )
+        db.commit()
+        return len(totals)
+
+    # ---------------- READ ----------------
+    def daily_totals(
+        self,
+        db: Session,
+        start: date,
+        end: date,
+        movie_id: Optional[int] = None,
+        screen_id: Optional[int] = None,
+    ) -> Iterable:
+        query = db.query(
+            DailySalesRollup.sales_date.label("day"),
+            func.sum(DailySalesRollup.revenue).label("revenue"),
+            func.sum(DailySalesRollup.bookings).label("bookings"),
+            func.sum(DailySalesRollup.seats).label("seats"),
+            func.sum(DailySalesRollup.cancellations).label("cancellations"),
+        ).filter(DailySalesRollup.sales_date >= start, DailySalesRollup.sales_date <= end)
+        if movie_id is not None:
+            query = query.filter(DailySalesRollup.movie_id == movie_id)
+        if screen_id is not None:
+            query = query.filter(DailySalesRollup.screen_id == screen_id)
+        return query.group_by(DailySalesRollup.sales_date).order_by(DailySalesRollup.sales_date).all()
+
+
+sales_rollup_crud = SalesRollupCRUD()
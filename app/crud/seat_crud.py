@@ -1,17 +1,122 @@
 from crud.base import CRUDBase
-from model import Seat
-from schemas.seat_schema import SeatCreate, SeatUpdate
+from model import Seat, SeatCategory, BookedSeat
+from schemas.seat_schema import SeatCreate, SeatUpdate, SeatGridRequest
 from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
 from typing import List
+
+# Seat rows are narrow and a typical hall has a few hundred, below the generic COPY_THRESHOLD
+GRID_COPY_THRESHOLD = 200
+
+
+def row_label(index: int) -> str:
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    label = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        label = chr(ord("A") + rem) + label
+    return label
+
+
 class SeatCRUD(CRUDBase[Seat, SeatCreate, SeatUpdate]):
     def create(self, db: Session, obj_in_list: List[SeatCreate]) -> List[Seat]:
-    
-        seats = [Seat(**item.model_dump()) for item in obj_in_list]
-        db.add_all(seats)
-        db.commit()
-        for seat in seats:
-            db.refresh(seat)
-        return seats  
+        # One multi-row INSERT ... RETURNING instead of a refresh per seat
+        return self.bulk_create(db, obj_in_list)
+
+    def generate_grid(self, db: Session, screen_id: int, req: SeatGridRequest) -> dict:
+        """
+        Build every seat for a screen from its categories' rows/cols and load
+        them in one statement (COPY for large grids). Categories are stacked front to back and
+        narrower ones are centred on the widest.
+        """
+        categories = db.query(SeatCategory).filter(SeatCategory.screen_id == screen_id).all()
+        if not categories:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Screen {screen_id} has no seat categories to generate seats from"
+            )
+        by_id = {c.category_id: c for c in categories}
+        if req.category_order:
+            unknown = [cid for cid in req.category_order if cid not in by_id]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Categories {unknown} do not belong to screen {screen_id}"
+                )
+            ordered = [by_id[cid] for cid in req.category_order]
+            ordered += [c for c in sorted(categories, key=lambda c: c.category_id) if c.category_id not in req.category_order]
+        else:
+            ordered = sorted(categories, key=lambda c: c.category_id)
+
+        existing = db.query(Seat.seat_id).filter(Seat.screen_id == screen_id)
+        if existing.first():
+            if not req.replace_existing:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Screen {screen_id} already has seats; pass replace_existing to regenerate"
+                )
+            if db.query(BookedSeat.booked_seat_id).filter(BookedSeat.seat_id.in_(existing.subquery())).first():
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Screen {screen_id} has booked seats and cannot be regenerated"
+                )
+
+        aisles = sorted(set(a for a in req.aisle_after_cols if a > 0))
+        max_cols = max(c.cols for c in ordered)
+
+        def physical_width(cols: int) -> int:
+            return cols + sum(1 for a in aisles if a < cols)
+
+        grid_width = physical_width(max_cols)
+        rows: List[dict] = []
+        summary = []
+        row_index = 0
+        physical_row = 0
+        for pos, category in enumerate(ordered):
+            if pos > 0:
+                physical_row += req.gap_rows_between_categories
+            offset = (grid_width - physical_width(category.cols)) // 2
+            first_row = row_index
+            for _ in range(category.rows):
+                physical_row += 1
+                label = row_label(row_index)
+                col = offset
+                for seat_no in range(1, category.cols + 1):
+                    col += 1
+                    rows.append({
+                        "screen_id": screen_id,
+                        "row_number": physical_row,
+                        "col_number": col,
+                        "category_id": category.category_id,
+                        "seat_number": f"{label}{seat_no}",
+                        "is_available": True,
+                    })
+                    if seat_no in aisles:
+                        col += 1
+                row_index += 1
+            summary.append({
+                "category_id": category.category_id,
+                "category_name": category.category_name,
+                "first_row": row_label(first_row),
+                "last_row": row_label(row_index - 1),
+                "rows": category.rows,
+                "seats_per_row": category.cols,
+                "seats": category.rows * category.cols,
+            })
+
+        if req.replace_existing:
+            db.query(Seat).filter(Seat.screen_id == screen_id).delete(synchronize_session=False)
+        # Only the count is returned, so large grids are loaded with COPY; the delete commits with it
+        self.bulk_insert_rows(db, rows, return_rows=False, copy_threshold=GRID_COPY_THRESHOLD)
+
+        return {
+            "screen_id": screen_id,
+            "total_seats": len(rows),
+            "total_rows": row_index,
+            "grid_width": grid_width,
+            "categories": summary,
+        }
 
 
 seat_crud = SeatCRUD(Seat, id_field="seat_id")
\ No newline at end of file
@@ -3,6 +3,8 @@ from model import ShowCategoryPricing
 from schemas.theatre_schema import ShowCategoryPricingCreate, ShowCategoryPricingUpdate
 from crud.seat_category_crud import seat_category_crud
 from fastapi import HTTPException, status
+from model import SeatCategory
+from typing import List
 
 class ShowCategoryPricingCRUD(CRUDBase[ShowCategoryPricing, ShowCategoryPricingCreate, ShowCategoryPricingUpdate]):
 
@@ -30,4 +32,25 @@ class ShowCategoryPricingCRUD(CRUDBase[ShowCategoryPricing, ShowCategoryPricingC
 
         return super().create(db, obj_in)
 
+    def bulk_create(self, db, objs_in: List[ShowCategoryPricingCreate], return_rows: bool = True):
+        # Zero price means "use the category's base price", resolved with one query for the batch
+        zero_ids = {o.category_id for o in objs_in if o.price == 0}
+        if zero_ids:
+            base_prices = dict(
+                db.query(SeatCategory.category_id, SeatCategory.base_price)
+                .filter(SeatCategory.category_id.in_(zero_ids))
+                .all()
+            )
+            missing = zero_ids - base_prices.keys()
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Seat category not found: {sorted(missing)}"
+                )
+            for o in objs_in:
+                if o.price == 0:
+                    o.price = base_prices[o.category_id]
+        # Duplicate (show_id, category_id) pairs hit uq_pricing_show_category and roll back the batch
+        return super().bulk_create(db, objs_in, return_rows=return_rows)
+
 show_category_pricing_crud = ShowCategoryPricingCRUD(ShowCategoryPricing, id_field="pricing_id")
@@ -0,0 +1,251 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+
+from crud.base import increment_counters, lock_for_rebuild
+from model.booking import BookedSeat, Booking, BookingStatusEnum
+from model.movie import Movie
+from model.reporting import ScreenCapacity, ShowOccupancy
+from model.seat import Seat
+from model.theatre import Screen, SeatCategory, Show
+from utils.live_sales import live_sales
+
+# Seats without a category are kept under this id
+UNCATEGORIZED = 0
+
+
+def _category(category_id: Optional[int]) -> int:
+    return category_id if category_id is not None else UNCATEGORIZED
+
+
+class ShowOccupancyCRUD:
+    """
+    Maintains screen_capacity and show_occupancy.
+
+    Capacity is refreshed whenever seats change; seats sold and revenue per
+    category are applied on booking confirmation and cancellation in the
+    caller's transaction. reconcile() rebuilds both from the source tables.
+    """
+
+    # ---------------- CAPACITY ----------------
+    def refresh_capacity(self, db: Session, screen_ids: Optional[Iterable[int]] = None) -> int:
+        """Recount sellable seats per category for the given screens (all screens if None); commits."""
+        query = db.query(Seat.screen_id, Seat.category_id, func.count(Seat.seat_id)).filter(Seat.is_available.is_(True))
+        clear = delete(ScreenCapacity)
+        if screen_ids is not None:
+            screen_ids = list(set(screen_ids))
+            if not screen_ids:
+                return 0
+            query = query.filter(Seat.screen_id.in_(screen_ids))
+            clear = clear.where(ScreenCapacity.screen_id.in_(screen_ids))
+
+        lock_for_rebuild(db, ScreenCapacity)
+        counts: Dict[Tuple[int, int], int] = defaultdict(int)
+        for screen_id, category_id, seats in query.group_by(Seat.screen_id, Seat.category_id).all():
+            counts[(screen_id, _category(category_id))] += int(seats)
+        db.execute(clear)
+        db.add_all(
+            ScreenCapacity(screen_id=screen_id, category_id=category_id, capacity=seats)
+            for (screen_id, category_id), seats in counts.items()
+        )
+        db.commit()
+        live_sales.invalidate()
+        return len(counts)
+
+    # ---------------- INCREMENTAL ----------------
+    def _seat_totals(self, db: Session, booking_id: int) -> List[Tuple[int, int, Decimal]]:
+        rows = (
+            db.query(Seat.category_id, func.count(BookedSeat.booked_seat_id), func.coalesce(func.sum(BookedSeat.price), 0))
+            .join(Seat, Seat.seat_id == BookedSeat.seat_id)
+            .filter(BookedSeat.booking_id == booking_id)
+            .group_by(Seat.category_id)
+            .all()
+        )
+        return [(_category(category_id), int(seats), Decimal(revenue)) for category_id, seats, revenue in rows]
+
+    def _apply(self, db: Session, booking, sign: int) -> Tuple[int, Decimal]:
+        total_seats, total_revenue = 0, Decimal(0)
+        for category_id, seats, revenue in self._seat_totals(db, booking.booking_id):
+            increment_counters(
+                db,
+                ShowOccupancy,
+                {"show_id": booking.show_id, "category_id": category_id},
+                {"seats_sold": sign * seats, "revenue": sign * revenue},
+            )
+            total_seats += seats
+            total_revenue += revenue
+        return sign * total_seats, sign * total_revenue
+
+    def record_confirmed(self, db: Session, booking) -> Tuple[int, Decimal]:
+        """Call once the booking's seats are flushed; returns the (seats, revenue) added."""
+        db.flush()
+        return self._apply(db, booking, 1)
+
+    def record_cancelled(self, db: Session, booking, previous_status) -> Tuple[int, Decimal]:
+        """
+        Take a confirmed booking's seats back out; call before its booked
+        seats are deleted. Returns the (seats, revenue) delta.
+        """
+        if getattr(previous_status, "value", str(previous_status)).upper() == BookingStatusEnum.CONFIRMED.value:
+            return self._apply(db, booking, -1)
+        return 0, Decimal(0)
+
+    def clear_show(self, db: Session, show_id: int) -> Tuple[int, Decimal]:
+        """Every booking of the show was cancelled; returns the (seats, revenue) removed."""
+        seats, revenue = (
+            db.query(func.coalesce(func.sum(ShowOccupancy.seats_sold), 0), func.coalesce(func.sum(ShowOccupancy.revenue), 0))
+            .filter(ShowOccupancy.show_id == show_id)
+            .one()
+        )
+        db.query(ShowOccupancy).filter(ShowOccupancy.show_id == show_id).delete(synchronize_session=False)
+        return -int(seats), -Decimal(revenue)
+
+    # ---------------- RECONCILIATION ----------------
+    def reconcile(self, db: Session, start: date, end: Optional[date] = None) -> int:
+        """Rebuild show_occupancy for shows dated start..end (open-ended if end is None); commits."""
+        shows = db.query(Show.show_id).filter(Show.show_date >= start)
+        if end is not None:
+            shows = shows.filter(Show.show_date <= end)
+        show_ids = shows.scalar_subquery()
+
+        # Recount and replace in one transaction with booking deltas held off until commit
+        lock_for_rebuild(db, ShowOccupancy)
+        rows = (
+            db.query(
+                BookedSeat.show_id,
+                Seat.category_id,
+                func.count(BookedSeat.booked_seat_id),
+                func.coalesce(func.sum(BookedSeat.price), 0),
+            )
+            .join(Booking, Booking.booking_id == BookedSeat.booking_id)
+            .join(Seat, Seat.seat_id == BookedSeat.seat_id)
+            .filter(Booking.booking_status == BookingStatusEnum.CONFIRMED, BookedSeat.show_id.in_(show_ids))
+            .group_by(BookedSeat.show_id, Seat.category_id)
+            .all()
+        )
+        totals: Dict[Tuple[int, int], list] = defaultdict(lambda: [0, Decimal(0)])
+        for show_id, category_id, seats, revenue in rows:
+            entry = totals[(show_id, _category(category_id))]
+            entry[0] += int(seats)
+            entry[1] += Decimal(revenue)
+
+        db.execute(delete(ShowOccupancy).where(ShowOccupancy.show_id.in_(show_ids)))
+        db.add_all(
+            ShowOccupancy(show_id=show_id, category_id=category_id, seats_sold=seats, revenue=revenue)
+            for (show_id, category_id), (seats, revenue) in totals.items()
+        )
+        db.commit()
+        return len(totals)
+
+    # ---------------- READ ----------------
+    def get_page(
+        self,
+        db: Session,
+        start: date,
+        end: date,
+        movie_id: Optional[int] = None,
+        screen_id: Optional[int] = None,
+        status: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> Tuple[int, List[dict]]:
+        """
+        Occupancy per show for shows dated start..end, ordered by date and
+        time, with per-category detail. One query pages the shows; the rest
+        fetch counters, capacities and category names for that page only.
+        """
+        query = db.query(Show.show_id).filter(Show.show_date >= start, Show.show_date <= end)
+        if movie_id is not None:
+            query = query.filter(Show.movie_id == movie_id)
+        if screen_id is not None:
+            query = query.filter(Show.screen_id == screen_id)
+        if status is not None:
+            query = query.filter(Show.status == status)
+        total = query.count()
+
+        rows = (
+            query.with_entities(
+                Show.show_id,
+                Show.show_date,
+                Show.show_time,
+                Show.status,
+                Show.movie_id,
+                Movie.title,
+                Show.screen_id,
+                Screen.screen_name,
+            )
+            .outerjoin(Movie, Movie.movie_id == Show.movie_id)
+            .outerjoin(Screen, Screen.screen_id == Show.screen_id)
+            .order_by(Show.show_date, Show.show_time, Show.show_id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            return total, []
+
+        show_ids = [r[0] for r in rows]
+        screen_ids = {r[6] for r in rows}
+        sold_by_show: Dict[int, Dict[int, Tuple[int, Decimal]]] = defaultdict(dict)
+        for show_id, category_id, seats, revenue in (
+            db.query(ShowOccupancy.show_id, ShowOccupancy.category_id, ShowOccupancy.seats_sold, ShowOccupancy.revenue)
+            .filter(ShowOccupancy.show_id.in_(show_ids))
+            .all()
+        ):
+            sold_by_show[show_id][category_id] = (int(seats), Decimal(revenue))
+        capacity_by_screen: Dict[int, Dict[int, int]] = defaultdict(dict)
+        for sid, category_id, seats in (
+            db.query(ScreenCapacity.screen_id, ScreenCapacity.category_id, ScreenCapacity.capacity)
+            .filter(ScreenCapacity.screen_id.in_(screen_ids))
+            .all()
+        ):
+            capacity_by_screen[sid][category_id] = int(seats)
+        category_ids = {c for per_show in sold_by_show.values() for c in per_show}
+        category_ids |= {c for per_screen in capacity_by_screen.values() for c in per_screen}
+        names = dict(
+            db.query(SeatCategory.category_id, SeatCategory.category_name)
+            .filter(SeatCategory.category_id.in_(category_ids))
+            .all()
+        ) if category_ids else {}
+
+        items = []
+        for show_id, show_date, show_time, show_status, m_id, title, s_id, screen_name in rows:
+            per_show = sold_by_show.get(show_id, {})
+            per_screen = capacity_by_screen.get(s_id, {})
+            categories = []
+            for category_id in sorted(set(per_show) | set(per_screen)):
+                c_sold, c_revenue = per_show.get(category_id, (0, Decimal(0)))
+                c_cap = per_screen.get(category_id, 0)
+                categories.append({
+                    "category_id": category_id,
+                    "category_name": names.get(category_id),
+                    "seats_sold": c_sold,
+                    "capacity": c_cap,
+                    "revenue": float(c_revenue),
+                    "occupancy_pct": round(c_sold * 100.0 / c_cap, 2) if c_cap else 0.0,
+                })
+            seats_sold = sum(c["seats_sold"] for c in categories)
+            cap = sum(c["capacity"] for c in categories)
+            items.append({
+                "show_id": show_id,
+                "show_date": show_date,
+                "show_time": show_time,
+                "status": getattr(show_status, "value", show_status),
+                "movie_id": m_id,
+                "movie_title": title,
+                "screen_id": s_id,
+                "screen": screen_name,
+                "seats_sold": seats_sold,
+                "capacity": cap,
+                "revenue": round(sum(c["revenue"] for c in categories), 2),
+                "occupancy_pct": round(seats_sold * 100.0 / cap, 2) if cap else 0.0,
+                "categories": categories,
+            })
+        return total, items
+
+
+show_occupancy_crud = ShowOccupancyCRUD()
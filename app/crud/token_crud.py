@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from model.revoked_token import RevokedToken
 from datetime import datetime
+from utils.auth.revocation_cache import revocation_cache
 
 def revoke_token(db: Session, jti: str, token_type: str, user_id: int = None):
     if not jti:
@@ -12,9 +13,13 @@ def revoke_token(db: Session, jti: str, token_type: str, user_id: int = None):
     db.add(rt)
     db.commit()
     db.refresh(rt)
+    # Make the revocation visible to this worker immediately; other workers pick it up on their next poll
+    revocation_cache.add(rt.jti, rt.token_type, rt.revoked_at)
     return rt
 
 def is_token_revoked(db: Session, jti: str) -> bool:
     if not jti:
         return False
-    return db.query(RevokedToken).filter(RevokedToken.jti == jti).first() is not None
\ No newline at end of file
+    if revocation_cache.loaded:
+        return revocation_cache.is_revoked(jti)
+    return db.query(RevokedToken).filter(RevokedToken.jti == jti).first() is not None
@@ -1,15 +1,16 @@
 from crud.base import CRUDBase
+from crud.cohort_crud import cohort_crud
 from model.user import User
 from schemas.user_schema import UserCreate, UserUpdate
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from utils.auth.jwt_handler import (
-    verify_password,
-    hash_password,
     create_access_token,
     create_refresh_token,
 )
+from utils.auth.password_pool import password_pool
 from fastapi import Response, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from utils.config import settings
 from datetime import datetime, timedelta
 from typing import Dict, TypedDict
@@ -29,12 +30,38 @@ password_reset_tokens: Dict[str, ResetTokenData] = {}
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    def create(self, db: Session, obj_in: UserCreate) -> User:
-        existing_user = (
-            db.query(User)
-            .filter(or_(User.email == obj_in.email, User.phone == obj_in.phone))
-            .first()
-        )
+    # The async methods await the bcrypt pool; their database work runs in the
+    # threadpool through these helpers so it never blocks the event loop.
+    @staticmethod
+    def _find_existing(db: Session, email: str, phone: str):
+        return db.query(User).filter(or_(User.email == email, User.phone == phone)).first()
+
+    @staticmethod
+    def _get_by_email(db: Session, email: str):
+        return db.query(User).filter(User.email == email).first()
+
+    @staticmethod
+    def _get_by_id(db: Session, user_id: int):
+        return db.query(User).filter(User.user_id == user_id).first()
+
+    @staticmethod
+    def _insert(db: Session, new_user: User) -> User:
+        db.add(new_user)
+        db.flush()
+        cohort_crud.record_signup(db, new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user
+
+    @staticmethod
+    def _set_password(db: Session, user: User, hashed: str) -> str:
+        user.password = hashed
+        db.commit()
+        # Read back here: the commit expired the instance and reloading it would hit the database
+        return user.email
+
+    async def create(self, db: Session, obj_in: UserCreate) -> User:
+        existing_user = await run_in_threadpool(self._find_existing, db, obj_in.email, obj_in.phone)
         if existing_user:
             raise ValueError("A user with this email or phone number already exists.")
         new_user = User(
@@ -42,16 +69,15 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             phone=obj_in.phone,
             name=obj_in.name,
             role=obj_in.role,
-            password=hash_password(obj_in.password),
+            password=await password_pool.hash(obj_in.password),
         )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        return new_user
+        return await run_in_threadpool(self._insert, db, new_user)
 
-    def login(self, response: Response, db: Session, email: str, password: str) -> dict:
-        user = db.query(User).filter(User.email == email).first()
-        if user and verify_password(password, user.password):
+    async def login(self, response: Response, db: Session, email: str, password: str) -> dict:
+        user = await run_in_threadpool(self._get_by_email, db, email)
+        ok = bool(user) and await password_pool.verify(password, user.password)
+        password_pool.metrics.record_login(ok)
+        if ok:
             token_data = {
                 "user_id": user.user_id,
                 "email": user.email,
@@ -109,7 +135,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             "message": "If the email exists, a password reset link has been sent."
         }
 
-    def reset_password(self, db: Session, token: str, new_password: str) -> dict:
+    async def reset_password(self, db: Session, token: str, new_password: str) -> dict:
         """
         Complete password reset using a previously issued token.
         """
@@ -136,7 +162,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             )
 
         # Get user by email
-        user = db.query(User).filter(User.email == token_data["email"]).first()
+        user = await run_in_threadpool(self._get_by_email, db, token_data["email"])
         if not user:
             # Remove token even if user not found
             del password_reset_tokens[token]
@@ -146,36 +172,35 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             )
 
         # Update password (hashed)
-        user.password = hash_password(new_password)
-        db.commit()
+        email = await run_in_threadpool(self._set_password, db, user, await password_pool.hash(new_password))
 
         # Remove used token
         del password_reset_tokens[token]
 
         return {
             "message": "Password reset successfully. You can now login with your new password.",
-            "email": user.email,
+            "email": email,
         }
 
-    def change_password(
+    async def change_password(
         self, db: Session, user_id: int, current_password: str, new_password: str
     ) -> dict:
         """
         Change password for an authenticated user.
         """
-        user = db.query(User).filter(User.user_id == user_id).first()
+        user = await run_in_threadpool(self._get_by_id, db, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
-        if not verify_password(current_password, user.password):
+        if not await password_pool.verify(current_password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Current password is incorrect",
             )
 
-        if verify_password(new_password, user.password):
+        if await password_pool.verify(new_password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="New password must be different from current password",
@@ -187,12 +212,11 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
                 detail="Password must be at least 8 characters long.",
             )
 
-        user.password = hash_password(new_password)
-        db.commit()
+        email = await run_in_threadpool(self._set_password, db, user, await password_pool.hash(new_password))
 
         return {
             "message": "Password changed successfully",
-            "email": user.email,
+            "email": email,
         }
 
     def _send_reset_email(self, to_email: str, user_name: str, reset_token: str) -> None:
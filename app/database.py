@@ -1,12 +1,20 @@
 from beanie import init_beanie
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from motor.motor_asyncio import AsyncIOMotorClient
 from model.backup_restore import BackupLog,RestoreLog
 from model.notification import Notification
 from model.cms import CMSContent
+from utils.config import settings
+from utils.db_metrics import InstrumentedQueuePool, MongoPoolListener, sql_pool_stats
+import hashlib
+import itertools
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,7 +22,23 @@ load_dotenv()
 SQLALCHEMY_DATABASE_URL = os.getenv("sqlalchemy_database_url")
 MONGODB_URL = os.getenv("mongodb_url")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def engine_options(url: str) -> dict:
+    """Pool settings shared by every SQLAlchemy engine in the app."""
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 def get_db():
@@ -24,8 +48,144 @@ def get_db():
     finally:
         db.close()
 
-client = AsyncIOMotorClient(MONGODB_URL)
-db = client["mydb"]  
+
+@contextmanager
+def advisory_lock(name: str):
+    """
+    Cross-process lock for background jobs that must run in one worker only.
+
+    Yields True in the process that got the lock and False in the others
+    (no waiting). On Postgres this is a session-level pg_try_advisory_lock
+    held on its own pooled connection until the block exits, and released by
+    the server if that connection dies. Other databases are single-process
+    here, so the lock is always granted.
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+    key = int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:8], "big", signed=True)
+    with engine.connect() as conn:
+        acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+        # Don't sit idle in a transaction while the job runs
+        conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                conn.commit()
+
+
+# ---------------- READ REPLICAS ----------------
+logger = logging.getLogger("app.database")
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything it received
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, **engine_options(url))
+        self.lag_seconds = None
+        self.healthy = False
+        self.checked_at = 0.0
+        self.error = None
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                self.lag_seconds = float(conn.execute(_REPLICA_LAG_SQL).scalar() or 0)
+            self.healthy = self.lag_seconds <= settings.READ_REPLICA_MAX_LAG_SECONDS
+            self.error = None
+        except Exception as exc:
+            self.healthy = False
+            self.error = str(exc)
+            logger.warning("Read replica %s unavailable: %s", self.engine.url.host, exc)
+        self.checked_at = time.monotonic()
+
+
+class ReadRouter:
+    """
+    Picks an engine for read-only work: replicas round-robin, skipping any
+    that are down or lag more than READ_REPLICA_MAX_LAG_SECONDS, and the
+    primary when none qualify (or none are configured). Lag is re-checked
+    at most every READ_REPLICA_CHECK_SECONDS per replica.
+
+    For a local test, point READ_REPLICA_URLS at a second Postgres instance
+    streaming from the first.
+    """
+
+    def __init__(self, primary, urls):
+        self.primary = primary
+        self.replicas = [Replica(url) for url in urls]
+        self._cycle = itertools.cycle(range(len(self.replicas))) if self.replicas else None
+        self._lock = threading.Lock()
+        self.primary_fallbacks = 0
+
+    def _refresh(self, replica: Replica) -> None:
+        if time.monotonic() - replica.checked_at >= settings.READ_REPLICA_CHECK_SECONDS:
+            replica.check()
+
+    def engine(self):
+        if not self.replicas:
+            return self.primary
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[next(self._cycle)]
+            self._refresh(replica)
+            if replica.healthy:
+                return replica.engine
+        self.primary_fallbacks += 1
+        return self.primary
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {
+                    "host": r.engine.url.host,
+                    "healthy": r.healthy,
+                    "lag_seconds": r.lag_seconds,
+                    "error": r.error,
+                    "pool": sql_pool_stats(r.engine),
+                }
+                for r in self.replicas
+            ],
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+read_router = ReadRouter(engine, settings.READ_REPLICA_URLS)
+
+
+def ReadSessionLocal():
+    """Session for read-only work, bound to a replica when one is usable."""
+    return SessionLocal(bind=read_router.engine())
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# One Motor client for the whole process (beanie, backups/restores, CMS)
+mongo_pool_listener = MongoPoolListener()
+client = AsyncIOMotorClient(
+    MONGODB_URL,
+    maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+    minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+    event_listeners=[mongo_pool_listener],
+)
+db = client[settings.MONGO_DB_NAME]
 async def init_mongo():
     await init_beanie(
         database=db,
@@ -33,4 +193,12 @@ async def init_mongo():
     )
 
 def get_mongo_db():
-    return db
\ No newline at end of file
+    return db
+
+
+def pool_stats() -> dict:
+    return {
+        "postgres": sql_pool_stats(engine),
+        "read_replicas": read_router.stats(),
+        "mongo": mongo_pool_listener.snapshot(),
+    }
@@ -11,7 +11,7 @@ from routers.seat_router import router as seat_router
 from routers.seat_category_routes import router as seat_category_router
 from routers.show_router import router as show_router
 from routers.show_category_pricing_schema import router as show_category_pricing_router
-from database import SessionLocal, engine, Base, init_mongo
+from database import SessionLocal, ReadSessionLocal, engine, Base, init_mongo, client as mongo_client, db as mongo_db, advisory_lock
 import asyncio
 from sqlalchemy.orm import Session
 from crud.seat_lock_crud import SeatLockCRUD
@@ -36,19 +36,35 @@ from routers.feedback import router as feedback_router
 import logging
 import traceback
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError, OperationalError
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from beanie import init_beanie
 from routers.ticket_router import router as ticket_router
 from utils.middleware.logger import setup_logging, LoggingMiddleware
 from routers.chat_router import router as chat_router
 from routers.agent_router import router as agent_router
+from utils.auth.revocation_cache import revocation_cache
+from utils.auth.password_pool import password_pool
+from agent.tools.forecast_pool import forecast_pool
+from utils.middleware.rate_limit import RateLimitMiddleware
+from utils.middleware.response_cache import ResponseCacheMiddleware
+from utils.middleware.compression import CompressionMiddleware
+from routers.cms_router import router as cms_router
+from routers.metrics_router import router as metrics_router
+from routers.reports import router as reports_router
+from routers.export_router import router as export_router
+from crud.cohort_crud import cohort_crud
+from crud.sales_rollup_crud import sales_rollup_crud
+from crud.show_occupancy_crud import show_occupancy_crud
+from utils.analytics_store import analytics_store
+from utils.live_sales import live_sales
+from utils.config import settings
+from utils.movie_search import movie_search
+from utils.serialization import DefaultResponse
 
 Base.metadata.create_all(bind=engine)
 logger = logging.getLogger("uvicorn.error")
@@ -56,14 +72,15 @@ setup_logging()
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-app = FastAPI()
+app = FastAPI(default_response_class=DefaultResponse)
 
 
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-DB_NAME = os.getenv("DB_NAME", "mydatabase")
 
 seatlock_crud = SeatLockCRUD()
 
+# Added before CORS so that cached and 429 responses still carry CORS headers
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -73,7 +90,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["Authorization", "Content-Type", "Accept"],
-    expose_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 @app.middleware("http")
 async def global_single_middleware(request: Request, call_next):
@@ -185,6 +202,10 @@ async def allow_ws(request, call_next):
         return await call_next(request)
     return await call_next(request)
 
+# Outermost, so error responses from global_single_middleware are compressed too;
+# plain ASGI, so websocket scopes are never buffered
+app.add_middleware(CompressionMiddleware)
+
 
 async def cleanup_task():
     while True:
@@ -195,15 +216,10 @@ async def cleanup_task():
         await asyncio.sleep(600)  # every 10 minutes
 
 @app.on_event("startup")
-async def startup():
-    app.state.mongo_client = AsyncIOMotorClient(MONGO_URI)
-    app.state.mongo_db = app.state.mongo_client[DB_NAME]
-    await init_beanie(
-        database=app.state.mongo_db,
-        document_models=[BackupLog, RestoreLog, Notification],
-    )
-@app.on_event("startup")
 async def startup_event():
+    # Shared Motor client from database.py; beanie is initialised once there
+    app.state.mongo_client = mongo_client
+    app.state.mongo_db = mongo_db
     await init_mongo()
     await init_stream_group()
     asyncio.create_task(consume_notifications())
@@ -213,6 +229,127 @@ async def startup_event():
     asyncio.create_task(cleanup_task())
 
 
+async def revocation_sync_task():
+    last_prune = 0.0
+    while True:
+        await asyncio.sleep(settings.REVOCATION_POLL_SECONDS)
+        db: Session = SessionLocal()
+        try:
+            revocation_cache.refresh(db)
+            now = asyncio.get_running_loop().time()
+            if now - last_prune >= settings.REVOCATION_PRUNE_SECONDS:
+                pruned = revocation_cache.prune(db)
+                last_prune = now
+                if pruned:
+                    print(f"[Revocation] Pruned {pruned} expired revoked tokens")
+        except Exception as e:
+            print(f"[Revocation] Sync error: {e}")
+        finally:
+            db.close()
+
+def reconcile_rollups():
+    # Every worker wakes up for this; the one holding the lock runs the rebuilds
+    with advisory_lock("sales_rollup_reconcile") as leader:
+        if not leader:
+            print("[SalesRollup] Reconciliation running in another worker; skipping")
+            return
+        db: Session = SessionLocal()
+        try:
+            end = datetime.now(timezone.utc).date()
+            start = end - timedelta(days=settings.SALES_ROLLUP_RECONCILE_DAYS)
+            rows = sales_rollup_crud.reconcile(db, start, end)
+            print(f"[SalesRollup] Reconciled {rows} rows for {start}..{end}")
+            show_occupancy_crud.refresh_capacity(db)
+            rows = show_occupancy_crud.reconcile(db, start)
+            print(f"[Occupancy] Reconciled {rows} rows for shows from {start}")
+            counts = cohort_crud.reconcile(db)
+            print(f"[Cohorts] Reconciled {counts}")
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+async def sales_rollup_reconcile_task():
+    while True:
+        now = datetime.now(timezone.utc)
+        next_run = now.replace(hour=settings.SALES_ROLLUP_RECONCILE_HOUR, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+        try:
+            await asyncio.to_thread(reconcile_rollups)
+        except Exception as e:
+            print(f"[SalesRollup] Reconciliation error: {e}")
+
+def take_analytics_snapshot():
+    # One worker writes the shared snapshot; the others pick up its manifest from disk
+    with advisory_lock("analytics_snapshot") as leader:
+        if not leader:
+            return None
+        age = analytics_store.age_seconds()
+        if age is not None and age < settings.ANALYTICS_SNAPSHOT_SECONDS:
+            return None  # taken by another worker while this one was waiting
+        return analytics_store.snapshot(ReadSessionLocal)
+
+async def analytics_snapshot_task():
+    while True:
+        age = analytics_store.age_seconds()
+        if age is not None and age < settings.ANALYTICS_SNAPSHOT_SECONDS:
+            await asyncio.sleep(settings.ANALYTICS_SNAPSHOT_SECONDS - age)
+            continue
+        try:
+            manifest = await asyncio.to_thread(take_analytics_snapshot)
+            if manifest is None:
+                # Another worker is writing it; check its manifest again shortly
+                await asyncio.sleep(min(60, settings.ANALYTICS_SNAPSHOT_SECONDS))
+                continue
+            print(f"[Analytics] Snapshot of {manifest['tables']} in {manifest['duration_seconds']}s")
+        except Exception as e:
+            print(f"[Analytics] Snapshot error: {e}")
+            await asyncio.sleep(settings.ANALYTICS_SNAPSHOT_SECONDS)
+
+@app.on_event("startup")
+async def start_live_sales():
+    db: Session = SessionLocal()
+    try:
+        count = live_sales.seed(db)
+        print(f"[LiveSales] Seeded {count} shows")
+    except Exception as e:
+        print(f"[LiveSales] Seed error: {e}")
+    finally:
+        db.close()
+    asyncio.create_task(live_sales.run(SessionLocal))
+
+@app.on_event("startup")
+async def start_analytics_snapshots():
+    if analytics_store.available:
+        asyncio.create_task(analytics_snapshot_task())
+    else:
+        print("[Analytics] duckdb/pyarrow not installed or disabled; analytical queries use Postgres")
+
+@app.on_event("startup")
+async def start_sales_rollup_reconcile():
+    asyncio.create_task(sales_rollup_reconcile_task())
+
+@app.on_event("startup")
+def init_movie_search():
+    if movie_search.ensure_indexes(engine):
+        print("[MovieSearch] Using pg_trgm/tsvector indexes")
+    else:
+        print("[MovieSearch] Using in-process index")
+
+@app.on_event("startup")
+async def load_revocations():
+    db: Session = SessionLocal()
+    try:
+        count = revocation_cache.load(db)
+        print(f"[Revocation] Loaded {count} revoked tokens")
+    finally:
+        db.close()
+    asyncio.create_task(revocation_sync_task())
+
+
 @app.on_event("startup")
 def startup():
     init_checkpointer()
@@ -220,6 +357,8 @@ def startup():
 @app.on_event("shutdown")
 def shutdown():
     close_checkpointer()
+    password_pool.shutdown()
+    forecast_pool.shutdown()
        
 app.include_router(user_router)
 app.include_router(movie_router)
@@ -244,4 +383,8 @@ app.include_router(seatmap_router)
 app.include_router(feedback_router)
 app.include_router(ticket_router)
 app.include_router(chat_router)
-app.include_router(agent_router)
\ No newline at end of file
+app.include_router(agent_router)
+app.include_router(metrics_router)
+app.include_router(reports_router)
+app.include_router(export_router)
+app.include_router(cms_router)
\ No newline at end of file
@@ -6,3 +6,4 @@ from model.payments import Payment
 from model.seat import Seat
 from model.feedback import Feedback
 
+from model.reporting import CohortActivity, DailySalesRollup, ScreenCapacity, ShowOccupancy, SignupCohort, UserCohort
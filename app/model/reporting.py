@@ -0,0 +1,92 @@
+from sqlalchemy import Column, Date, DateTime, Index, Integer, Numeric
+from sqlalchemy.sql import func
+
+from database import Base
+
+
+# ---------------------------------------------------------------------------
+# DAILY_SALES_ROLLUP
+# One row per (booking day, movie, screen). revenue/bookings/seats count
+# confirmed bookings net of cancellations; cancellations counts bookings
+# made that day that ended up CANCELLED.
+# ---------------------------------------------------------------------------
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+
+    sales_date = Column(Date, primary_key=True)
+    movie_id = Column(Integer, primary_key=True)
+    screen_id = Column(Integer, primary_key=True)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    bookings = Column(Integer, nullable=False, default=0)
+    seats = Column(Integer, nullable=False, default=0)
+    cancellations = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_daily_sales_rollup_movie_date", "movie_id", "sales_date"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# SCREEN_CAPACITY
+# Sellable (is_available) seats per screen and seat category, cached from
+# the seats table. Seats without a category are counted under category_id 0.
+# ---------------------------------------------------------------------------
+
+class ScreenCapacity(Base):
+    __tablename__ = "screen_capacity"
+
+    screen_id = Column(Integer, primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    capacity = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# ---------------------------------------------------------------------------
+# SHOW_OCCUPANCY
+# Seats sold and ticket revenue (booked seat prices) per show and seat
+# category, counting confirmed bookings only.
+# ---------------------------------------------------------------------------
+
+class ShowOccupancy(Base):
+    __tablename__ = "show_occupancy"
+
+    show_id = Column(Integer, primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    seats_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(12, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# ---------------------------------------------------------------------------
+# SIGNUP_COHORTS / USER_COHORTS / COHORT_ACTIVITY
+# Users grouped by signup week (Monday). cohort_activity counts, per cohort
+# and week offset since signup, the members who made a booking that week;
+# user_cohorts.last_active_week makes sure each member is counted once per
+# week.
+# ---------------------------------------------------------------------------
+
+class SignupCohort(Base):
+    __tablename__ = "signup_cohorts"
+
+    cohort_week = Column(Date, primary_key=True)
+    users = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class UserCohort(Base):
+    __tablename__ = "user_cohorts"
+
+    user_id = Column(Integer, primary_key=True)
+    cohort_week = Column(Date, nullable=False, index=True)
+    last_active_week = Column(Date, nullable=True)
+
+
+class CohortActivity(Base):
+    __tablename__ = "cohort_activity"
+
+    cohort_week = Column(Date, primary_key=True)
+    week_offset = Column(Integer, primary_key=True)
+    active_users = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
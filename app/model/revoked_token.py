@@ -8,4 +8,4 @@ class RevokedToken(Base):
     jti = Column(String, unique=True, index=True, nullable=False)
     token_type = Column(String, nullable=False)
     user_id = Column(Integer, nullable=True)
-    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
\ No newline at end of file
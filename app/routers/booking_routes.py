@@ -12,7 +12,12 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
 from crud.booking_crud import booking_crud
+from crud.cohort_crud import cohort_crud
+from crud.sales_rollup_crud import sales_rollup_crud
+from crud.show_occupancy_crud import show_occupancy_crud
+from utils.live_sales import live_sales
 from schemas.booking_schema import BookingCreate, BookingUpdate, BookingOut as BookingResponse
+from schemas.serializers import booking_out
 from model import BookedSeat, BookedFood, Booking
 from psycopg2.errors import UniqueViolation
 from sqlalchemy.exc import IntegrityError
@@ -96,6 +101,9 @@ def get_bookings(
     limit: int = 10,
     user_id: Optional[int] = Query(None),
     show_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    order_by: Optional[str] = Query(None, description="Indexed column to page by (default: booking_id)"),
+    descending: bool = False,
     current_user: dict = Depends(JWTBearer())
 ):
     filters = {}
@@ -103,7 +111,8 @@ def get_bookings(
         filters["user_id"] = user_id
     if show_id is not None:
         filters["show_id"] = show_id
-    return booking_crud.get_all(db, skip=skip, limit=limit, filters=filters)
+    items, next_cursor = booking_crud.get_page(db, limit=limit, filters=filters, cursor=cursor, order_by=order_by, descending=descending, skip=skip)
+    return booking_out.response(items, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
 @router.get("/{booking_id}/logs")
 def get_booking_logs(booking_id: int, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
@@ -169,6 +178,10 @@ async def delete_booking(booking_id: int, db: Session = Depends(get_db), payload
     booking.booking_status = "CANCELLED"
     db.add(booking)
     _log_booking_status(db, booking.booking_id, prev, "CANCELLED", StatusChangedByEnum.USER, "User-initiated cancellation")
+    seat_count = db.query(BookedSeat).filter(BookedSeat.booking_id == booking.booking_id).count()
+    sales_rollup_crud.record_cancelled(db, booking, prev, seat_count, show=show)
+    sold_delta = show_occupancy_crud.record_cancelled(db, booking, prev)
+    cohort_crud.record_cancelled(db, booking, prev)
     try:
         user = db.query(User).filter(User.user_id == booking.user_id).first()
         show = db.query(Show).filter(Show.show_id == booking.show_id).first()
@@ -216,6 +229,8 @@ async def delete_booking(booking_id: int, db: Session = Depends(get_db), payload
 
     db.commit()
     db.refresh(booking)
+    if show:
+        live_sales.record(show, *sold_delta)
     await push_notification_event({
                 "user_id": booking.user_id,
                 "notification_type": "BOOKING_CANCELLED",
@@ -237,7 +252,7 @@ def get_booking(booking_id: int, db: Session = Depends(get_db), payload: dict =
     )
     if not booking:
         raise HTTPException(404, "Booking not found")
-    return booking
+    return booking_out.response(booking)
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def create_booking(obj: BookingCreate, db: Session = Depends(get_db),payload: dict = Depends(JWTBearer())):
@@ -351,6 +366,7 @@ async def create_booking(obj: BookingCreate, db: Session = Depends(get_db),paylo
                     booking.booking_status = "CANCELLED"
                     db.add(booking)
                     _log_booking_status(db, booking.booking_id, prev, "CANCELLED", StatusChangedByEnum.PAYMENT_SERVICE, f"Payment failed: {getattr(resp, 'message', '')}")
+                    sales_rollup_crud.record_cancelled(db, booking, prev, 0)
                     db.commit()
                     db.refresh(booking)
                     raise HTTPException(status_code=400, detail=f"Payment failed: {getattr(resp, 'message', '')}")
@@ -361,8 +377,14 @@ async def create_booking(obj: BookingCreate, db: Session = Depends(get_db),paylo
                 booking.booking_status = "CONFIRMED"
                 db.add(booking)
                 _log_booking_status(db, booking.booking_id, prev, "CONFIRMED", StatusChangedByEnum.PAYMENT_SERVICE, "Payment succeeded")
+                sales_rollup_crud.record_confirmed(db, booking, len(obj.seats))
+                sold_delta = show_occupancy_crud.record_confirmed(db, booking)
+                cohort_crud.record_activity(db, booking.user_id, booking.booking_date)
                 db.commit()
                 db.refresh(booking)
+                live_show = db.get(Show, booking.show_id)
+                if live_show:
+                    live_sales.record(live_show, *sold_delta)
                 try:
                     user = db.query(User).filter(User.user_id == booking.user_id).first()
                     show = db.query(Show).filter(Show.show_id == booking.show_id).first()
@@ -7,6 +7,7 @@ import re
 
 from schemas.cms_schema import LandingContent, LandingContentUpdate
 from utils.auth.jwt_bearer import getcurrent_user
+from schemas import UserRole
 from crud.cms import read_content, write_content, store_file, get_file
 
 router = APIRouter(prefix="/cms", tags=["CMS"])
@@ -38,14 +39,14 @@ async def get_landing():
 
 
 @router.get("/admin/landing", response_model=LandingContent, summary="Get landing content (admin)")
-async def admin_get_landing(user: str = Depends(getcurrent_user)):
+async def admin_get_landing(user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     return await read_content()
 
 
 @router.put("/admin/landing", response_model=LandingContent, summary="Update landing content (admin)")
 async def admin_update_landing(
     payload: LandingContentUpdate,
-    user: str = Depends(getcurrent_user),
+    user: dict = Depends(getcurrent_user(UserRole.ADMIN.value)),
     expected_version: int | None = None
 ):
     current = await read_content()
@@ -62,7 +63,7 @@ async def admin_update_landing(
 @router.post("/admin/upload", summary="Upload image/file (admin)")
 async def admin_upload_file(
     file: UploadFile = File(...),
-    user: str = Depends(getcurrent_user)
+    user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
 ):
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename is required")
@@ -112,6 +113,6 @@ async def get_uploaded_file(file_id: str):
 
 
 @router.get("/admin/raw", summary="Return raw JSON content (admin)")
-async def admin_raw(user: str = Depends(getcurrent_user)):
+async def admin_raw(user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     content = await read_content()
     return JSONResponse(content)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from typing import List
 from sqlalchemy.orm import Session
 from utils.auth.jwt_bearer import getcurrent_user,JWTBearer
 from database import get_db
@@ -14,6 +15,27 @@ router = APIRouter(prefix="/discounts", tags=["Discounts"])
 def create_discount(discount: DiscountCreate, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     return discount_crud.create(db, discount)
 
+@router.post("/bulk", response_model=list[DiscountResponse])
+def bulk_create_discounts(discounts: List[DiscountCreate], db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    return discount_crud.bulk_create(db, discounts)
+
+@router.put("/bulk")
+def bulk_update_discounts(
+    ids: List[int] = Body(...),
+    changes: DiscountUpdate = Body(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    return {"updated": discount_crud.bulk_update(db, ids, changes)}
+
+@router.delete("/bulk")
+def bulk_delete_discounts(
+    ids: List[int] = Body(..., embed=True),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    return {"deleted": discount_crud.bulk_remove(db, ids)}
+
 @router.get("/", response_model=list[DiscountResponse])
 def get_all_discounts(db: Session = Depends(get_db),payload:dict=Depends(JWTBearer())):
     return discount_crud.get_all(db)
@@ -0,0 +1,174 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+
+from database import ReadSessionLocal
+from model.booking import BookedSeat, Booking, BookingStatusEnum
+from model.payments import Payment, PaymentStatusEnum
+from model.reporting import DailySalesRollup, ShowOccupancy
+from model.theatre import Show
+from schemas import UserRole
+from utils.auth.jwt_bearer import getcurrent_user
+from utils.export import ExportFormat, export_response
+
+router = APIRouter(prefix="/exports", tags=["Exports"], dependencies=[Depends(getcurrent_user(UserRole.ADMIN.value))])
+
+
+def _range(column, start_date: Optional[date], end_date: Optional[date]) -> list:
+    # Inclusive calendar dates over a timestamp column
+    conditions = []
+    if start_date:
+        conditions.append(column >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        conditions.append(column < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    return conditions
+
+
+def _filename(name: str, start_date: Optional[date], end_date: Optional[date]) -> str:
+    return "_".join([name, str(start_date or "start"), str(end_date or "end")])
+
+
+@router.get("/bookings")
+def export_bookings(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    start_date: Optional[date] = Query(None, description="Bookings made on or after this date"),
+    end_date: Optional[date] = Query(None, description="Bookings made on or before this date"),
+    booking_status: Optional[BookingStatusEnum] = Query(None),
+    show_id: Optional[int] = Query(None),
+):
+    """Stream bookings as CSV or Parquet"""
+    stmt = select(
+        Booking.booking_id,
+        Booking.booking_reference,
+        Booking.user_id,
+        Booking.show_id,
+        Booking.booking_date,
+        Booking.booking_time,
+        Booking.booking_status,
+        Booking.amount,
+        Booking.payment_id,
+        Booking.discount_id,
+    ).where(*_range(Booking.booking_date, start_date, end_date))
+    if booking_status:
+        stmt = stmt.where(Booking.booking_status == booking_status)
+    if show_id:
+        stmt = stmt.where(Booking.show_id == show_id)
+    stmt = stmt.order_by(Booking.booking_id)
+    return export_response(stmt, format, _filename("bookings", start_date, end_date), ReadSessionLocal)
+
+
+@router.get("/booked-seats")
+def export_booked_seats(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    start_date: Optional[date] = Query(None, description="Seats of bookings made on or after this date"),
+    end_date: Optional[date] = Query(None, description="Seats of bookings made on or before this date"),
+    show_id: Optional[int] = Query(None),
+):
+    """Stream booked seats as CSV or Parquet"""
+    stmt = (
+        select(
+            BookedSeat.booked_seat_id,
+            BookedSeat.booking_id,
+            BookedSeat.show_id,
+            BookedSeat.seat_id,
+            BookedSeat.price,
+            BookedSeat.gst_id,
+            Booking.booking_date,
+            Booking.booking_status,
+        )
+        .join(Booking, Booking.booking_id == BookedSeat.booking_id)
+        .where(*_range(Booking.booking_date, start_date, end_date))
+    )
+    if show_id:
+        stmt = stmt.where(BookedSeat.show_id == show_id)
+    stmt = stmt.order_by(BookedSeat.booked_seat_id)
+    return export_response(stmt, format, _filename("booked_seats", start_date, end_date), ReadSessionLocal)
+
+
+@router.get("/payments")
+def export_payments(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    start_date: Optional[date] = Query(None, description="Payments created on or after this date"),
+    end_date: Optional[date] = Query(None, description="Payments created on or before this date"),
+    payment_status: Optional[PaymentStatusEnum] = Query(None),
+):
+    """Stream payments as CSV or Parquet"""
+    stmt = select(
+        Payment.payment_id,
+        Payment.transaction_code,
+        Payment.payment_status,
+        Payment.payment_method,
+        Payment.amount,
+        Payment.refund_amount,
+        Payment.created_at,
+    ).where(*_range(Payment.created_at, start_date, end_date))
+    if payment_status:
+        stmt = stmt.where(Payment.payment_status == payment_status)
+    stmt = stmt.order_by(Payment.payment_id)
+    return export_response(stmt, format, _filename("payments", start_date, end_date), ReadSessionLocal)
+
+
+@router.get("/daily-sales")
+def export_daily_sales(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    movie_id: Optional[int] = Query(None),
+    screen_id: Optional[int] = Query(None),
+):
+    """Stream the daily sales rollup (per day, movie and screen) as CSV or Parquet"""
+    stmt = select(
+        DailySalesRollup.sales_date,
+        DailySalesRollup.movie_id,
+        DailySalesRollup.screen_id,
+        DailySalesRollup.revenue,
+        DailySalesRollup.bookings,
+        DailySalesRollup.seats,
+        DailySalesRollup.cancellations,
+    )
+    if start_date:
+        stmt = stmt.where(DailySalesRollup.sales_date >= start_date)
+    if end_date:
+        stmt = stmt.where(DailySalesRollup.sales_date <= end_date)
+    if movie_id:
+        stmt = stmt.where(DailySalesRollup.movie_id == movie_id)
+    if screen_id:
+        stmt = stmt.where(DailySalesRollup.screen_id == screen_id)
+    stmt = stmt.order_by(DailySalesRollup.sales_date, DailySalesRollup.movie_id, DailySalesRollup.screen_id)
+    return export_response(stmt, format, _filename("daily_sales", start_date, end_date), ReadSessionLocal)
+
+
+@router.get("/show-occupancy")
+def export_show_occupancy(
+    format: ExportFormat = Query(ExportFormat.CSV),
+    start_date: Optional[date] = Query(None, description="First show date"),
+    end_date: Optional[date] = Query(None, description="Last show date"),
+    movie_id: Optional[int] = Query(None),
+    screen_id: Optional[int] = Query(None),
+):
+    """Stream seats sold and revenue per show and seat category as CSV or Parquet"""
+    stmt = (
+        select(
+            ShowOccupancy.show_id,
+            Show.show_date,
+            Show.show_time,
+            Show.movie_id,
+            Show.screen_id,
+            ShowOccupancy.category_id,
+            ShowOccupancy.seats_sold,
+            ShowOccupancy.revenue,
+        )
+        .join(Show, Show.show_id == ShowOccupancy.show_id)
+    )
+    if start_date:
+        stmt = stmt.where(Show.show_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Show.show_date <= end_date)
+    if movie_id:
+        stmt = stmt.where(Show.movie_id == movie_id)
+    if screen_id:
+        stmt = stmt.where(Show.screen_id == screen_id)
+    stmt = stmt.order_by(Show.show_date, Show.show_time, ShowOccupancy.show_id, ShowOccupancy.category_id)
+    return export_response(stmt, format, _filename("show_occupancy", start_date, end_date), ReadSessionLocal)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from database import get_db
 from crud import feedback as feedback_crud
@@ -38,8 +38,18 @@ def create_feedback(payload: FeedbackCreate, db: Session = Depends(get_db), curr
 
 
 @router.get("", response_model=List[FeedbackOut])
-def list_feedbacks(skip: int = 0, limit: int = 50, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))) -> List[FeedbackOut]:
-    return feedback_crud.list_feedbacks(db, skip=skip, limit=limit)
+def list_feedbacks(
+    response: Response,
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value)),
+) -> List[FeedbackOut]:
+    items, next_cursor = feedback_crud.list_feedbacks_page(db, limit=limit, cursor=cursor, skip=skip)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.get("/{feedback_id}", response_model=FeedbackOut)
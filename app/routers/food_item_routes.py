@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
@@ -25,6 +25,30 @@ def get_all_food_items(
         filters["is_available"] = is_available
     return food_item_crud.get_all( db=db,skip=skip, limit=limit, filters=filters, name=search)
 
+# Bulk create food items
+@router.post("/bulk", response_model=List[FoodItemResponse], status_code=status.HTTP_201_CREATED)
+def bulk_create_food_items(objs_in: List[FoodItemCreate], db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    return food_item_crud.bulk_create(db=db, objs_in=objs_in)
+
+# Bulk update food items
+@router.put("/bulk")
+def bulk_update_food_items(
+    ids: List[int] = Body(...),
+    changes: FoodItemUpdate = Body(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    return {"updated": food_item_crud.bulk_update(db=db, ids=ids, obj_in=changes)}
+
+# Bulk delete food items
+@router.delete("/bulk")
+def bulk_delete_food_items(
+    ids: List[int] = Body(..., embed=True),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    return {"deleted": food_item_crud.bulk_remove(db=db, ids=ids)}
+
 # Get single food item
 @router.get("/{food_id}", response_model=FoodItemResponse)
 def get_food_item(food_id: int, db: Session = Depends(get_db)):
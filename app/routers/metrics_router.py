@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from database import pool_stats
+from utils.db_metrics import to_prometheus
+from utils.auth.jwt_bearer import getcurrent_user
+from utils.rate_limiter import rate_limiter
+from utils.response_cache import response_cache
+from utils.live_sales import live_sales
+from schemas import UserRole
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/rate-limits")
+def rate_limit_metrics(current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    """Rate limiter checks and rejections per rule"""
+    return rate_limiter.stats()
+
+
+
+@router.get("/response-cache")
+def response_cache_metrics(current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    """Response cache hits, misses and invalidations"""
+    return response_cache.stats()
+
+
+@router.get("/live-sales")
+def live_sales_metrics(current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    """Live sales feed: tracked shows and movies, connected viewers, events applied"""
+    return live_sales.stats()
+
+
+@router.get("/db-pool")
+def db_pool_metrics(
+    format: str = Query("json", pattern="^(json|prometheus)$"),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value)),
+):
+    """Postgres and Mongo connection pool usage: checked out, waiters, wait time"""
+    stats = pool_stats()
+    if format == "prometheus":
+        body = to_prometheus("movie_db_pool", stats["postgres"]) + to_prometheus("movie_mongo_pool", stats["mongo"])
+        for i, replica in enumerate(stats["read_replicas"]["replicas"]):
+            body += to_prometheus(f"movie_db_replica{i}", {"healthy": int(replica["healthy"]), "lag_seconds": replica["lag_seconds"] or 0})
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+    return stats
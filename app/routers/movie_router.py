@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends,Query
+from fastapi import APIRouter, HTTPException, Depends,Query, Response
 from typing import Optional
 from schemas.movie_schema import MovieCreate, MovieUpdate,MovieOut
 from crud.movie_crud import movie_crud
+from schemas.serializers import movie_out
+from utils.movie_search import movie_search
 from sqlalchemy.orm import Session
 from database import get_db
 from typing import Annotated, Dict, Any
@@ -17,6 +19,7 @@ router = APIRouter(
 @router.post("/")
 def create_movie(movie: MovieCreate, db: Session = Depends(get_db),current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     new_movie = movie_crud.create(db=db, obj_in=movie)
+    movie_search.invalidate()
     return new_movie
 
 def parse_sort_by(sort_by: Optional[str] = Query(
@@ -40,8 +43,11 @@ def parse_sort_by(sort_by: Optional[str] = Query(
         )
 
 
+# Cached catalog routes read the primary: a lagging replica would refill the
+# response cache with pre-write data right after an invalidation
 @router.get("/")
 def get_all_movies(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 10,
@@ -49,7 +55,11 @@ def get_all_movies(
     language: Optional[str] = None,
     release_date_from: Optional[str] = None,
     sort_by: Annotated[Optional[dict], Depends(parse_sort_by)] = None,
-    format: Optional[str] = None
+    format: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    order_by: Optional[str] = Query(None, description="Indexed column to page by (default: movie_id)"),
+    descending: bool = False,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. movie_id,title,poster_url,rating"),
 ):
     filters = {
         "genre": genre,
@@ -61,21 +71,47 @@ def get_all_movies(
     # Clean out None values before passing to CRUD
     filters = {k: v for k, v in filters.items() if v is not None}
 
-    movies = movie_crud.get_all(
+    if sort_by:
+        # Multi-column sorting only supports offset paging
+        return movie_crud.get_all(
+            db=db,
+            skip=skip,
+            limit=limit,
+            filters=filters,
+            sort_by=sort_by,
+            fields=fields
+        )
+
+    movies, next_cursor = movie_crud.get_page(
         db=db,
-        skip=skip,
         limit=limit,
         filters=filters,
-        sort_by=sort_by
+        cursor=cursor,
+        order_by=order_by,
+        descending=descending,
+        skip=skip,
+        fields=fields,
     )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return movies
 
+@router.get("/search")
+def search_movies(
+    q: str = Query(..., min_length=2, description="Title, genre or cast name; typos are tolerated"),
+    limit: int = Query(10, ge=1, le=50),
+    active_only: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Ranked fuzzy search over title, genres and cast names"""
+    return movie_search.search(db, q, limit=limit, active_only=active_only)
+
 @router.get("/{movie_id}",response_model=MovieOut)
 def get_movie(movie_id: int, db: Session = Depends(get_db)):
     movie = movie_crud.get(db=db, id=movie_id)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
-    return movie
+    return movie_out.response(movie)
 
 @router.put("/{movie_id}")
 def update_movie(movie_id: int, movie_update: MovieUpdate, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
@@ -84,6 +120,7 @@ def update_movie(movie_id: int, movie_update: MovieUpdate, db: Session = Depends
         raise HTTPException(status_code=404, detail="Movie not found")
 
     updated_movie = movie_crud.update(db=db, db_obj=db_movie, obj_in=movie_update)
+    movie_search.invalidate()
     return updated_movie
 
 @router.delete("/{movie_id}")
@@ -93,6 +130,7 @@ def delete_movie(movie_id: int, db: Session = Depends(get_db),current_user: dict
         raise HTTPException(status_code=404, detail="Movie not found")
 
     movie_crud.remove(db=db, id=movie_id)
+    movie_search.invalidate()
     return {"detail": f"Movie with ID {movie_id} deleted successfully"}
 
 @router.get("/tmdb/search")
@@ -156,6 +194,7 @@ def import_tmdb_movie(
 
     # Create the movie
     movie = movie_crud.create(db=db, obj_in=MovieCreate(**mapped))
+    movie_search.invalidate()
     return movie
 
 @router.get("/recommend/{user_id}")
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from typing import Optional
 from sqlalchemy.orm import Session
 from schemas.payment_schema import PaymentCreate, PaymentUpdate,PaymentOut as PaymentResponse
 from crud.payment_crud import payment_crud
@@ -14,8 +15,19 @@ def create_payment(obj_in: PaymentCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[PaymentResponse])
-def get_all_payments(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    return payment_crud.get_all(db, skip, limit)
+def get_all_payments(
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    order_by: Optional[str] = Query(None, description="Indexed column to page by (default: payment_id)"),
+    descending: bool = False,
+    db: Session = Depends(get_db),
+):
+    items, next_cursor = payment_crud.get_page(db, limit=limit, cursor=cursor, order_by=order_by, descending=descending, skip=skip)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
@@ -1,19 +1,24 @@
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
-from sqlalchemy import select, func, and_, true
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import Session
 
-from database import get_db
+from crud.cohort_crud import cohort_crud, week_start
+from crud.sales_rollup_crud import sales_rollup_crud
+from crud.show_occupancy_crud import show_occupancy_crud
+from database import ReadSessionLocal, get_db, get_read_db
 from model.booking import Booking
-from model.theatre import Show, Screen
-from model.movie import Movie
+from model.theatre import ShowStatusEnum
 from model.user import User
+from schemas import UserRole
+from utils.auth.jwt_bearer import getcurrent_user
+from utils.analytics_store import analytics_store
+from utils.config import settings
 
-
-router = APIRouter(prefix="/reports", tags=["reports"])
+router = APIRouter(prefix="/reports", tags=["reports"], dependencies=[Depends(getcurrent_user(UserRole.ADMIN.value))])
 
 # ---------- Schemas ----------
 
@@ -21,15 +26,41 @@ class DailySalesItem(BaseModel):
     date: date
     revenue: float
     bookings: int
+    seats: int = 0
+    cancellations: int = 0
+
+class CategoryOccupancyItem(BaseModel):
+    category_id: int
+    category_name: Optional[str]
+    seats_sold: int
+    capacity: int
+    revenue: float
+    occupancy_pct: float
 
 class ShowOccupancyItem(BaseModel):
     show_id: int
-    show_time: datetime
+    show_date: date
+    show_time: time
+    status: str
+    movie_id: int
     movie_title: Optional[str]
+    screen_id: int
     screen: Optional[str]
     seats_sold: int
     capacity: int
+    revenue: float
     occupancy_pct: float
+    categories: List[CategoryOccupancyItem] = []
+
+class CohortWeekItem(BaseModel):
+    week: int
+    active_users: int
+    retention_pct: float
+
+class CohortRetentionItem(BaseModel):
+    cohort_week: date
+    users: int
+    weeks: List[CohortWeekItem] = []
 
 class UserStats(BaseModel):
     total_users: int
@@ -48,102 +79,99 @@ def parse_date(d: Optional[date], default_delta_days: int) -> date:
     "/daily-sales",
     response_model=List[DailySalesItem],
     summary="Revenue per day",
-    description="Aggregated booking revenue per day for a given date range.",
+    description="Confirmed booking revenue per booking day, read from the daily sales rollup.",
 )
-async def daily_sales(
+def daily_sales(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    movie_id: Optional[int] = Query(None),
+    screen_id: Optional[int] = Query(None),
+    db: Session = Depends(get_read_db),
 ):
     start = parse_date(start_date, 7)
     end = end_date or date.today()
 
-    stmt = (
-        select(
-            func.date_trunc("day", Booking.booking_date).label("day"),
-            func.sum(Booking.amount).label("revenue"),
-            func.count(func.distinct(Booking.booking_id)).label("bookings"),
-        )
-        .where(
-            and_(
-                Booking.booking_date >= datetime.combine(start, datetime.min.time()),
-                Booking.booking_date <= datetime.combine(end, datetime.max.time()),
-            )
-        )
-        .group_by("day")
-        .order_by("day")
-    )
-    result = await db.execute(stmt)
-    rows = result.all()
+    rows = sales_rollup_crud.daily_totals(db, start, end, movie_id=movie_id, screen_id=screen_id)
     return [
         DailySalesItem(
-            date=row.day.date(),
+            date=row.day,
             revenue=float(row.revenue or 0),
             bookings=int(row.bookings or 0),
+            seats=int(row.seats or 0),
+            cancellations=int(row.cancellations or 0),
         )
         for row in rows
     ]
 
 
+@router.post(
+    "/daily-sales/reconcile",
+    summary="Rebuild the daily sales rollup",
+    description="Recomputes the rollup for a date range from bookings; the nightly job does this for recent days.",
+)
+def reconcile_daily_sales(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+):
+    start = parse_date(start_date, settings.SALES_ROLLUP_RECONCILE_DAYS)
+    end = end_date or date.today()
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    rows = sales_rollup_crud.reconcile(db, start, end)
+    return {"start_date": start, "end_date": end, "rows": rows}
+
+
 @router.get(
     "/show-occupancy",
     response_model=List[ShowOccupancyItem],
     summary="Show occupancy stats",
-    description="Seats sold, capacity, and occupancy percentage for shows.",
+    description="Seats sold, capacity, revenue and occupancy per show and seat category, from the occupancy counters.",
 )
-async def show_occupancy(
-    date_filter: Optional[date] = Query(None, description="Filter shows by calendar date"),
+def show_occupancy(
+    response: Response,
+    start_date: Optional[date] = Query(None, description="First show date (default: today)"),
+    end_date: Optional[date] = Query(None, description="Last show date (default: start_date + 6 days)"),
     movie_id: Optional[int] = Query(None),
     screen_id: Optional[int] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    status: Optional[ShowStatusEnum] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
 ):
-    # Build conditions
-    conditions = []
-    if date_filter:
-        start_dt = datetime.combine(date_filter, datetime.min.time())
-        end_dt = datetime.combine(date_filter, datetime.max.time())
-        conditions.append(and_(Show.show_time >= start_dt, Show.show_time <= end_dt))
-    if movie_id:
-        conditions.append(Show.movie_id == movie_id)
-    if screen_id:
-        conditions.append(Show.screen_id == screen_id)
-
-    # Select show info + seats sold (count of bookings), capacity and screen screen_name
-    stmt = (
-        select(
-            Show.show_id.label("show_id"),
-            Show.show_time,
-            Movie.title.label("movie_title"),
-            func.coalesce(func.count(Booking.booking_id), 0).label("seats_sold"),
-            Screen.screen_name.label("screen"),
-        )
-        .select_from(Show)
-        .join(Movie, Movie.movie_id == Show.movie_id, isouter=True)
-        .join(Screen, Screen.screen_id == Show.screen_id, isouter=True)
-        .join(Booking, Booking.show_id == Show.show_id, isouter=True)
-        .where(and_(*conditions) if conditions else true())
-        .group_by(Show.show_id, Show.show_time, Movie.title,  Screen.screen_name)
-        .order_by(Show.show_time)
+    start = start_date or date.today()
+    end = end_date or (start + timedelta(days=6))
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+
+    total, items = show_occupancy_crud.get_page(
+        db,
+        start,
+        end,
+        movie_id=movie_id,
+        screen_id=screen_id,
+        status=status.value if status else None,
+        skip=skip,
+        limit=limit,
     )
+    response.headers["X-Total-Count"] = str(total)
+    return items
 
-    result = db.execute(stmt)
-    rows = result.all()
-
-    output: List[ShowOccupancyItem] = []
-    for row in rows:
-       
-        
-        output.append(
-            ShowOccupancyItem(
-                show_id=row.show_id,
-                show_time=row.show_time,
-                movie_title=row.movie_title,
-                screen=row.screen,
-                
-             
-            )
-        )
-    return output
+
+@router.post(
+    "/show-occupancy/reconcile",
+    summary="Rebuild show occupancy counters",
+    description="Recounts screen capacity and the seats sold per show category for shows from start_date on.",
+)
+def reconcile_show_occupancy(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db),
+):
+    start = parse_date(start_date, settings.SALES_ROLLUP_RECONCILE_DAYS)
+    screens = show_occupancy_crud.refresh_capacity(db)
+    rows = show_occupancy_crud.reconcile(db, start, end_date)
+    return {"start_date": start, "end_date": end_date, "capacity_rows": screens, "occupancy_rows": rows}
 
 
 @router.get(
@@ -152,19 +180,17 @@ async def show_occupancy(
     summary="User registration & active user stats",
     description="Overall totals plus new and active users for a date range.",
 )
-async def user_stats(
+def user_stats(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     start = parse_date(start_date, 30)
     end = end_date or date.today()
     start_dt = datetime.combine(start, datetime.min.time())
     end_dt = datetime.combine(end, datetime.max.time())
 
-    total_users_stmt = select(func.count(User.id))
-    # NOTE: Adjust 'User.created_at' to your actual user registration timestamp column.
-    new_users_stmt = select(func.count(User.id)).where(
+    new_users_stmt = select(func.count(User.user_id)).where(
         and_(User.created_at >= start_dt, User.created_at <= end_dt)
     )
     active_users_stmt = (
@@ -172,9 +198,15 @@ async def user_stats(
         .where(and_(Booking.booking_date >= start_dt, Booking.booking_date <= end_dt))
     )
 
-    total_users = (await db.execute(total_users_stmt)).scalar_one()
-    new_users = (await db.execute(new_users_stmt)).scalar_one()
-    active_users = (await db.execute(active_users_stmt)).scalar_one()
+    total_users = cohort_crud.total_users(db)
+    new_users = (db.execute(new_users_stmt)).scalar_one()
+    if analytics_store.is_fresh():
+        active_users = analytics_store.query(
+            "SELECT COUNT(DISTINCT user_id) FROM bookings WHERE booking_date >= ? AND booking_date <= ?",
+            [start_dt, end_dt],
+        )[0][0]
+    else:
+        active_users = (db.execute(active_users_stmt)).scalar_one()
 
     retention_pct = round((active_users / total_users) * 100, 2) if total_users else 0.0
 
@@ -183,4 +215,53 @@ async def user_stats(
         new_users=int(new_users or 0),
         active_users=int(active_users or 0),
         retention_pct=retention_pct,
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/analytics/status",
+    summary="Analytics snapshot status",
+    description="Age and row counts of the Parquet snapshot that serves analytical queries.",
+)
+def analytics_status():
+    return analytics_store.status()
+
+
+@router.post(
+    "/analytics/snapshot",
+    summary="Refresh the analytics snapshot",
+    description="Copies bookings, booked seats, shows and payments to Parquet now instead of waiting for the periodic job.",
+)
+def refresh_analytics_snapshot():
+    if not analytics_store.available:
+        raise HTTPException(status_code=501, detail="Analytics store needs duckdb and pyarrow installed")
+    analytics_store.snapshot(ReadSessionLocal)
+    return analytics_store.status()
+
+
+@router.get(
+    "/cohorts",
+    response_model=List[CohortRetentionItem],
+    summary="Weekly retention by signup cohort",
+    description="Share of each signup-week cohort that booked in each following week, from the cohort counters.",
+)
+def cohort_retention(
+    start_week: Optional[date] = Query(None, description="First signup week (default: 12 weeks ago)"),
+    end_week: Optional[date] = Query(None, description="Last signup week (default: this week)"),
+    weeks: int = Query(12, ge=0, le=104, description="Week offsets after signup to report"),
+    db: Session = Depends(get_read_db),
+):
+    end = week_start(end_week or date.today())
+    start = week_start(start_week) if start_week else end - timedelta(weeks=12)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_week must be on or before end_week")
+    return cohort_crud.retention(db, start, end, weeks)
+
+
+@router.post(
+    "/cohorts/reconcile",
+    summary="Rebuild cohort counters",
+    description="Reassigns every user to a signup-week cohort and recounts weekly activity from bookings.",
+)
+def reconcile_cohorts(db: Session = Depends(get_db)):
+    return cohort_crud.reconcile(db)
@@ -3,7 +3,10 @@ from sqlalchemy.orm import Session
 from typing import List
 from database import get_db
 from schemas.theatre_schema import ScreenCreate, ScreenUpdate, ScreenOut
+from schemas.seat_schema import SeatGridRequest, SeatGridSummary
 from crud.screen_crud import screen_crud
+from crud.seat_crud import seat_crud
+from crud.show_occupancy_crud import show_occupancy_crud
 from schemas import UserRole
 from utils.auth.jwt_bearer import getcurrent_user, JWTBearer
 router = APIRouter(prefix="/screens", tags=["Screens"])
@@ -41,6 +44,14 @@ def update_screen(screen_id: int, screen: ScreenUpdate, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="Screen not found")
     return screen_crud.update(db=db, db_obj=db_screen, obj_in=screen)
 
+@router.post("/{screen_id}/seat-grid", response_model=SeatGridSummary, status_code=201)
+def generate_seat_grid(screen_id: int, req: SeatGridRequest, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    """Generate all seats for a screen from its seat categories"""
+    screen_crud.get(db=db, id=screen_id)
+    summary = seat_crud.generate_grid(db=db, screen_id=screen_id, req=req)
+    show_occupancy_crud.refresh_capacity(db, [screen_id])
+    return summary
+
 @router.delete("/{screen_id}")
 def delete_screen(screen_id: int, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     """Delete a screen"""
@@ -48,4 +59,5 @@ def delete_screen(screen_id: int, db: Session = Depends(get_db), current_user: d
     if not db_screen:
         raise HTTPException(status_code=404, detail="Screen not found")
     screen_crud.remove(db=db, id=screen_id)
+    show_occupancy_crud.refresh_capacity(db, [screen_id])
     return {"message": "Screen deleted successfully"}
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from database import get_db
 from crud.seat_category_crud import seat_category_crud
+from crud.show_occupancy_crud import show_occupancy_crud
 from schemas.theatre_schema import (
     SeatCategoryCreate,
     SeatCategoryUpdate,
@@ -50,4 +51,8 @@ def update_category(
 
 @router.delete("/{category_id}")
 def delete_category(category_id: int, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
-    return seat_category_crud.remove(db, category_id)
+    screen_id = seat_category_crud.get(db, category_id).screen_id
+    result = seat_category_crud.remove(db, category_id)
+    # Its seats go with it
+    show_occupancy_crud.refresh_capacity(db, [screen_id])
+    return result
@@ -1,25 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Body
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
 from schemas.seat_schema import SeatCreate, SeatUpdate, SeatOut
 from schemas import UserRole
 from crud.seat_crud import seat_crud
+from crud.show_occupancy_crud import show_occupancy_crud
 from utils.auth.jwt_bearer import getcurrent_user, JWTBearer
 router = APIRouter(prefix="/seats", tags=["Seats"])
 
 @router.post("/", response_model=List[SeatOut])
 def create_seat(seat: List[SeatCreate], db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     """Create a new seat"""
-    return seat_crud.create(db=db, obj_in_list=seat)
+    seats = seat_crud.create(db=db, obj_in_list=seat)
+    show_occupancy_crud.refresh_capacity(db, [s.screen_id for s in seat])
+    return seats
+
+@router.put("/bulk")
+def bulk_update_seats(
+    ids: List[int] = Body(...),
+    changes: SeatUpdate = Body(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    """Apply the same changes to many seats in one transaction"""
+    updated = seat_crud.bulk_update(db=db, ids=ids, obj_in=changes)
+    show_occupancy_crud.refresh_capacity(db)
+    return {"updated": updated}
+
+@router.delete("/bulk")
+def bulk_delete_seats(
+    ids: List[int] = Body(..., embed=True),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    """Delete many seats in one transaction"""
+    deleted = seat_crud.bulk_remove(db=db, ids=ids)
+    show_occupancy_crud.refresh_capacity(db)
+    return {"deleted": deleted}
 
 
 
 @router.get("/", response_model=List[SeatOut])
-def get_all_seats(db: Session = Depends(get_db), skip: int = 0, limit: int = 10,screen_id:int=0):
+def get_all_seats(
+    response: Response,
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 10,
+    screen_id: int = 0,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    order_by: Optional[str] = Query(None, description="Indexed column to page by (default: seat_id)"),
+    descending: bool = False,
+):
     """Fetch all seats"""
     filter={"screen_id":screen_id} if screen_id!=0 else {}
-    return seat_crud.get_all(db=db, skip=skip, limit=limit,filters=filter)
+    items, next_cursor = seat_crud.get_page(db=db, limit=limit, filters=filter, cursor=cursor, order_by=order_by, descending=descending, skip=skip)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @router.get("/{seat_id}", response_model=SeatOut)
 def get_seat(seat_id: int, db: Session = Depends(get_db)):
@@ -35,7 +73,10 @@ def update_seat(seat_id: int, seat: SeatUpdate, db: Session = Depends(get_db), c
     db_seat = seat_crud.get(db=db, id=seat_id)
     if not db_seat:
         raise HTTPException(status_code=404, detail="Seat not found")
-    return seat_crud.update(db=db, db_obj=db_seat, obj_in=seat)
+    previous_screen_id = db_seat.screen_id
+    updated = seat_crud.update(db=db, db_obj=db_seat, obj_in=seat)
+    show_occupancy_crud.refresh_capacity(db, [previous_screen_id, updated.screen_id])
+    return updated
 
 @router.delete("/{seat_id}")
 def delete_seat(seat_id: int, db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
@@ -43,5 +84,7 @@ def delete_seat(seat_id: int, db: Session = Depends(get_db), current_user: dict
     db_seat = seat_crud.get(db=db, id=seat_id)
     if not db_seat:
         raise HTTPException(status_code=404, detail="Seat not found")
+    screen_id = db_seat.screen_id
     seat_crud.remove(db=db, id=seat_id)
+    show_occupancy_crud.refresh_capacity(db, [screen_id])
     return {"message": "Seat deleted successfully"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
@@ -20,6 +20,30 @@ router = APIRouter(prefix="/show-category-pricing", tags=["Show Category Pricing
 def create_pricing(pricing_in: ShowCategoryPricingCreate, db: Session = Depends(get_db),current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
     return show_category_pricing_crud.create(db=db, obj_in=pricing_in)
 
+# -----------------------------
+# BULK CREATE / UPDATE / DELETE PRICING
+# -----------------------------
+@router.post("/bulk", response_model=List[ShowCategoryPricingOut], status_code=status.HTTP_201_CREATED)
+def bulk_create_pricing(pricing_in: List[ShowCategoryPricingCreate], db: Session = Depends(get_db), current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))):
+    return show_category_pricing_crud.bulk_create(db=db, objs_in=pricing_in)
+
+@router.put("/bulk")
+def bulk_update_pricing(
+    ids: List[int] = Body(...),
+    changes: ShowCategoryPricingUpdate = Body(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    return {"updated": show_category_pricing_crud.bulk_update(db=db, ids=ids, obj_in=changes)}
+
+@router.delete("/bulk")
+def bulk_delete_pricing(
+    ids: List[int] = Body(..., embed=True),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(getcurrent_user(UserRole.ADMIN.value))
+):
+    return {"deleted": show_category_pricing_crud.bulk_remove(db=db, ids=ids)}
+
 # -----------------------------
 # GET ALL PRICING (with filters)
 # -----------------------------
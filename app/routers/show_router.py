@@ -1,15 +1,20 @@
 from datetime import datetime, date, time, timedelta
 from pydantic import BaseModel
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from utils.movie_scheduler.graph import app 
 from database import get_db
-from model import Show, Screen, Movie, Booking, BookedSeat, BookedFood
+from model import Show, Screen, SeatCategory, Movie, Booking, BookedSeat, BookedFood
 from model.theatre import ShowStatusEnum
 from utils.slotfinder import find_available_slots
 from schemas.theatre_schema import ShowCreate, ShowUpdate, ShowOut
 from crud.show_crud import show_crud
+from crud.cohort_crud import cohort_crud
+from crud.sales_rollup_crud import sales_rollup_crud
+from crud.show_occupancy_crud import show_occupancy_crud
+from utils.live_sales import live_sales
+from schemas.serializers import show_out
 from utils.auth.jwt_bearer import getcurrent_user, JWTBearer
 from schemas import UserRole
 from utils.autoschedule import HybridScheduleRequest, HybridScheduleResponse, ScheduledShow, greedy_day_schedule_with_windows
@@ -65,6 +70,7 @@ def create_show(show_in: ShowCreate, db: Session = Depends(get_db)):
     db.add(show)
     db.commit()
     db.refresh(show)
+    live_sales.invalidate()
     return show
 
 # -----------------------------
@@ -78,7 +84,10 @@ def get_all_shows(
     movie_id: Optional[int] = None,
     screen_id: Optional[int] = None,
     status: Optional[str] = None,
-    show_date: Optional[str] = Query(None, description="Filter by show date (YYYY-MM-DD)")
+    show_date: Optional[str] = Query(None, description="Filter by show date (YYYY-MM-DD)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    order_by: Optional[str] = Query(None, description="Indexed column to page by (default: show_id)"),
+    descending: bool = False,
 ):
     filters = {}
     if movie_id:
@@ -90,7 +99,8 @@ def get_all_shows(
     if show_date:
         filters["show_date"] = show_date
 
-    return show_crud.get_all(db=db, skip=skip, limit=limit, filters=filters)
+    items, next_cursor = show_crud.get_page(db=db, limit=limit, filters=filters, cursor=cursor, order_by=order_by, descending=descending, skip=skip)
+    return show_out.response(items, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
 
 # -----------------------------
 # CANCEL A SHOW + CANCEL ALL ITS BOOKINGS
@@ -108,7 +118,10 @@ def cancel_show(show_id: int, db: Session = Depends(get_db), current_user: dict
     show.status = ShowStatusEnum.CANCELLED.value
     db.add(show)
 
-    # 2) Cancel all bookings for this show (idempotent)
+    # 2) Cancel all bookings for this show (idempotent); rollup deltas first, while seats still exist
+    sales_rollup_crud.record_show_cancelled(db, show)
+    sold_delta = show_occupancy_crud.clear_show(db, show_id)
+    cohort_crud.record_show_cancelled(db, show_id)
     db.query(Booking).filter(Booking.show_id == show_id).update(
         {Booking.booking_status: "CANCELLED"},
         synchronize_session=False
@@ -123,6 +136,7 @@ def cancel_show(show_id: int, db: Session = Depends(get_db), current_user: dict
 
     db.commit()
     db.refresh(show)
+    live_sales.record(show, *sold_delta)
 
     return show
 
@@ -196,6 +210,7 @@ def hybrid_auto_schedule(
         except Exception as e:
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to persist schedule: {e}")
+        live_sales.invalidate()
 
     response_schedule = [
         ScheduledShow(
@@ -226,6 +241,7 @@ def generate_weekly_schedule(
         "movie_ids": request.movie_ids,
         "start_date": request.start_date,
     })
+    live_sales.invalidate()
 
     # 🔥 DO NOT RETURN `result` DIRECTLY 🔥
     return {
@@ -302,7 +318,7 @@ def get_show(show_id: int, db: Session = Depends(get_db), current_user: dict = D
     show = show_crud.get(db=db, id=show_id)
     if not show:
         raise HTTPException(status_code=404, detail="Show not found")
-    return show
+    return show_out.response(show)
 
 # -----------------------------
 # UPDATE SHOW
@@ -324,8 +340,14 @@ def delete_show(show_id: int, db: Session = Depends(get_db)):
 
 @router.get("/seats/{show_id}")
 def get_show_details(show_id: int, db: Session = Depends(get_db)):
+    # 1) show + movie + screen + pricing, 2) categories with their seats, 3) booked seats
     show = (
         db.query(Show)
+        .options(
+            joinedload(Show.movie),
+            joinedload(Show.category_pricing),
+            joinedload(Show.screen).selectinload(Screen.categories).joinedload(SeatCategory.seats),
+        )
         .filter(Show.show_id == show_id)
         .first()
     )
@@ -341,6 +363,8 @@ def get_show_details(show_id: int, db: Session = Depends(get_db)):
     )
     booked_seat_ids = [x[0] for x in booked_seat_ids]
 
+    prices = {p.category_id: p.price for p in show.category_pricing}
+
     return {
         "show_id": show.show_id,
         "show_date": show.show_date,
@@ -358,14 +382,7 @@ def get_show_details(show_id: int, db: Session = Depends(get_db)):
             {
                 "category_id": c.category_id,
                 "category_name": c.category_name,
-                "price": (
-    next(
-        (p for p in show.category_pricing if p.category_id == c.category_id),
-        None
-    ).price
-    if show.category_pricing else None
-),
-
+                "price": prices.get(c.category_id),
                 "seats": [
                     {
                         "seat_id": s.seat_id,
@@ -374,7 +391,7 @@ def get_show_details(show_id: int, db: Session = Depends(get_db)):
                         "col": s.col_number,
                         "available": s.is_available
                     }
-                    for s in c.seats
+                    for s in sorted(c.seats, key=lambda s: (s.row_number, s.col_number))
                 ]
             }
             for c in show.screen.categories
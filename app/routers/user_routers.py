@@ -7,23 +7,29 @@ from utils.auth.jwt_bearer import getcurrent_user, JWTBearer
 from database import get_db
 from crud.token_crud import revoke_token, is_token_revoked
 from schemas.user_schema import ForgotPasswordRequest, ResetPasswordRequest, ChangePasswordRequest
+from utils.auth.password_pool import password_pool
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     try:
-        new_user = user_crud.create(db=db, obj_in=user)
+        new_user = await user_crud.create(db=db, obj_in=user)
         return new_user
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.post("/login")
-def login(response: Response, email: str, password: str, db: Session = Depends(get_db)):
-    user = user_crud.login(response=response, db=db, email=email, password=password)
+async def login(response: Response, email: str, password: str, db: Session = Depends(get_db)):
+    user = await user_crud.login(response=response, db=db, email=email, password=password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     return user
 
+@router.get("/metrics/login")
+def login_metrics(current_user: dict = Depends(getcurrent_user("admin"))):
+    """Password hashing pool counters and recent login throughput"""
+    return password_pool.metrics.snapshot()
+
 @router.get("/")
 def get_all_users(
     db: Session = Depends(get_db),
@@ -143,12 +149,12 @@ def forgot_password(
 
 
 @router.post("/reset-password", status_code=200)
-def reset_password(
+async def reset_password(
     data: ResetPasswordRequest,
     db: Session = Depends(get_db)
 ):
     """Reset password using email token"""
-    return user_crud.reset_password(
+    return await user_crud.reset_password(
         db=db,
         token=data.token,
         new_password=data.newPassword
@@ -156,13 +162,13 @@ def reset_password(
 
 
 @router.post("/change-password", status_code=200)
-def change_password(
+async def change_password(
     data: ChangePasswordRequest,
     current_user = Depends(JWTBearer()),
     db: Session = Depends(get_db)
 ):
     """Change password (requires current password)"""
-    return user_crud.change_password(
+    return await user_crud.change_password(
         db=db,
         user_id=current_user.id,
         current_password=data.currentPassword,
@@ -1,12 +1,17 @@
 from fastapi import WebSocket, WebSocketDisconnect, APIRouter
 from typing import Optional
-import json
+from utils.serialization import dumps, loads
 from datetime import datetime, timedelta, timezone
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
 # Use the unified manager
 from utils.ws_manager import ws_manager
+from utils.rate_limiter import rate_limiter
+from utils.live_sales import live_sales
+from utils.auth.jwt_bearer import _is_revoked
+from utils.auth.jwt_handler import verify_access_token
+from schemas import UserRole
 
 # Models
 from model.notification import Notification
@@ -44,6 +49,33 @@ async def websocket_notifications(websocket: WebSocket, user_id: str):
     except WebSocketDisconnect:
         await ws_manager.disconnect(websocket)
 
+def _is_admin_token(token: Optional[str]) -> bool:
+    if not token:
+        return False
+    try:
+        payload = verify_access_token(token)
+    except Exception:
+        return False
+    if not payload or payload.get("role") != UserRole.ADMIN.value:
+        return False
+    jti = payload.get("jti")
+    return not (jti and _is_revoked(jti))
+
+@router.websocket("/ws/admin/live-sales")
+async def websocket_live_sales(websocket: WebSocket, token: Optional[str] = None, movie_id: Optional[int] = None):
+    # Browsers cannot set headers on websockets, so the admin access token comes as ?token=
+    if not _is_admin_token(token):
+        await websocket.close(code=1008)
+        return
+    await live_sales.connect(websocket, movie_id)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_sales.disconnect(websocket)
+
 @router.websocket("/ws/seats/{show_id}")
 async def websocket_seats(websocket: WebSocket, show_id: int, user_id: Optional[str] = None):
     # Accept and subscribe
@@ -62,22 +94,33 @@ async def websocket_seats(websocket: WebSocket, show_id: int, user_id: Optional[
     try:
         async def send_error(msg: str):
             try:
-                await websocket.send_text(json.dumps({"type": "error", "message": msg}))
+                await websocket.send_text(dumps({"type": "error", "message": msg}))
             except Exception:
                 pass
 
         while True:
             raw = await websocket.receive_text()
             try:
-                data = json.loads(raw)
+                data = loads(raw)
             except Exception:
                 await send_error("Invalid JSON")
                 continue
 
             action = data.get("action")
 
+            client_key = str(parsed_user_id) if parsed_user_id is not None else (websocket.client.host if websocket.client else "anonymous")
+            allowed, retry_after = await rate_limiter.hit_ws_action(str(action), client_key)
+            if not allowed:
+                await websocket.send_text(dumps({
+                    "type": "error",
+                    "message": "Rate limit exceeded",
+                    "action": action,
+                    "retry_after": round(retry_after, 2)
+                }))
+                continue
+
             if action == "ping":
-                await websocket.send_text(json.dumps({"type": "pong"}))
+                await websocket.send_text(dumps({"type": "pong"}))
                 continue
 
             if action not in {"lock", "unlock", "extend"}:
@@ -98,7 +141,7 @@ async def websocket_seats(websocket: WebSocket, show_id: int, user_id: Optional[
                 and_(BookedSeat.show_id == int(show_id), BookedSeat.seat_id == seat_id)
             ).first()
             if booked_row and action in {"lock", "extend"}:
-                await websocket.send_text(json.dumps({
+                await websocket.send_text(dumps({
                     "type": "seat_booked",
                     "show_id": int(show_id),
                     "seat_ids": [seat_id],
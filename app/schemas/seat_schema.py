@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import Field
+from pydantic import Field, field_validator
 
 from . import ORMModel, SeatLockStatus
 
@@ -36,6 +36,43 @@ class SeatOut(SeatBase):
     seat_id: int
 
 
+# Seat grid generation from SeatCategory rows/cols
+class SeatGridRequest(ORMModel):
+    category_order: Optional[list[int]] = Field(
+        None, description="Category ids from front row to back; defaults to category_id order"
+    )
+    aisle_after_cols: list[int] = Field(
+        default_factory=list, description="Leave an aisle after these seat counts in every row, e.g. [4, 16]"
+    )
+    gap_rows_between_categories: int = Field(0, ge=0, le=5)
+    replace_existing: bool = False
+
+    @field_validator('category_order')
+    @classmethod
+    def validate_category_order(cls, v):
+        if v is not None and len(set(v)) != len(v):
+            raise ValueError('category_order must not repeat a category')
+        return v
+
+
+class SeatGridCategorySummary(ORMModel):
+    category_id: int
+    category_name: str
+    first_row: str
+    last_row: str
+    rows: int
+    seats_per_row: int
+    seats: int
+
+
+class SeatGridSummary(ORMModel):
+    screen_id: int
+    total_seats: int
+    total_rows: int
+    grid_width: int
+    categories: list[SeatGridCategorySummary]
+
+
 # 6. SEAT_LOCK
 class SeatLockBase(ORMModel):
     seat_id: int
@@ -0,0 +1,9 @@
+from schemas.booking_schema import BookingOut
+from schemas.movie_schema import MovieOut
+from schemas.theatre_schema import ShowOut
+from utils.serialization import ModelSerializer
+
+# Built once at import so hot list/detail routes skip per-request schema setup
+booking_out = ModelSerializer(BookingOut)
+show_out = ModelSerializer(ShowOut)
+movie_out = ModelSerializer(MovieOut)
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import ARRAY, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Modules import each other top-level from app/ (e.g. `from database import ...`)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+# Keep database.py's module-level engine off any real server
+os.environ["sqlalchemy_database_url"] = "sqlite://"
+
+
+@compiles(ARRAY, "sqlite")
+def _array_as_text(type_, compiler, **kw):
+    # Postgres ARRAY columns (movies.genre, ...) only need to exist for these tests
+    return "TEXT"
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_session(sqlite_engine):
+    """Creates the given tables on the SQLite engine and returns a session factory."""
+    from database import Base
+
+    def factory(*table_names):
+        tables = [Base.metadata.tables[name] for name in table_names]
+        Base.metadata.create_all(sqlite_engine, tables=tables)
+        return sessionmaker(bind=sqlite_engine, autoflush=False)
+
+    return factory
@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+import pytest
+
+from agent.tools.demand_model import FORECAST_DAYS, PROPHET_AVAILABLE, EnhancedMovieDemandForecaster, fit_movie_model
+from agent.tools.forecast_pool import ForecastPool
+
+HISTORY_DAYS = 30
+TASK_TIMEOUT = 120
+
+
+@pytest.fixture
+def pool():
+    # A real spawned worker: it has to import the job's module on its own
+    pool = ForecastPool(max_workers=1, task_timeout=TASK_TIMEOUT)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def forecaster():
+    days = [date.today() - timedelta(days=HISTORY_DAYS - i) for i in range(HISTORY_DAYS)]
+    holidays = [{"date": str(days[HISTORY_DAYS // 2]), "name": "Holiday", "type": "National"}]
+    forecaster = EnhancedMovieDemandForecaster(holidays=holidays)
+    df = forecaster.prepare_data_with_regressors([(d, 20 + i % 7) for i, d in enumerate(days)], "Movie")
+    return forecaster, df
+
+
+def test_spawned_worker_returns_fallback(pool, forecaster):
+    forecaster, df = forecaster
+    results = pool.map(forecaster._fallback_forecast, {1: (df, FORECAST_DAYS, "Movie", 0.0)})
+    assert list(results) == [1]
+    assert len(results[1]) == FORECAST_DAYS
+
+
+@pytest.mark.skipif(not PROPHET_AVAILABLE, reason="prophet is not installed")
+def test_spawned_worker_fits_prophet(pool, forecaster):
+    forecaster, df = forecaster
+    results = pool.map(fit_movie_model, {1: (forecaster.holidays, df, FORECAST_DAYS)})
+    forecast, model_json = results[1]
+    assert len(forecast) == FORECAST_DAYS
+    assert model_json
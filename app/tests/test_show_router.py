@@ -0,0 +1,53 @@
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event
+
+from model import Movie, Screen, Seat, SeatCategory, Show, ShowCategoryPricing
+from routers.show_router import get_show_details
+
+TABLES = ("movies", "screens", "seat_categories", "seats", "shows", "show_category_pricing", "bookings", "booked_seats")
+CATEGORIES = 5
+ROWS, COLS = 2, 3
+
+
+@pytest.fixture
+def session(make_session):
+    Session = make_session(*TABLES)
+    db = Session()
+    db.add(Movie(movie_id=1, title="Movie", duration=120))
+    db.add(Screen(screen_id=1, screen_name="Screen 1", screen_type="STANDARD"))
+    db.flush()
+    seat_id = 0
+    for category_id in range(1, CATEGORIES + 1):
+        db.add(SeatCategory(category_id=category_id, category_name=f"Category {category_id}", screen_id=1, rows=ROWS, cols=COLS, base_price=100))
+        db.flush()
+        for row in range(ROWS):
+            for col in range(COLS):
+                seat_id += 1
+                db.add(Seat(seat_id=seat_id, screen_id=1, row_number=row, col_number=col, category_id=category_id,
+                            seat_number=f"{category_id}-{row}-{col}", is_available=True))
+    db.add(Show(show_id=1, movie_id=1, screen_id=1, show_date=date.today(), show_time=time(10), end_time=time(12),
+                status="UPCOMING", format="2D", language="English"))
+    db.flush()
+    for category_id in range(1, CATEGORIES + 1):
+        db.add(ShowCategoryPricing(show_id=1, category_id=category_id, price=100 + category_id))
+    db.commit()
+    db.close()
+    db = Session()
+    yield db
+    db.close()
+
+
+def test_get_show_details_query_count(session, sqlite_engine):
+    statements = []
+    event.listen(sqlite_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    details = get_show_details(1, db=session)
+
+    # show + movie + screen + pricing, categories with their seats, booked seats
+    assert len(statements) == 3, statements
+    assert [c["category_id"] for c in details["seat_categories"]] == list(range(1, CATEGORIES + 1))
+    assert [c["price"] for c in details["seat_categories"]] == [100 + c for c in range(1, CATEGORIES + 1)]
+    assert all(len(c["seats"]) == ROWS * COLS for c in details["seat_categories"])
+    assert details["booked_seat_ids"] == []
@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from model.booking import BookedSeat, Booking
+from model.payments import Payment
+from model.theatre import Show
+from utils.config import settings
+from utils.export import arrow_schema, parquet_chunks, pa, stream_partitions
+
+try:
+    import duckdb
+except ImportError:  # optional dependency; analytics fall back to Postgres without it
+    duckdb = None
+
+logger = logging.getLogger("app.analytics_store")
+
+# Table name in the store -> columns copied from Postgres
+SNAPSHOT_TABLES = {
+    "bookings": select(
+        Booking.booking_id,
+        Booking.user_id,
+        Booking.show_id,
+        Booking.booking_date,
+        Booking.booking_time,
+        Booking.booking_status,
+        Booking.amount,
+        Booking.payment_id,
+        Booking.discount_id,
+    ),
+    "booked_seats": select(
+        BookedSeat.booked_seat_id,
+        BookedSeat.booking_id,
+        BookedSeat.show_id,
+        BookedSeat.seat_id,
+        BookedSeat.price,
+        BookedSeat.gst_id,
+    ),
+    "shows": select(
+        Show.show_id,
+        Show.movie_id,
+        Show.screen_id,
+        Show.show_date,
+        Show.show_time,
+        Show.end_time,
+        Show.status,
+        Show.format,
+        Show.language,
+    ),
+    "payments": select(
+        Payment.payment_id,
+        Payment.payment_status,
+        Payment.payment_method,
+        Payment.amount,
+        Payment.refund_amount,
+        Payment.created_at,
+    ),
+}
+
+_MANIFEST = "manifest.json"
+
+
+class AnalyticsStore:
+    """
+    Parquet snapshots of the booking tables, queried with DuckDB.
+
+    snapshot() copies SNAPSHOT_TABLES from a read session into
+    <directory>/<table>.parquet (written to a per-process temp file and
+    swapped in, so readers never see a partial file). The directory is
+    shared by all workers: the periodic job runs in one of them, and the
+    others reload manifest.json whenever it changes on disk. query() runs
+    SQL over those files with each table exposed as a view of the same name.
+    Callers check is_fresh() and fall back to Postgres when the snapshot is
+    missing or older than max_age_seconds.
+    """
+
+    def __init__(self, directory: str, max_age_seconds: int, enabled: bool = True):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._manifest: Optional[dict] = None
+        self._manifest_mtime: Optional[float] = None
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and duckdb is not None and pa is not None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # ---------------- SNAPSHOT ----------------
+    def snapshot(self, session_factory: Callable) -> dict:
+        """Copy every snapshot table to Parquet; returns the new manifest."""
+        if not self.available:
+            raise RuntimeError("Analytics store needs duckdb and pyarrow installed")
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            started = time.perf_counter()
+            tables = {}
+            for name, stmt in SNAPSHOT_TABLES.items():
+                target = self._path(f"{name}.parquet")
+                tmp = f"{target}.{os.getpid()}.tmp"
+                rows = 0
+
+                def counted(partitions):
+                    nonlocal rows
+                    for partition in partitions:
+                        rows += len(partition)
+                        yield partition
+
+                partitions = counted(stream_partitions(session_factory, stmt, settings.EXPORT_BATCH_SIZE))
+                with open(tmp, "wb") as f:
+                    for chunk in parquet_chunks(arrow_schema(stmt), partitions):
+                        f.write(chunk)
+                os.replace(tmp, target)
+                tables[name] = rows
+
+            manifest = {
+                "taken_at": datetime.now(timezone.utc).isoformat(),
+                "taken_at_epoch": time.time(),
+                "duration_seconds": round(time.perf_counter() - started, 3),
+                "tables": tables,
+            }
+            tmp = self._path(f"{_MANIFEST}.{os.getpid()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(manifest, f)
+            os.replace(tmp, self._path(_MANIFEST))
+            self._manifest = manifest
+            self._manifest_mtime = os.stat(self._path(_MANIFEST)).st_mtime
+            return manifest
+
+    def manifest(self) -> Optional[dict]:
+        # Another worker may have taken a newer snapshot since this one last looked
+        try:
+            mtime = os.stat(self._path(_MANIFEST)).st_mtime
+        except OSError:
+            return self._manifest
+        if self._manifest is None or mtime != self._manifest_mtime:
+            try:
+                with open(self._path(_MANIFEST)) as f:
+                    self._manifest = json.load(f)
+            except (OSError, ValueError):
+                return self._manifest
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def age_seconds(self) -> Optional[float]:
+        manifest = self.manifest()
+        if manifest is None:
+            return None
+        return max(0.0, time.time() - manifest["taken_at_epoch"])
+
+    def is_fresh(self) -> bool:
+        if not self.available:
+            return False
+        age = self.age_seconds()
+        return age is not None and age <= self.max_age_seconds
+
+    # ---------------- QUERY ----------------
+    def query(self, sql: str, params: Optional[Sequence[Any]] = None) -> List[tuple]:
+        """Run sql against the snapshot; tables are available under their Postgres names."""
+        con = duckdb.connect()
+        try:
+            con.execute("SET TimeZone = 'UTC'")
+            for name in SNAPSHOT_TABLES:
+                path = self._path(f"{name}.parquet").replace("'", "''")
+                con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{path}')")
+            return con.execute(sql, params or []).fetchall()
+        finally:
+            con.close()
+
+    def status(self) -> Dict[str, Any]:
+        manifest = self.manifest()
+        age = self.age_seconds()
+        return {
+            "available": self.available,
+            "fresh": self.is_fresh(),
+            "directory": self.directory,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "max_age_seconds": self.max_age_seconds,
+            "taken_at": manifest.get("taken_at") if manifest else None,
+            "duration_seconds": manifest.get("duration_seconds") if manifest else None,
+            "tables": manifest.get("tables") if manifest else {},
+        }
+
+
+analytics_store = AnalyticsStore(
+    directory=settings.ANALYTICS_DIR,
+    max_age_seconds=settings.ANALYTICS_MAX_AGE_SECONDS,
+    enabled=settings.ANALYTICS_ENABLED,
+)
@@ -1,12 +1,22 @@
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .jwt_handler import verify_access_token
-from database import get_db
-from sqlalchemy.orm import Session
+from .revocation_cache import revocation_cache
+from database import SessionLocal
 from crud.token_crud import is_token_revoked
 
+def _is_revoked(jti: str) -> bool:
+    # Served from memory once the cache has been loaded at startup
+    if revocation_cache.loaded:
+        return revocation_cache.is_revoked(jti)
+    db = SessionLocal()
+    try:
+        return is_token_revoked(db, jti)
+    finally:
+        db.close()
+
 class JWTBearer(HTTPBearer):
-    async def __call__(self, request: Request, db: Session = Depends(get_db)):
+    async def __call__(self, request: Request):
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
         if credentials:
             # Make scheme check case-insensitive
@@ -18,7 +28,7 @@ class JWTBearer(HTTPBearer):
                 raise HTTPException(status_code=403, detail="Invalid or expired token.")
             # Check whether this token has been revoked
             jti = payload.get("jti")
-            if jti and is_token_revoked(db, jti):
+            if jti and _is_revoked(jti):
                 raise HTTPException(status_code=403, detail="Token has been revoked.")
             return payload
         else:
@@ -29,4 +39,4 @@ def getcurrent_user(role: str):
         if payload.get("role") != role:
             raise HTTPException(status_code=403, detail="Not authorized")
         return payload
-    return dependency
\ No newline at end of file
+    return dependency
@@ -3,10 +3,82 @@ from datetime import datetime, timedelta
 from fastapi import HTTPException
 from passlib.context import CryptContext
 from utils.config import Settings
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import threading
+import time
 import uuid
 
 settings = Settings()
 
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of decoded access-token payloads keyed by a digest of the raw
+    token. Entries are only served until the token's own exp claim.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        # digest -> (exp, payload)
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        # jti -> digest, so a revocation can evict the entry
+        self._by_jti: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            exp, payload = entry
+            if exp <= time.time():
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            return dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if exp is None:
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (float(exp), dict(payload))
+            self._entries.move_to_end(key)
+            jti = payload.get("jti")
+            if jti:
+                self._by_jti[jti] = key
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._evict(oldest)
+
+    def invalidate_jti(self, jti: str) -> None:
+        with self._lock:
+            key = self._by_jti.pop(jti, None)
+            if key is not None:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_jti.clear()
+
+    def _evict(self, key: str) -> None:
+        _, payload = self._entries.pop(key, (None, {}))
+        jti = payload.get("jti")
+        if jti and self._by_jti.get(jti) == key:
+            del self._by_jti[jti]
+
+
+verified_token_cache = VerifiedTokenCache(maxsize=settings.JWT_CACHE_SIZE)
+
 def create_access_token(payload: dict) -> str:
     to_encode = payload.copy()
     now = datetime.utcnow()
@@ -36,8 +108,12 @@ def create_refresh_token(payload: dict) -> str:
     return token
 
 def verify_access_token(token: str) -> dict:
+    cached = verified_token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, settings.SECRET_KEY_ACCESS, algorithms=[settings.ALGORITHM])
+        verified_token_cache.put(token, payload)
         return payload
     except ExpiredSignatureError:
         raise HTTPException(status_code=451, detail="Token has been expired, please login again")
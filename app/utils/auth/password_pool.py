@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from utils.auth.jwt_handler import hash_password, verify_password
+from utils.config import settings
+
+
+class LoginMetrics:
+    """Counters for password work, with a sliding window for throughput."""
+
+    WINDOW_SECONDS = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._completed = deque()
+        self.logins_ok = 0
+        self.logins_failed = 0
+        self.rejected = 0
+        self.hashes = 0
+        self.in_flight = 0
+        self.busy_seconds = 0.0
+
+    def record_rejection(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def job_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def job_finished(self, elapsed: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.hashes += 1
+            self.busy_seconds += elapsed
+
+    def record_login(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.logins_ok += 1
+            else:
+                self.logins_failed += 1
+            self._completed.append(time.monotonic())
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            while self._completed and now - self._completed[0] > self.WINDOW_SECONDS:
+                self._completed.popleft()
+            recent = len(self._completed)
+            return {
+                "logins_ok": self.logins_ok,
+                "logins_failed": self.logins_failed,
+                "rejected": self.rejected,
+                "hashes": self.hashes,
+                "in_flight": self.in_flight,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "logins_per_second": round(recent / self.WINDOW_SECONDS, 2),
+            }
+
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt hashing/verification off the event loop on a bounded pool.
+
+    At most max_workers jobs run at once and max_pending more may wait; any
+    further request is rejected immediately with 503 instead of queueing.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, kind: str = "thread"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.metrics = LoginMetrics()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                # bcrypt releases the GIL while hashing, so threads scale across cores
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.metrics.record_rejection()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        start = time.perf_counter()
+        self.metrics.job_started()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.metrics.job_finished(time.perf_counter() - start)
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_pool = PasswordHasherPool(
+    max_workers=settings.PASSWORD_POOL_WORKERS,
+    max_pending=settings.PASSWORD_POOL_MAX_PENDING,
+    kind=settings.PASSWORD_POOL_KIND,
+)
@@ -0,0 +1,152 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from model.revoked_token import RevokedToken
+from utils.config import settings
+from utils.auth.jwt_handler import verified_token_cache
+
+
+class BloomFilter:
+    """
+    Small fixed-size Bloom filter over strings.
+    A negative answer is definitive, a positive one must be confirmed.
+    """
+
+    def __init__(self, size_bits: int = 1 << 20, num_hashes: int = 5):
+        self.size_bits = size_bits
+        self.num_hashes = num_hashes
+        self._bits = bytearray(size_bits // 8 + 1)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def _token_lifetime(token_type: Optional[str]) -> timedelta:
+    # A token is always revoked after it was issued, so revoked_at + lifetime
+    # is an upper bound on its exp claim.
+    if token_type == "refresh":
+        return timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    return timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+class RevocationCache:
+    """
+    In-memory view of the revoked_tokens table.
+
+    Loaded once at startup and kept fresh by polling for rows revoked since
+    the newest revoked_at seen, minus an overlap window, so the common "not
+    revoked" check in JWTBearer costs no I/O. The overlap covers rows whose
+    transaction commits after a later revocation has already been read
+    (and clock skew between workers); rows seen twice are skipped by jti.
+    """
+
+    def __init__(self):
+        # jti -> time after which the token would be expired anyway
+        self._expiry: Dict[str, datetime] = {}
+        self._bloom = BloomFilter()
+        self._last_seen: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    # ---------------- LOOKUP ----------------
+    def is_revoked(self, jti: str) -> bool:
+        if not jti:
+            return False
+        if jti not in self._bloom:
+            return False
+        return jti in self._expiry
+
+    # ---------------- UPDATE ----------------
+    def add(self, jti: str, token_type: Optional[str], revoked_at: Optional[datetime] = None) -> bool:
+        """Cache a revocation; False if the jti was already known."""
+        if not jti:
+            return False
+        revoked_at = revoked_at or datetime.utcnow()
+        expires_at = revoked_at + _token_lifetime(token_type)
+        with self._lock:
+            if self._last_seen is None or revoked_at > self._last_seen:
+                self._last_seen = revoked_at
+            if jti in self._expiry:
+                return False
+            self._expiry[jti] = expires_at
+            self._bloom.add(jti)
+        verified_token_cache.invalidate_jti(jti)
+        return True
+
+    def load(self, db: Session) -> int:
+        """Full load from the database; returns the number of cached tokens."""
+        rows = db.query(RevokedToken).all()
+        with self._lock:
+            self._expiry.clear()
+            self._bloom = BloomFilter()
+            self._last_seen = None
+        for row in rows:
+            self.add(row.jti, row.token_type, row.revoked_at)
+        self.loaded = True
+        return len(self._expiry)
+
+    def refresh(self, db: Session) -> int:
+        """Pull rows revoked by other workers since the last poll; returns how many were new."""
+        query = db.query(RevokedToken)
+        if self._last_seen is not None:
+            since = self._last_seen - timedelta(seconds=settings.REVOCATION_POLL_OVERLAP_SECONDS)
+            query = query.filter(RevokedToken.revoked_at >= since)
+        added = 0
+        for row in query.all():
+            added += self.add(row.jti, row.token_type, row.revoked_at)
+        return added
+
+    # ---------------- PRUNE ----------------
+    def prune(self, db: Session) -> int:
+        """
+        Drop revocations whose tokens have expired on their own, both from
+        memory and from the revoked_tokens table.
+        """
+        now = datetime.utcnow()
+        deleted = (
+            db.query(RevokedToken)
+            .filter(
+                or_(
+                    and_(
+                        RevokedToken.token_type == "refresh",
+                        RevokedToken.revoked_at < now - _token_lifetime("refresh"),
+                    ),
+                    and_(
+                        RevokedToken.token_type != "refresh",
+                        RevokedToken.revoked_at < now - _token_lifetime("access"),
+                    ),
+                )
+            )
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+
+        with self._lock:
+            live = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+            if len(live) != len(self._expiry):
+                # Bloom filters cannot remove keys, so rebuild from what is left
+                bloom = BloomFilter()
+                for jti in live:
+                    bloom.add(jti)
+                self._expiry = live
+                self._bloom = bloom
+        return deleted
+
+
+revocation_cache = RevocationCache()
@@ -0,0 +1,164 @@
+import csv
+import io
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, Time
+from sqlalchemy.sql import Select
+
+from utils.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency; CSV only without it
+    pa = None
+    pq = None
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _csv_cell(value):
+    value = _plain(value)
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def stream_partitions(session_factory: Callable, stmt: Select, batch_size: int) -> Iterator[Sequence]:
+    """
+    Run stmt on a server-side cursor and yield rows batch_size at a time.
+    The session is opened here rather than taken from a request dependency
+    because it has to outlive the endpoint for the length of the download.
+    """
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def csv_chunks(columns: List[str], partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for partition in partitions:
+        writer.writerows([_csv_cell(v) for v in row] for row in partition)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def _arrow_type(sa_type):
+    if isinstance(sa_type, Boolean):
+        return pa.bool_()
+    if isinstance(sa_type, Integer):
+        return pa.int64()
+    if isinstance(sa_type, Numeric) and not isinstance(sa_type, Float):
+        return pa.decimal128(sa_type.precision or 18, sa_type.scale or 0)
+    if isinstance(sa_type, Float):
+        return pa.float64()
+    if isinstance(sa_type, DateTime):
+        return pa.timestamp("us", tz="UTC") if sa_type.timezone else pa.timestamp("us")
+    if isinstance(sa_type, Date):
+        return pa.date32()
+    if isinstance(sa_type, Time):
+        return pa.time64("us")
+    return pa.string()
+
+
+def arrow_schema(stmt: Select):
+    return pa.schema([(c.name, _arrow_type(c.type)) for c in stmt.selected_columns])
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the caller after each row group."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_value(value, arrow_type):
+    value = _plain(value)
+    if value is None:
+        return None
+    if pa.types.is_decimal(arrow_type) and not isinstance(value, Decimal):
+        return Decimal(str(value))
+    return value
+
+
+def parquet_chunks(schema, partitions: Iterable[Sequence]) -> Iterator[bytes]:
+    """One Parquet row group per partition, streamed as it is written."""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for partition in partitions:
+            columns = [
+                pa.array([_arrow_value(row[i], field.type) for row in partition], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_response(stmt: Select, fmt: ExportFormat, filename: str, session_factory: Callable) -> StreamingResponse:
+    """StreamingResponse for stmt as CSV or Parquet, read in EXPORT_BATCH_SIZE batches."""
+    if fmt == ExportFormat.PARQUET and pa is None:
+        raise HTTPException(status_code=501, detail="Parquet export needs pyarrow installed")
+    partitions = stream_partitions(session_factory, stmt, settings.EXPORT_BATCH_SIZE)
+    if fmt == ExportFormat.PARQUET:
+        body = parquet_chunks(arrow_schema(stmt), partitions)
+    else:
+        body = csv_chunks([c.name for c in stmt.selected_columns], partitions)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'}
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
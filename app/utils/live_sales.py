@@ -0,0 +1,324 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Set
+
+from fastapi import WebSocket
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from model.reporting import ScreenCapacity, ShowOccupancy
+from model.theatre import Show
+from utils.config import settings
+from utils.serialization import dumps, loads
+
+logger = logging.getLogger("app.live_sales")
+
+CHANNEL = "live_sales"
+
+
+def _occupancy(seats: int, capacity: int) -> float:
+    return round(seats * 100.0 / capacity, 2) if capacity else 0.0
+
+
+class LiveSalesFeed:
+    """
+    In-memory seats sold / ticket revenue / occupancy per show and per movie,
+    pushed to admin websockets.
+
+    Counters are seeded from show_occupancy and screen_capacity at startup
+    and moved by booking events (record()) in between. They are re-seeded
+    every reseed_seconds, and on the next tick after invalidate() (new shows,
+    seat capacity changes). Viewers get a snapshot on connect and a delta of
+    the shows and movies that changed every LIVE_SALES_INTERVAL seconds, so
+    watching costs no database queries. With the redis backend, events and
+    invalidations are fanned out over pub/sub so every worker sees them; the
+    memory backend only sees this worker's bookings and is for single-worker
+    deployments.
+    """
+
+    def __init__(self, interval: float = 1.0, reseed_seconds: float = 300, redis_client=None):
+        self.interval = interval
+        self.reseed_seconds = reseed_seconds
+        self.redis = redis_client
+        self._lock = threading.Lock()
+        self._shows: Dict[int, dict] = {}
+        self._movies: Dict[int, dict] = {}
+        self._screen_capacity: Dict[int, int] = {}
+        self._dirty_shows: Set[int] = set()
+        self._dirty_movies: Set[int] = set()
+        # websocket -> movie_id filter (None = everything)
+        self._viewers: Dict[WebSocket, Optional[int]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._today: Optional[date] = None
+        self._seeded_at = 0.0
+        self._reseed_due = False
+        self.events = 0
+
+    # ---------------- COUNTERS ----------------
+    def seed(self, db: Session, today: Optional[date] = None) -> int:
+        """Load counters for shows from today on; one query per table."""
+        today = today or date.today()
+        capacity = dict(
+            db.query(ScreenCapacity.screen_id, func.sum(ScreenCapacity.capacity))
+            .group_by(ScreenCapacity.screen_id)
+            .all()
+        )
+        sold = {
+            show_id: (int(seats), Decimal(revenue))
+            for show_id, seats, revenue in (
+                db.query(ShowOccupancy.show_id, func.sum(ShowOccupancy.seats_sold), func.sum(ShowOccupancy.revenue))
+                .join(Show, Show.show_id == ShowOccupancy.show_id)
+                .filter(Show.show_date >= today)
+                .group_by(ShowOccupancy.show_id)
+                .all()
+            )
+        }
+        shows = db.query(Show.show_id, Show.movie_id, Show.screen_id, Show.show_date).filter(Show.show_date >= today).all()
+        with self._lock:
+            previous_shows, previous_movies = self._shows, self._movies
+            self._screen_capacity = {screen_id: int(c or 0) for screen_id, c in capacity.items()}
+            self._shows = {}
+            for show_id, movie_id, screen_id, show_date in shows:
+                seats, revenue = sold.get(show_id, (0, Decimal(0)))
+                self._shows[show_id] = {
+                    "show_id": show_id,
+                    "movie_id": movie_id,
+                    "screen_id": screen_id,
+                    "show_date": show_date.isoformat(),
+                    "seats_sold": seats,
+                    "revenue": revenue,
+                    "capacity": self._screen_capacity.get(screen_id, 0),
+                }
+            self._rebuild_movies()
+            # Viewers get whatever the re-seed changed in the next delta
+            self._dirty_shows.update(k for k, v in self._shows.items() if previous_shows.get(k) != v)
+            self._dirty_movies.update(k for k, v in self._movies.items() if previous_movies.get(k) != v)
+            self._today = today
+            self._seeded_at = time.monotonic()
+            self._reseed_due = False
+        return len(shows)
+
+    def invalidate(self) -> None:
+        """
+        Shows or seat capacity changed; re-seed on the next tick (on every
+        worker with the redis backend). Never raises into the caller.
+        """
+        try:
+            if self.redis is not None and self._loop is not None:
+                asyncio.run_coroutine_threadsafe(self.redis.publish(CHANNEL, dumps({"reseed": True})), self._loop)
+            else:
+                self._reseed_due = True
+        except Exception as exc:
+            logger.warning("Live sales invalidation dropped: %s", exc)
+
+    def _rebuild_movies(self) -> None:
+        movies: Dict[int, dict] = {}
+        for show in self._shows.values():
+            movie = movies.setdefault(show["movie_id"], {"movie_id": show["movie_id"], "shows": 0, "seats_sold": 0, "revenue": Decimal(0), "capacity": 0})
+            movie["shows"] += 1
+            movie["seats_sold"] += show["seats_sold"]
+            movie["revenue"] += show["revenue"]
+            movie["capacity"] += show["capacity"]
+        self._movies = movies
+
+    def apply(self, event: dict) -> None:
+        """Apply one booking event: {show_id, movie_id, screen_id, show_date, seats, revenue}."""
+        seats = int(event.get("seats", 0))
+        revenue = Decimal(str(event.get("revenue", 0)))
+        if not seats and not revenue:
+            return
+        show_id = int(event["show_id"])
+        with self._lock:
+            self.events += 1
+            show = self._shows.get(show_id)
+            if show is None:
+                capacity = self._screen_capacity.get(event.get("screen_id"), 0)
+                show = self._shows[show_id] = {
+                    "show_id": show_id,
+                    "movie_id": event["movie_id"],
+                    "screen_id": event.get("screen_id"),
+                    "show_date": event.get("show_date"),
+                    "seats_sold": 0,
+                    "revenue": Decimal(0),
+                    "capacity": capacity,
+                }
+                movie = self._movies.setdefault(show["movie_id"], {"movie_id": show["movie_id"], "shows": 0, "seats_sold": 0, "revenue": Decimal(0), "capacity": 0})
+                movie["shows"] += 1
+                movie["capacity"] += capacity
+            show["seats_sold"] += seats
+            show["revenue"] += revenue
+            movie = self._movies[show["movie_id"]]
+            movie["seats_sold"] += seats
+            movie["revenue"] += revenue
+            self._dirty_shows.add(show_id)
+            self._dirty_movies.add(show["movie_id"])
+
+    def record(self, show, seats: int, revenue) -> None:
+        """
+        Report a committed change in seats sold / revenue for a show. Safe to
+        call from request threads; never raises into the booking flow.
+        """
+        if not seats and not revenue:
+            return
+        event = {
+            "show_id": show.show_id,
+            "movie_id": show.movie_id,
+            "screen_id": show.screen_id,
+            "show_date": show.show_date.isoformat() if show.show_date else None,
+            "seats": int(seats),
+            "revenue": str(revenue),
+        }
+        try:
+            if self.redis is not None and self._loop is not None:
+                asyncio.run_coroutine_threadsafe(self.redis.publish(CHANNEL, dumps(event)), self._loop)
+            else:
+                self.apply(event)
+        except Exception as exc:
+            logger.warning("Live sales event dropped: %s", exc)
+
+    # ---------------- VIEWS ----------------
+    @staticmethod
+    def _show_view(show: dict) -> dict:
+        return {
+            "show_id": show["show_id"],
+            "movie_id": show["movie_id"],
+            "show_date": show["show_date"],
+            "seats_sold": show["seats_sold"],
+            "capacity": show["capacity"],
+            "revenue": float(show["revenue"]),
+            "occupancy_pct": _occupancy(show["seats_sold"], show["capacity"]),
+        }
+
+    @staticmethod
+    def _movie_view(movie: dict) -> dict:
+        return {
+            "movie_id": movie["movie_id"],
+            "shows": movie["shows"],
+            "seats_sold": movie["seats_sold"],
+            "capacity": movie["capacity"],
+            "revenue": float(movie["revenue"]),
+            "occupancy_pct": _occupancy(movie["seats_sold"], movie["capacity"]),
+        }
+
+    def _message(self, kind: str, show_ids, movie_ids, movie_filter: Optional[int]) -> Optional[dict]:
+        shows = [self._show_view(self._shows[s]) for s in show_ids if s in self._shows]
+        movies = [self._movie_view(self._movies[m]) for m in movie_ids if m in self._movies]
+        if movie_filter is not None:
+            shows = [s for s in shows if s["movie_id"] == movie_filter]
+            movies = [m for m in movies if m["movie_id"] == movie_filter]
+            if kind == "delta" and not shows and not movies:
+                return None
+        return {"type": kind, "ts": time.time(), "shows": shows, "movies": movies}
+
+    def snapshot(self, movie_filter: Optional[int] = None) -> dict:
+        with self._lock:
+            return self._message("snapshot", sorted(self._shows), sorted(self._movies), movie_filter)
+
+    # ---------------- VIEWERS ----------------
+    async def connect(self, websocket: WebSocket, movie_id: Optional[int] = None) -> None:
+        await websocket.accept()
+        snapshot = self.snapshot(movie_id)
+        # Deltas carry absolute values, so one landing right after the snapshot is harmless
+        self._viewers[websocket] = movie_id
+        await websocket.send_text(dumps(snapshot))
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        self._viewers.pop(websocket, None)
+
+    async def _flush(self) -> None:
+        with self._lock:
+            if self._today != date.today():
+                self._prune(date.today())
+            show_ids, movie_ids = sorted(self._dirty_shows), sorted(self._dirty_movies)
+            self._dirty_shows.clear()
+            self._dirty_movies.clear()
+            if not (show_ids or movie_ids) or not self._viewers:
+                return
+            payloads: Dict[Optional[int], Optional[str]] = {}
+            for movie_filter in set(self._viewers.values()):
+                message = self._message("delta", show_ids, movie_ids, movie_filter)
+                payloads[movie_filter] = dumps(message) if message else None
+        for ws, movie_filter in list(self._viewers.items()):
+            payload = payloads.get(movie_filter)
+            if payload is None:
+                continue
+            try:
+                await ws.send_text(payload)
+            except Exception:
+                self.disconnect(ws)
+
+    def _prune(self, today: date) -> None:
+        # Past shows drop out of the feed at the start of each day
+        cutoff = today.isoformat()
+        self._shows = {k: v for k, v in self._shows.items() if not v["show_date"] or v["show_date"] >= cutoff}
+        self._rebuild_movies()
+        self._today = today
+
+    # ---------------- TASKS ----------------
+    async def run(self, session_factory: Callable) -> None:
+        """Broadcast and re-seed loop; also consumes redis events when that backend is on."""
+        self._loop = asyncio.get_running_loop()
+        if self.redis is not None:
+            asyncio.create_task(self._consume())
+        while True:
+            await asyncio.sleep(self.interval)
+            if self._reseed_due or time.monotonic() - self._seeded_at >= self.reseed_seconds:
+                try:
+                    await asyncio.to_thread(self._reseed, session_factory)
+                except Exception as exc:
+                    logger.warning("Live sales re-seed failed: %s", exc)
+                    self._seeded_at = time.monotonic()
+            try:
+                await self._flush()
+            except Exception as exc:
+                logger.warning("Live sales flush failed: %s", exc)
+
+    def _reseed(self, session_factory: Callable) -> int:
+        db = session_factory()
+        try:
+            return self.seed(db)
+        finally:
+            db.close()
+
+    async def _consume(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        event = loads(message["data"])
+                        if event.get("reseed"):
+                            self._reseed_due = True
+                        else:
+                            self.apply(event)
+            except Exception as exc:
+                logger.warning("Live sales subscription lost, retrying: %s", exc)
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis" if self.redis is not None else "memory",
+            "shows": len(self._shows),
+            "movies": len(self._movies),
+            "viewers": len(self._viewers),
+            "events": self.events,
+        }
+
+
+def _build_feed() -> LiveSalesFeed:
+    redis_client = None
+    if settings.LIVE_SALES_BACKEND == "redis":
+        from utils.redis_client import redis_client
+    return LiveSalesFeed(
+        interval=settings.LIVE_SALES_INTERVAL,
+        reseed_seconds=settings.LIVE_SALES_RESEED_SECONDS,
+        redis_client=redis_client,
+    )
+
+
+live_sales = _build_feed()
@@ -0,0 +1,90 @@
+import math
+from datetime import datetime, timezone
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from utils.auth.jwt_handler import verify_access_token
+from utils.config import settings
+from utils.rate_limiter import rate_limiter
+
+
+def client_ip(request: Request) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+def _user_id_from_header(request: Request) -> Optional[str]:
+    header = request.headers.get("authorization", "")
+    if not header.lower().startswith("bearer "):
+        return None
+    try:
+        payload = verify_access_token(header.split(" ", 1)[1].strip())
+    except Exception:
+        return None
+    if not payload or payload.get("user_id") is None:
+        return None
+    return str(payload["user_id"])
+
+
+def _user_key(request: Request, ip: Optional[str]) -> Optional[str]:
+    param = rate_limiter.route_user_param(request.method, request.url.path)
+    if param:
+        # Keyed on (account, client) so nobody can exhaust another client's bucket for an account
+        value = request.query_params.get(param, "").strip().lower()
+        return f"{value}|{ip}" if value else None
+    return _user_id_from_header(request)
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket limits for the routes listed in utils.rate_limiter.ROUTE_LIMITS.
+
+    Plain ASGI so websocket upgrades pass straight through; websocket messages
+    are limited per action inside the seat websocket handler instead.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        if rate_limiter.route_limits(request.method, request.url.path) is None:
+            await self.app(scope, receive, send)
+            return
+
+        ip = client_ip(request)
+        allowed, retry_after = await rate_limiter.hit_route(
+            request.method,
+            request.url.path,
+            ip,
+            _user_key(request, ip),
+        )
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        retry_seconds = max(1, math.ceil(retry_after))
+        response = JSONResponse(
+            status_code=429,
+            content={
+                "error": "rate_limited",
+                "status_code": 429,
+                "detail": "Too many requests, please slow down",
+                "retry_after": retry_seconds,
+                "path": str(request.url),
+                "method": request.method,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+            headers={"Retry-After": str(retry_seconds)},
+        )
+        await response(scope, receive, send)
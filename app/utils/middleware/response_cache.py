@@ -0,0 +1,137 @@
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.auth.jwt_bearer import _is_revoked
+from utils.auth.jwt_handler import verify_access_token
+from utils.config import settings
+from utils.response_cache import ENTITY_TAGS, body_tags, entity_tag, response_cache
+
+# Only these response headers are replayed from the cache
+_STORED_HEADERS = {b"content-type", b"x-next-cursor"}
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _authorized(scope: Scope) -> bool:
+    # Same checks as JWTBearer; failures fall through to the route for the real error
+    header = _header(scope, b"authorization") or ""
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return False
+    try:
+        payload = verify_access_token(token.strip())
+    except Exception:
+        return False
+    if not payload:
+        return False
+    jti = payload.get("jti")
+    return not (jti and _is_revoked(jti))
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves the GET routes in utils.response_cache.CACHED_ROUTES from the
+    response cache and drops tagged entries after successful writes listed
+    in INVALIDATIONS. Everything else passes straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.RESPONSE_CACHE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        if method == "GET":
+            matched = response_cache.match(path)
+            if matched:
+                await self._cached_get(scope, receive, send, *matched)
+                return
+        elif method in ("POST", "PUT", "DELETE", "PATCH"):
+            matched = response_cache.match_invalidation(method, path)
+            if matched:
+                await self._invalidating_write(scope, receive, send, *matched)
+                return
+        await self.app(scope, receive, send)
+
+    async def _cached_get(self, scope: Scope, receive: Receive, send: Send, route, params: dict):
+        if route.auth and not _authorized(scope):
+            await self.app(scope, receive, send)
+            return
+
+        key = response_cache.make_key(scope["path"], scope.get("query_string", b"").decode("latin-1"))
+        entry = await response_cache.get(key)
+        if entry is not None:
+            headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in entry.headers]
+            headers += [(b"content-length", str(len(entry.body)).encode()), (b"x-cache", b"HIT")]
+            await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        since = await response_cache.generation()
+        status, headers, body = await self._forward(scope, receive, send, capture=True)
+        if status != 200 or body is None:
+            return
+        if any(k == b"set-cookie" for k, _ in headers):
+            return
+        content_type = dict(headers).get(b"content-type", b"")
+        if not content_type.startswith(b"application/json"):
+            return
+
+        tags = set(route.tags)
+        if route.collection:
+            tags.add(route.collection)
+        for name, value in params.items():
+            tag = entity_tag(name, value)
+            if tag:
+                tags.add(tag)
+        tags |= body_tags(body, ENTITY_TAGS)
+        stored = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in headers if k in _STORED_HEADERS]
+        await response_cache.put(key, status, stored, body, tags, since)
+
+    async def _invalidating_write(self, scope: Scope, receive: Receive, send: Send, rule, params: dict):
+        status, _, body = await self._forward(scope, receive, send, capture=bool(rule.body_keys))
+        if not 200 <= status < 300:
+            return
+        tags = set(rule.tags)
+        for name, value in params.items():
+            tag = entity_tag(name, value)
+            if tag:
+                tags.add(tag)
+        if body is not None and rule.body_keys:
+            tags |= body_tags(body, rule.body_keys)
+        await response_cache.invalidate(*tags)
+
+    async def _forward(self, scope: Scope, receive: Receive, send: Send, capture: bool) -> Tuple[int, List, Optional[bytes]]:
+        """Run the app, streaming to the client while keeping a copy of small bodies."""
+        state = {"status": 500, "headers": []}
+        chunks: List[bytes] = []
+        size = 0
+        overflow = not capture
+
+        async def send_wrapper(message: Message):
+            nonlocal size, overflow
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["headers"] = [(k.lower(), v) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body" and not overflow:
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size > settings.RESPONSE_CACHE_MAX_BODY:
+                    overflow = True
+                    chunks.clear()
+                else:
+                    chunks.append(chunk)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        return state["status"], state["headers"], None if overflow else b"".join(chunks)
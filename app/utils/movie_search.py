@@ -0,0 +1,216 @@
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, or_, text
+from sqlalchemy.orm import Session
+
+from model.movie import Movie
+from utils.config import settings
+
+logger = logging.getLogger("app.movie_search")
+
+# One text document per movie: title, genres and cast names, lower-cased.
+# IMMUTABLE so it can back expression indexes.
+_SEARCH_DOCUMENT_FN = """
+CREATE OR REPLACE FUNCTION movie_search_document(title text, genre varchar[], cast_json json)
+RETURNS text LANGUAGE sql IMMUTABLE AS $$
+    SELECT lower(
+        coalesce(title, '') || ' ' ||
+        coalesce(array_to_string(genre, ' '), '') || ' ' ||
+        coalesce((
+            SELECT string_agg(elem->>'name', ' ')
+            FROM json_array_elements(
+                CASE WHEN json_typeof(cast_json) = 'array' THEN cast_json ELSE '[]'::json END
+            ) AS elem
+        ), '')
+    )
+$$
+"""
+
+_SEARCH_INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    _SEARCH_DOCUMENT_FN,
+    # Also serves the existing title ILIKE filter
+    "CREATE INDEX IF NOT EXISTS ix_movies_title_trgm ON movies USING gin (title gin_trgm_ops)",
+    'CREATE INDEX IF NOT EXISTS ix_movies_search_trgm ON movies '
+    'USING gin (movie_search_document(title, genre, "cast") gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_movies_search_fts ON movies '
+    'USING gin (to_tsvector(\'simple\', movie_search_document(title, genre, "cast")))',
+]
+
+
+def _normalize(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", value.lower()).strip()
+
+
+def trigrams(value: str) -> Set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in _normalize(value).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _cast_names(cast) -> List[str]:
+    if not isinstance(cast, list):
+        return []
+    return [c.get("name") for c in cast if isinstance(c, dict) and c.get("name")]
+
+
+def _result(movie, score: float) -> dict:
+    return {
+        "movie_id": movie.movie_id,
+        "title": movie.title,
+        "genre": movie.genre,
+        "language": movie.language,
+        "poster_url": movie.poster_url,
+        "rating": movie.rating,
+        "is_active": movie.is_active,
+        "score": round(float(score), 4),
+    }
+
+
+class InMemoryMovieIndex:
+    """
+    Trigram inverted index over title, genres and cast names, built from the
+    movies table. Used when Postgres/pg_trgm is not available (e.g. SQLite in tests).
+    """
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._docs: Dict[int, dict] = {}
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._built_at = 0.0
+
+    def build(self, movies: Iterable) -> None:
+        postings: Dict[str, Set[int]] = defaultdict(set)
+        docs: Dict[int, dict] = {}
+        for m in movies:
+            fields = [m.title or ""] + list(m.genre or []) + _cast_names(m.cast)
+            title_grams = trigrams(m.title or "")
+            field_grams = [trigrams(f) for f in fields if f]
+            doc_grams = set().union(*field_grams) if field_grams else set()
+            docs[m.movie_id] = {"movie": m, "title": title_grams, "fields": field_grams, "words": set(_normalize(" ".join(fields)).split())}
+            for gram in doc_grams:
+                postings[gram].add(m.movie_id)
+        with self._lock:
+            self._postings = postings
+            self._docs = docs
+            self._built_at = time.monotonic()
+
+    def _ensure(self, db: Session) -> None:
+        if time.monotonic() - self._built_at > self.ttl_seconds or not self._built_at:
+            self.build(db.query(Movie).all())
+
+    def search(self, db: Session, q: str, limit: int, active_only: bool, min_score: float) -> List[dict]:
+        self._ensure(db)
+        q_grams = trigrams(q)
+        q_words = set(_normalize(q).split())
+        candidates: Set[int] = set()
+        for gram in q_grams:
+            candidates |= self._postings.get(gram, set())
+
+        scored = []
+        for movie_id in candidates:
+            doc = self._docs[movie_id]
+            movie = doc["movie"]
+            if active_only and movie.is_active is False:
+                continue
+            # Best match against the title or any single genre/cast name, plus exact word hits
+            score = max([similarity(q_grams, doc["title"])] + [similarity(q_grams, g) for g in doc["fields"]])
+            if q_words:
+                score += 0.5 * len(q_words & doc["words"]) / len(q_words)
+            if score >= min_score:
+                scored.append((score, movie))
+        scored.sort(key=lambda pair: (-pair[0], pair[1].movie_id))
+        return [_result(movie, score) for score, movie in scored[:limit]]
+
+
+class MovieSearch:
+    """
+    Ranked, typo-tolerant movie search.
+
+    On Postgres it uses pg_trgm similarity and a tsvector over title, genres
+    and cast names (see ensure_indexes); elsewhere it falls back to the
+    in-process trigram index.
+    """
+
+    def __init__(self, backend: str = "auto", min_score: float = 0.2):
+        self.backend = backend
+        self.min_score = min_score
+        self.postgres_ready = False
+        self.fallback = InMemoryMovieIndex()
+
+    def ensure_indexes(self, engine) -> bool:
+        """Create the trigram/tsvector indexes; returns False if Postgres search is unavailable."""
+        if self.backend == "memory" or engine.dialect.name != "postgresql":
+            return False
+        try:
+            with engine.begin() as conn:
+                for statement in _SEARCH_INDEXES:
+                    conn.execute(text(statement))
+            self.postgres_ready = True
+        except Exception as exc:
+            logger.warning("Movie search indexes unavailable, using in-process index: %s", exc)
+            self.postgres_ready = False
+        return self.postgres_ready
+
+    def invalidate(self) -> None:
+        self.fallback.invalidate()
+
+    def _use_postgres(self, db: Session) -> bool:
+        if self.backend == "memory":
+            return False
+        return self.postgres_ready and db.get_bind().dialect.name == "postgresql"
+
+    def search(self, db: Session, q: str, limit: int = 10, active_only: bool = True) -> List[dict]:
+        q = (q or "").strip()
+        if not q:
+            return []
+        if self._use_postgres(db):
+            return self._search_postgres(db, q, limit, active_only)
+        return self.fallback.search(db, q, limit, active_only, self.min_score)
+
+    def best_match(self, db: Session, q: str, active_only: bool = False) -> Optional[dict]:
+        results = self.search(db, q, limit=1, active_only=active_only)
+        return results[0] if results else None
+
+    def _search_postgres(self, db: Session, q: str, limit: int, active_only: bool) -> List[dict]:
+        document = func.movie_search_document(Movie.title, Movie.genre, Movie.cast)
+        q_lower = q.lower()
+        tsquery = func.plainto_tsquery("simple", q_lower)
+        tsvector = func.to_tsvector("simple", document)
+        score = (
+            func.greatest(func.similarity(Movie.title, q), func.word_similarity(q_lower, document))
+            + func.ts_rank(tsvector, tsquery)
+        ).label("score")
+
+        query = db.query(Movie, score).filter(
+            or_(
+                Movie.title.op("%")(q),
+                document.op("%>")(q_lower),
+                tsvector.op("@@")(tsquery),
+            )
+        )
+        if active_only:
+            query = query.filter(Movie.is_active.isnot(False))
+        rows = query.order_by(score.desc(), Movie.movie_id.asc()).limit(limit).all()
+        return [_result(movie, s) for movie, s in rows if s >= self.min_score]
+
+
+movie_search = MovieSearch(backend=settings.MOVIE_SEARCH_BACKEND, min_score=settings.MOVIE_SEARCH_MIN_SCORE)
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+from utils.config import settings
+
+logger = logging.getLogger("app.rate_limiter")
+
+
+class RateLimit:
+    """Token bucket: `capacity` burst, refilled at `per_seconds / capacity` tokens per second."""
+
+    def __init__(self, capacity: int, per_seconds: float):
+        self.capacity = capacity
+        self.per_seconds = per_seconds
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        # "10/60" -> 10 requests per 60 seconds
+        count, _, seconds = spec.partition("/")
+        return cls(int(count), float(seconds or 1))
+
+    def __repr__(self) -> str:
+        return f"RateLimit({self.capacity}/{self.per_seconds}s)"
+
+
+def _route_limits(spec: str) -> Tuple[RateLimit, RateLimit]:
+    # "10/60,5/60" -> (per-IP limit, per-user limit)
+    ip_spec, _, user_spec = spec.partition(",")
+    return RateLimit.parse(ip_spec.strip()), RateLimit.parse((user_spec or ip_spec).strip())
+
+
+def _action_limits(spec: str) -> Dict[str, RateLimit]:
+    # "lock=20/10,ping=10/10" -> {"lock": RateLimit(20/10s), "ping": RateLimit(10/10s)}
+    limits = {}
+    for item in spec.split(","):
+        action, _, limit = item.partition("=")
+        if action.strip() and limit.strip():
+            limits[action.strip()] = RateLimit.parse(limit.strip())
+    return limits
+
+
+# Per route: (METHOD, path) -> (per-IP limit, per-user limit)
+ROUTE_LIMITS: Dict[Tuple[str, str], Tuple[RateLimit, RateLimit]] = {
+    ("POST", "/users/login"): _route_limits(settings.RATE_LIMIT_LOGIN),
+    ("POST", "/bookings"): _route_limits(settings.RATE_LIMIT_BOOKINGS),
+    ("POST", "/discounts/validate"): _route_limits(settings.RATE_LIMIT_DISCOUNT_VALIDATE),
+}
+
+# Routes whose per-user bucket is keyed on a request parameter (plus the client
+# IP) instead of the bearer token: login attempts are made without one, against
+# a target account
+ROUTE_USER_PARAMS: Dict[Tuple[str, str], str] = {
+    ("POST", "/users/login"): "email",
+}
+
+# Per seat websocket action, applied per user (or per IP for anonymous sockets)
+WS_ACTION_LIMITS: Dict[str, RateLimit] = _action_limits(settings.RATE_LIMIT_WS_ACTIONS)
+
+
+# ---------------- BACKENDS ----------------
+
+class InMemoryBucketBackend:
+    """Buckets held in this process; fine for a single worker."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, last refill timestamp)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (float(limit.capacity), now))
+            tokens = min(float(limit.capacity), tokens + (now - ts) * limit.refill_rate)
+            if tokens >= 1:
+                allowed, retry_after = True, 0.0
+                tokens -= 1
+            else:
+                allowed, retry_after = False, (1 - tokens) / limit.refill_rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBucketBackend:
+    """Buckets shared by all workers, updated atomically with a Lua script."""
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[self.prefix + key],
+            args=[limit.capacity, limit.refill_rate, time.time()],
+        )
+        return bool(int(allowed)), float(retry_after)
+
+
+# ---------------- LIMITER ----------------
+
+class RateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+        self.rejections: Counter = Counter()
+        self.checks: Counter = Counter()
+
+    async def hit(self, rule: str, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        self.checks[rule] += 1
+        try:
+            allowed, retry_after = await self.backend.take(f"{rule}:{key}", limit)
+        except Exception as exc:
+            # Fail open: an unavailable backend must not block real buyers
+            logger.warning("Rate limiter backend error for %s: %s", rule, exc)
+            return True, 0.0
+        if not allowed:
+            self.rejections[rule] += 1
+        return allowed, retry_after
+
+    def route_limits(self, method: str, path: str) -> Optional[Tuple[RateLimit, RateLimit]]:
+        return ROUTE_LIMITS.get((method.upper(), path.rstrip("/") or "/"))
+
+    def route_user_param(self, method: str, path: str) -> Optional[str]:
+        return ROUTE_USER_PARAMS.get((method.upper(), path.rstrip("/") or "/"))
+
+    async def hit_route(self, method: str, path: str, ip: Optional[str], user_id: Optional[str]) -> Tuple[bool, float]:
+        limits = self.route_limits(method, path)
+        if not limits:
+            return True, 0.0
+        ip_limit, user_limit = limits
+        rule = f"{method.upper()} {path.rstrip('/') or '/'}"
+        if ip:
+            allowed, retry_after = await self.hit(rule + " [ip]", ip, ip_limit)
+            if not allowed:
+                return allowed, retry_after
+        if user_id:
+            return await self.hit(rule + " [user]", str(user_id), user_limit)
+        return True, 0.0
+
+    async def hit_ws_action(self, action: str, client_key: str) -> Tuple[bool, float]:
+        limit = WS_ACTION_LIMITS.get(action)
+        if not limit:
+            return True, 0.0
+        return await self.hit(f"ws:{action}", client_key, limit)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "checks": dict(self.checks),
+            "rejections": dict(self.rejections),
+        }
+
+
+def _build_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        from utils.redis_client import redis_client
+        return RedisBucketBackend(redis_client)
+    return InMemoryBucketBackend()
+
+
+rate_limiter = RateLimiter(_build_backend())
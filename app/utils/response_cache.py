@@ -0,0 +1,427 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from utils.config import settings
+
+logger = logging.getLogger("app.response_cache")
+
+# Ids found in path params or response bodies map to these entity tags
+ENTITY_TAGS = {"movie_id": "movie", "show_id": "show", "screen_id": "screen"}
+
+
+def entity_tag(key: str, value) -> Optional[str]:
+    prefix = ENTITY_TAGS.get(key)
+    if prefix is None or value is None:
+        return None
+    return f"{prefix}:{value}"
+
+
+# Path params that are not integer ids (agent thread ids are UUIDs)
+TEXT_PARAMS = {"thread_id"}
+
+
+def _param(match: re.Match) -> str:
+    name = match.group(1)
+    return rf"(?P<{name}>[^/]+)" if name in TEXT_PARAMS else rf"(?P<{name}>\d+)"
+
+
+def _compile(pattern: str) -> re.Pattern:
+    # "/movies/{movie_id}" -> ^/movies/(?P<movie_id>\d+)$ ; trailing slash optional
+    regex = re.sub(r"\{(\w+)\}", _param, pattern.rstrip("/"))
+    return re.compile(f"^{regex}/?$")
+
+
+class CachedRoute:
+    """
+    A GET route whose responses are cached.
+
+    Entries are tagged with `collection` (if any), the entity tags of the
+    path params, and the entity tags of every id in the JSON body so that a
+    write to any entity shown in a list drops that list.
+    """
+
+    def __init__(self, pattern: str, collection: Optional[str] = None, auth: bool = False, tags: Iterable[str] = ()):
+        self.pattern = pattern
+        self.regex = _compile(pattern)
+        self.collection = collection
+        self.auth = auth
+        self.tags = tuple(tags)
+
+
+class Invalidation:
+    """A write route; on a 2xx response the listed tags, path tags and body tags are dropped."""
+
+    def __init__(self, method: str, pattern: str, tags: Iterable[str] = (), body_keys: Iterable[str] = ()):
+        self.method = method
+        self.pattern = pattern
+        self.regex = _compile(pattern)
+        self.tags = tuple(tags)
+        self.body_keys = tuple(body_keys)
+
+
+CACHED_ROUTES: List[CachedRoute] = [
+    CachedRoute("/movies/", collection="movies"),
+    CachedRoute("/movies/search", collection="movies"),
+    CachedRoute("/movies/{movie_id}"),
+    CachedRoute("/shows/", collection="shows"),
+    CachedRoute("/shows/{show_id}", auth=True),
+    CachedRoute("/cms/landing", tags=["cms:landing"]),
+]
+
+INVALIDATIONS: List[Invalidation] = [
+    Invalidation("POST", "/movies/", tags=["movies"]),
+    Invalidation("PUT", "/movies/{movie_id}", tags=["movies"]),
+    Invalidation("DELETE", "/movies/{movie_id}", tags=["movies"]),
+    Invalidation("POST", "/movies/tmdb/import/{tmdb_id}", tags=["movies"]),
+    Invalidation("POST", "/shows/", tags=["shows"]),
+    Invalidation("PUT", "/shows/{show_id}/cancel", tags=["shows"]),
+    Invalidation("POST", "/shows/auto-schedule/hybrid", tags=["shows"]),
+    Invalidation("POST", "/shows/generate-weekly", tags=["shows"]),
+    # The scheduling agent creates shows when it runs or is approved
+    Invalidation("POST", "/agents/operate", tags=["shows"]),
+    Invalidation("POST", "/agents/approve/{thread_id}", tags=["shows"]),
+    Invalidation("POST", "/show-category-pricing/", body_keys=["show_id"]),
+    Invalidation("POST", "/show-category-pricing/bulk", body_keys=["show_id"]),
+    Invalidation("PUT", "/show-category-pricing/{pricing_id}", body_keys=["show_id"]),
+    # These responses do not say which shows were touched
+    Invalidation("PUT", "/show-category-pricing/bulk", tags=["shows"]),
+    Invalidation("DELETE", "/show-category-pricing/bulk", tags=["shows"]),
+    Invalidation("DELETE", "/show-category-pricing/{pricing_id}", tags=["shows"]),
+    Invalidation("PUT", "/screens/{screen_id}"),
+    Invalidation("DELETE", "/screens/{screen_id}"),
+    Invalidation("PUT", "/cms/admin/landing", tags=["cms:landing"]),
+]
+
+
+def normalize_query(query_string: str) -> str:
+    """Drop empty params and sort the rest so equivalent URLs share an entry."""
+    pairs = [(k, v) for k, v in parse_qsl(query_string, keep_blank_values=False) if v != ""]
+    return urlencode(sorted(pairs))
+
+
+def body_tags(body: bytes, keys: Iterable[str]) -> Set[str]:
+    """Entity tags for the given id keys found in a JSON object or list of objects."""
+    try:
+        data = json.loads(body)
+    except Exception:
+        return set()
+    items = data if isinstance(data, list) else [data]
+    tags = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for key in keys:
+            tag = entity_tag(key, item.get(key))
+            if tag:
+                tags.add(tag)
+    return tags
+
+
+class CachedResponse:
+    __slots__ = ("status", "headers", "body", "expires_at", "tags")
+
+    def __init__(self, status: int, headers: List[Tuple[str, str]], body: bytes, expires_at: float, tags: Set[str]):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires_at = expires_at
+        self.tags = tags
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "s": self.status,
+            "h": self.headers,
+            "b": self.body.decode("utf-8"),
+            "e": self.expires_at,
+            "t": sorted(self.tags),
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CachedResponse":
+        data = json.loads(raw)
+        return cls(data["s"], [tuple(h) for h in data["h"]], data["b"].encode("utf-8"), data["e"], set(data["t"]))
+
+
+# ---------------- TIERS ----------------
+
+class LocalResponseCache:
+    """
+    Per-process LRU with a tag -> keys index.
+
+    Every invalidation bumps `generation` and records it against its tags
+    (the last max_entries tags are remembered; older ones raise a floor), so
+    put() can refuse a response whose tags were invalidated after `since`.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._floor = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse, since: Optional[int] = None) -> bool:
+        with self._lock:
+            if since is not None and self._invalidated_since(entry.tags, since):
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    if key in self._entries:
+                        self._drop(key)
+                        dropped += 1
+                self._tags.pop(tag, None)
+                self._invalidated.pop(tag, None)
+                self._invalidated[tag] = self.generation
+            while len(self._invalidated) > self.max_entries:
+                _, self._floor = self._invalidated.popitem(last=False)
+        return dropped
+
+    def _invalidated_since(self, tags: Iterable[str], since: int) -> bool:
+        if since < self._floor:
+            return True
+        return any(self._invalidated.get(tag, 0) > since for tag in tags)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisResponseCache:
+    """
+    Shared tier; tags are Redis sets of entry keys.
+
+    A shared counter is bumped on every invalidation and stored per tag
+    (for ttl seconds), so put() can refuse or drop a response whose tags
+    were invalidated after `since`.
+    """
+
+    def __init__(self, client, prefix: str = "respcache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def _entry_key(self, key: str) -> str:
+        return self.prefix + "entry:" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self._entry_key(key))
+        if raw is None:
+            return None
+        return CachedResponse.from_json(raw)
+
+    async def generation(self) -> int:
+        return int(await self.client.get(self.prefix + "gen") or 0)
+
+    async def invalidated_since(self, tags: Iterable[str], since: int) -> bool:
+        gen_keys = [self.prefix + "gen:" + tag for tag in tags]
+        if not gen_keys:
+            return False
+        return any(g is not None and int(g) > since for g in await self.client.mget(gen_keys))
+
+    async def put(self, key: str, entry: CachedResponse, ttl: int, since: int) -> bool:
+        if await self.invalidated_since(entry.tags, since):
+            return False
+        entry_key = self._entry_key(key)
+        pipe = self.client.pipeline()
+        pipe.set(entry_key, entry.to_json(), ex=ttl)
+        for tag in entry.tags:
+            tag_key = self.prefix + "tag:" + tag
+            pipe.sadd(tag_key, entry_key)
+            pipe.expire(tag_key, ttl)
+        await pipe.execute()
+        # An invalidation between the check and the write has already run its delete
+        if await self.invalidated_since(entry.tags, since):
+            await self.client.delete(entry_key)
+            return False
+        return True
+
+    async def invalidate(self, tags: Iterable[str], ttl: int) -> None:
+        # Generations first: a concurrent put() either sees them or is deleted below
+        generation = await self.client.incr(self.prefix + "gen")
+        pipe = self.client.pipeline()
+        for tag in tags:
+            pipe.set(self.prefix + "gen:" + tag, generation, ex=ttl)
+        await pipe.execute()
+        for tag in tags:
+            tag_key = self.prefix + "tag:" + tag
+            members = await self.client.smembers(tag_key)
+            if members:
+                await self.client.delete(*members)
+            await self.client.delete(tag_key)
+
+
+# ---------------- CACHE ----------------
+
+class ResponseCache:
+    """
+    Two-tier response cache for read-heavy catalog routes.
+
+    The local LRU answers most hits without I/O. With the Redis tier enabled,
+    misses fall through to Redis and writes invalidate both tiers. Local
+    entries are always kept short-lived (RESPONSE_CACHE_LOCAL_TTL): other
+    workers only learn about an invalidation when their entries expire, and
+    with the memory backend there is no shared tier to carry it at all.
+
+    Take generation() before running a missed route and pass it to put():
+    a response is not stored if any of its tags was invalidated meanwhile,
+    since it may have been read before the write committed.
+    """
+
+    def __init__(self, ttl: int, local_ttl: int, max_entries: int, redis_tier: Optional[RedisResponseCache] = None):
+        self.ttl = ttl
+        self.local_ttl = min(local_ttl, ttl)
+        self.local = LocalResponseCache(max_entries)
+        self.redis = redis_tier
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(path: str, query_string: str) -> str:
+        return f"{path.rstrip('/') or '/'}?{normalize_query(query_string)}"
+
+    def match(self, path: str) -> Optional[Tuple[CachedRoute, Dict[str, str]]]:
+        for route in CACHED_ROUTES:
+            m = route.regex.match(path)
+            if m:
+                return route, m.groupdict()
+        return None
+
+    def match_invalidation(self, method: str, path: str) -> Optional[Tuple[Invalidation, Dict[str, str]]]:
+        for rule in INVALIDATIONS:
+            if rule.method != method:
+                continue
+            m = rule.regex.match(path)
+            if m:
+                return rule, m.groupdict()
+        return None
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.local.get(key)
+        if entry is None and self.redis is not None:
+            try:
+                entry = await self.redis.get(key)
+            except Exception as exc:
+                logger.warning("Response cache redis get failed: %s", exc)
+                entry = None
+            if entry is not None and entry.expires_at > time.time():
+                self.local.put(key, self._local_copy(entry))
+            else:
+                entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def generation(self) -> Tuple[int, Optional[int]]:
+        """(local, shared) invalidation generations; the shared one is None without a usable Redis tier."""
+        shared = None
+        if self.redis is not None:
+            try:
+                shared = await self.redis.generation()
+            except Exception as exc:
+                logger.warning("Response cache redis generation failed: %s", exc)
+        return self.local.generation, shared
+
+    async def put(self, key: str, status: int, headers: List[Tuple[str, str]], body: bytes, tags: Set[str],
+                  since: Tuple[int, Optional[int]]) -> None:
+        local_since, shared_since = since
+        entry = CachedResponse(status, headers, body, time.time() + self.ttl, tags)
+        if self.redis is not None and shared_since is not None:
+            try:
+                if not await self.redis.put(key, entry, self.ttl, shared_since):
+                    return
+            except Exception as exc:
+                logger.warning("Response cache redis put failed: %s", exc)
+        self.local.put(key, self._local_copy(entry), since=local_since)
+
+    async def invalidate(self, *tags: str) -> None:
+        tags = [t for t in tags if t]
+        if not tags:
+            return
+        self.invalidations += 1
+        self.local.invalidate(tags)
+        if self.redis is not None:
+            try:
+                await self.redis.invalidate(tags, self.ttl)
+            except Exception as exc:
+                logger.warning("Response cache redis invalidate failed: %s", exc)
+
+    def _local_copy(self, entry: CachedResponse) -> CachedResponse:
+        expires_at = min(entry.expires_at, time.time() + self.local_ttl)
+        return CachedResponse(entry.status, entry.headers, entry.body, expires_at, entry.tags)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "redis" if self.redis is not None else "memory",
+            "local_entries": len(self.local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def _build_cache() -> ResponseCache:
+    redis_tier = None
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        from utils.redis_client import redis_client
+        redis_tier = RedisResponseCache(redis_client)
+    return ResponseCache(
+        ttl=settings.RESPONSE_CACHE_TTL,
+        local_ttl=settings.RESPONSE_CACHE_LOCAL_TTL,
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        redis_tier=redis_tier,
+    )
+
+
+response_cache = _build_cache()
@@ -0,0 +1,87 @@
+import json
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Type, TypeVar
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from utils.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Fast path only when asked for and available; otherwise the stdlib json module
+FAST_JSON_ENABLED = settings.FAST_JSON and orjson is not None
+
+
+def _default(obj: Any) -> Any:
+    # Types orjson does not handle natively (Decimal, pydantic models, ORM rows, ...)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+if FAST_JSON_ENABLED:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(raw: str | bytes) -> Any:
+        return orjson.loads(raw)
+else:
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, default=_default)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return dumps(obj).encode("utf-8")
+
+    def loads(raw: str | bytes) -> Any:
+        return json.loads(raw)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when FAST_JSON is enabled."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+DefaultResponse = FastJSONResponse if FAST_JSON_ENABLED else JSONResponse
+
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+class ModelSerializer(Generic[SchemaType]):
+    """
+    Prebuilt pydantic validator/serializer for a response schema.
+
+    Validates ORM objects straight into the schema and dumps JSON bytes in
+    pydantic-core, skipping FastAPI's per-request response_model handling
+    and jsonable_encoder pass. Routes keep their response_model for the docs
+    and return `serializer.response(...)`.
+    """
+
+    def __init__(self, schema: Type[SchemaType]):
+        self.schema = schema
+        self._one = TypeAdapter(schema)
+        self._many = TypeAdapter(List[schema])
+
+    def dump_one(self, obj: Any) -> bytes:
+        return self._one.dump_json(self._one.validate_python(obj, from_attributes=True))
+
+    def dump_many(self, objs: Any) -> bytes:
+        return self._many.dump_json(self._many.validate_python(list(objs), from_attributes=True))
+
+    def response(self, obj: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        body = self.dump_many(obj) if isinstance(obj, (list, tuple)) else self.dump_one(obj)
+        return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
@@ -1,7 +1,7 @@
 from typing import Dict, Set, Tuple
 from fastapi import WebSocket
 import asyncio
-import json
+from utils.serialization import dumps
 
 class WebSocketManager:
     def __init__(self):
@@ -67,7 +67,7 @@ class WebSocketManager:
                     del self.show_subscriptions[str(show_id)]
 
     async def broadcast_to_show(self, show_id: str, message_obj) -> bool:
-        payload = message_obj if isinstance(message_obj, str) else json.dumps(message_obj)
+        payload = message_obj if isinstance(message_obj, str) else dumps(message_obj)
         sockets = list(self.show_subscriptions.get(str(show_id), set()))
         any_sent = False
         for ws in sockets: